@@ -6,3 +6,9 @@ class BonusesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'bonuses'
     verbose_name = _("Bonuses")
+
+    def ready(self):
+        from bonuses.models import BonusSettings
+        from core.settings_registry import settings_registry
+
+        settings_registry.register(BonusSettings)
@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from functools import lru_cache
 
 from bonuses.models import BonusSettings
+from core.settings_registry import settings_registry
 from shifts.models import Shift
 from staff.models import StaffType
 
@@ -13,7 +14,7 @@ class BonusAmountComputeInteractor:
 
     @lru_cache
     def get_bonus_settings(self):
-        return BonusSettings.objects.first()
+        return settings_registry.get(BonusSettings)
 
     def get_shift_transferred_cars_count(self) -> int:
         return self.shift.cartowash_set.count()
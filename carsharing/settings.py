@@ -37,6 +37,7 @@ INSTALLED_APPS = [
     "dry_cleaning",
     'deposits',
     "bonuses",
+    "telegram",
 ]
 
 MIDDLEWARE = [
@@ -88,6 +89,19 @@ DATABASES = {
     }
 }
 
+# Seconds after which workers check for changes of cached settings rows.
+SETTINGS_REGISTRY_VERSION_CHECK_INTERVAL = env.float(
+    "SETTINGS_REGISTRY_VERSION_CHECK_INTERVAL",
+    default=5,
+)
+
+# Seconds after which workers reload cached settings rows regardless of
+# their version.
+SETTINGS_REGISTRY_MAX_AGE = env.float(
+    "SETTINGS_REGISTRY_MAX_AGE",
+    default=300,
+)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation"
@@ -149,6 +163,25 @@ S3_ACCESS_KEY = env.str("S3_ACCESS_KEY")
 S3_SECRET_KEY = env.str("S3_SECRET_KEY")
 S3_ENDPOINT = env.str("S3_ENDPOINT").rstrip("/")
 
+# Uploaded photos are re-encoded to JPEG and get a thumbnail.
+PHOTO_MAX_SIZE = env.int("PHOTO_MAX_SIZE", default=2048)
+PHOTO_QUALITY = env.int("PHOTO_QUALITY", default=85)
+PHOTO_THUMBNAIL_MAX_SIZE = env.int("PHOTO_THUMBNAIL_MAX_SIZE", default=320)
+PHOTO_THUMBNAIL_QUALITY = env.int("PHOTO_THUMBNAIL_QUALITY", default=70)
+PHOTO_PROCESSING_MAX_WORKERS = env.int(
+    "PHOTO_PROCESSING_MAX_WORKERS",
+    default=2,
+)
+# Seconds to wait for a photo to be processed.
+PHOTO_PROCESSING_TIMEOUT = env.float("PHOTO_PROCESSING_TIMEOUT", default=30)
+# Photos downloaded by URL larger than that many bytes are rejected.
+PHOTO_DOWNLOAD_MAX_SIZE = env.int(
+    "PHOTO_DOWNLOAD_MAX_SIZE",
+    default=20 * 1024 * 1024,
+)
+# Seconds to wait for a photo download to connect or send more data.
+PHOTO_DOWNLOAD_TIMEOUT = env.float("PHOTO_DOWNLOAD_TIMEOUT", default=30)
+
 ROOT_PATH = env.str("ROOT_PATH", default="")
 
 if ROOT_PATH:
@@ -0,0 +1,35 @@
+import pytest
+
+from core.settings_registry import settings_registry
+from economics.models import (
+    CarTransporterAndWasherServicePrices,
+    CarTransporterServicePrices,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_settings_registry():
+    """Rows cached by a test are rolled back with its transaction."""
+    settings_registry.clear()
+    yield
+    settings_registry.clear()
+
+
+@pytest.fixture
+def service_prices():
+    CarTransporterServicePrices.objects.create(
+        comfort_class_car_transfer=100,
+        business_class_car_transfer=150,
+        van_transfer=200,
+        extra_shift=300,
+        urgent_car_transfer=250,
+        item_dry_cleaning=50,
+        under_plan_planned_car_transfer=80,
+    )
+    CarTransporterAndWasherServicePrices.objects.create(
+        comfort_class_car_transfer=120,
+        business_class_car_transfer=170,
+        van_transfer=220,
+        urgent_car_transfer=270,
+        item_dry_cleaning=60,
+    )
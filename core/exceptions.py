@@ -1,7 +1,10 @@
 from typing import Any
 
 import drf_standardized_errors.formatter
+from django.utils.translation import gettext_lazy as _
 from drf_standardized_errors.types import ErrorResponse
+from rest_framework import status
+from rest_framework.exceptions import APIException
 
 
 class ExceptionFormatter(drf_standardized_errors.formatter.ExceptionFormatter):
@@ -16,3 +19,9 @@ class ExceptionFormatter(drf_standardized_errors.formatter.ExceptionFormatter):
                 del error["attr"]
 
         return error_response
+
+
+class InvalidCursorError(APIException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_code = "invalid_cursor"
+    default_detail = _("Invalid pagination cursor")
@@ -1,11 +1,22 @@
 from typing import Self
 
+from django.db import models
+
+from core.settings_registry import settings_registry
+
 
 class SingleRowModelMixin:
 
     @classmethod
     def get(cls) -> Self:
-        obj = cls.objects.first()
+        obj = settings_registry.get(cls)
         if obj is None:
             raise ValueError("Single-row model object not found")
         return obj
+
+
+class SettingsVersion(models.Model):
+    """Version of single-row settings model shared by all workers."""
+
+    model_label = models.CharField(max_length=255, unique=True)
+    version = models.PositiveBigIntegerField(default=1)
@@ -0,0 +1,161 @@
+"""
+Keyset (cursor) pagination.
+
+A page after a cursor is selected with a condition on the ordering key
+instead of `OFFSET`, so deep pages cost as much as the first one. The
+ordering must be unique (end with the primary key) and must not contain
+nullable fields.
+"""
+import base64
+import binascii
+import datetime
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+
+from core.exceptions import InvalidCursorError
+
+
+__all__ = (
+    "KeysetPage",
+    "encode_cursor",
+    "decode_cursor",
+    "get_next_cursor",
+    "paginate_by_keyset",
+)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class KeysetPage:
+    items: list
+    next_cursor: str | None
+
+    @property
+    def is_end_of_list_reached(self) -> bool:
+        return self.next_cursor is None
+
+
+def serialize_cursor_value(value: Any) -> Any:
+    # Django JSON encoder truncates microseconds, which breaks the key.
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(ordering: Sequence[str], values: Sequence[Any]) -> str:
+    payload = json.dumps(
+        {
+            "ordering": list(ordering),
+            "values": [serialize_cursor_value(value) for value in values],
+        },
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(ordering: Sequence[str], cursor: str) -> list:
+    """
+    Decode values of ordering key from cursor.
+
+    Raises:
+        InvalidCursorError: cursor is malformed or made for other ordering.
+    """
+    padding = "=" * (-len(cursor) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (binascii.Error, ValueError):
+        raise InvalidCursorError
+    if (
+            not isinstance(payload, dict)
+            or payload.get("ordering") != list(ordering)
+            or not isinstance(payload.get("values"), list)
+            or len(payload["values"]) != len(ordering)
+            or any(
+                isinstance(value, (list, dict))
+                for value in payload["values"]
+            )
+    ):
+        raise InvalidCursorError
+    return payload["values"]
+
+
+def get_field_value(item: Any, field_name: str) -> Any:
+    if isinstance(item, dict):
+        return item[field_name]
+    return getattr(item, field_name)
+
+
+def get_next_cursor(item: Any, ordering: Sequence[str]) -> str:
+    """Make cursor pointing right after item (model instance or dict)."""
+    return encode_cursor(
+        ordering,
+        [
+            get_field_value(item, field.removeprefix("-"))
+            for field in ordering
+        ],
+    )
+
+
+def get_keyset_filter(
+        queryset: QuerySet,
+        ordering: Sequence[str],
+        cursor: str,
+) -> Q:
+    """
+    Build condition selecting rows which go after cursor in ordering.
+
+    For ordering `("-created_at", "-id")` it is
+    `created_at < X OR (created_at = X AND id < Y)`.
+    """
+    values = decode_cursor(ordering, cursor)
+    keyset_filter = Q()
+    equal_filter = Q()
+    for field, value in zip(ordering, values, strict=True):
+        field_name = field.removeprefix("-")
+        model_field = queryset.model._meta.get_field(field_name)
+        try:
+            value = model_field.to_python(value)
+        except (ValidationError, TypeError, ValueError):
+            raise InvalidCursorError
+        lookup = "lt" if field.startswith("-") else "gt"
+        keyset_filter |= equal_filter & Q(**{f"{field_name}__{lookup}": value})
+        equal_filter &= Q(**{field_name: value})
+    return keyset_filter
+
+
+def paginate_by_keyset(
+        queryset: QuerySet,
+        *,
+        ordering: Sequence[str],
+        limit: int,
+        offset: int = 0,
+        cursor: str | None = None,
+) -> KeysetPage:
+    """
+    Get page of queryset by cursor, or by offset if cursor is not given.
+
+    Offset is kept for clients which do not use cursors yet. Both ways
+    return cursor of the next page, so a client may switch to cursors
+    at any page.
+
+    Raises:
+        InvalidCursorError: cursor is malformed or made for other ordering.
+    """
+    queryset = queryset.order_by(*ordering)
+    if cursor is None:
+        items = list(queryset[offset: offset + limit + 1])
+    else:
+        queryset = queryset.filter(
+            get_keyset_filter(queryset, ordering, cursor),
+        )
+        items = list(queryset[:limit + 1])
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = get_next_cursor(items[-1], ordering)
+    return KeysetPage(items=items, next_cursor=next_cursor)
@@ -0,0 +1,170 @@
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from django.conf import settings
+from django.db import connection, models
+from django.db.models import Subquery
+from django.db.models.signals import post_delete, post_save
+
+
+__all__ = (
+    "SettingsRegistry",
+    "settings_registry",
+)
+
+
+VERSION_ANNOTATION = "settings_registry_version"
+
+
+@dataclass(slots=True, kw_only=True)
+class CachedRow:
+    row: Any
+    version: int | None
+    loaded_at: float
+    checked_at: float
+
+
+class SettingsRegistry:
+    """
+    Process-local cache of single-row settings models.
+
+    Rows are cached in memory of every worker. Changes are propagated
+    through `SettingsVersion` rows in the database, so they reach all
+    workers without any shared cache: when a row is saved or deleted,
+    its version is incremented in the same transaction, and workers
+    reload the row after they notice the new version. Workers check the
+    version not more often than once in
+    `SETTINGS_REGISTRY_VERSION_CHECK_INTERVAL` seconds, and reload the
+    row regardless of the version after `SETTINGS_REGISTRY_MAX_AGE`
+    seconds.
+    """
+
+    def __init__(self):
+        self.__model_label_to_cached_row: dict[str, CachedRow] = {}
+        self.__registered_models: set[type[models.Model]] = set()
+
+    @staticmethod
+    def get_version_key(model: type[models.Model]) -> str:
+        return model._meta.label_lower
+
+    def get_version(self, model: type[models.Model]) -> int | None:
+        from core.models import SettingsVersion
+
+        return (
+            SettingsVersion.objects
+            .filter(model_label=self.get_version_key(model))
+            .values_list("version", flat=True)
+            .first()
+        )
+
+    def load(self, model: type[models.Model]) -> tuple[Any, int | None]:
+        """
+        Load the first row of model with its version in one query.
+
+        Missing row gets no version, so it is reloaded once the version
+        appears or changes.
+        """
+        from core.models import SettingsVersion
+
+        row = model.objects.annotate(
+            **{
+                VERSION_ANNOTATION: Subquery(
+                    SettingsVersion.objects
+                    .filter(model_label=self.get_version_key(model))
+                    .values("version")[:1]
+                ),
+            },
+        ).first()
+        if row is None:
+            return None, None
+        return row, row.__dict__.pop(VERSION_ANNOTATION)
+
+    def register(self, model: type[models.Model]) -> None:
+        """Invalidate cached row of model on its changes."""
+        if model in self.__registered_models:
+            return
+        self.__registered_models.add(model)
+        post_save.connect(
+            self.on_row_changed,
+            sender=model,
+            dispatch_uid=self.get_version_key(model),
+        )
+        post_delete.connect(
+            self.on_row_changed,
+            sender=model,
+            dispatch_uid=self.get_version_key(model),
+        )
+
+    def get(self, model: type[models.Model]) -> Any:
+        """
+        Get the first row of single-row model.
+
+        Args:
+            model: single-row model class.
+
+        Returns:
+            Model instance or None if there is no row.
+        """
+        self.register(model)
+        model_label = model._meta.label_lower
+        cached_row = self.__model_label_to_cached_row.get(model_label)
+        now = time.monotonic()
+
+        max_age = settings.SETTINGS_REGISTRY_MAX_AGE
+        if cached_row is not None and now - cached_row.loaded_at < max_age:
+            check_interval = settings.SETTINGS_REGISTRY_VERSION_CHECK_INTERVAL
+            if now - cached_row.checked_at < check_interval:
+                return cached_row.row
+            if self.get_version(model) == cached_row.version:
+                cached_row.checked_at = now
+                return cached_row.row
+
+        row, version = self.load(model)
+        self.__model_label_to_cached_row[model_label] = CachedRow(
+            row=row,
+            version=version,
+            loaded_at=now,
+            checked_at=now,
+        )
+        return row
+
+    def invalidate(self, model: type[models.Model]) -> None:
+        """Drop cached row of model in this worker."""
+        self.__model_label_to_cached_row.pop(model._meta.label_lower, None)
+
+    def publish_new_version(self, model: type[models.Model]) -> None:
+        """
+        Make all workers reload the row of model.
+
+        The version is changed in the current transaction, so other
+        workers see it together with the changed row.
+        """
+        from core.models import SettingsVersion
+
+        self.invalidate(model)
+        versions_table = connection.ops.quote_name(
+            SettingsVersion._meta.db_table,
+        )
+        # Single statement, so concurrent first saves do not conflict.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {versions_table} (model_label, version)"
+                f" VALUES (%s, 1)"
+                f" ON CONFLICT (model_label)"
+                f" DO UPDATE SET version = {versions_table}.version + 1",
+                [self.get_version_key(model)],
+            )
+
+    def clear(self) -> None:
+        self.__model_label_to_cached_row.clear()
+
+    def on_row_changed(
+            self,
+            sender: type[models.Model],
+            **kwargs,
+    ) -> None:
+        self.publish_new_version(sender)
+
+
+settings_registry = SettingsRegistry()
@@ -0,0 +1,149 @@
+import datetime
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.exceptions import InvalidCursorError
+from core.pagination import encode_cursor, paginate_by_keyset
+from staff.models import Staff
+from staff.selectors import get_all_staff
+from staff.tests.factories import StaffFactory
+
+
+ORDERING = ("-created_at", "-id")
+
+
+@pytest.fixture
+def staff_list():
+    created_at = datetime.datetime(
+        2025, 3, 1, 12, 0, 0, 123456, tzinfo=datetime.UTC,
+    )
+    # Several rows share the same created_at to check the tiebreaker.
+    return [
+        StaffFactory(
+            created_at=created_at + datetime.timedelta(microseconds=index // 3),
+        )
+        for index in range(10)
+    ]
+
+
+def collect_by_cursor(limit: int) -> list[int]:
+    staff_ids: list[int] = []
+    cursor = None
+    while True:
+        page = paginate_by_keyset(
+            Staff.objects.all(),
+            ordering=ORDERING,
+            limit=limit,
+            cursor=cursor,
+        )
+        staff_ids += [staff.id for staff in page.items]
+        if page.is_end_of_list_reached:
+            return staff_ids
+        cursor = page.next_cursor
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("limit", [1, 3, 10])
+def test_pages_by_cursor_match_offset_order(staff_list, limit):
+    expected_ids = list(
+        Staff.objects.order_by(*ORDERING).values_list("id", flat=True)
+    )
+
+    assert collect_by_cursor(limit) == expected_ids
+
+
+@pytest.mark.django_db
+def test_offset_page_returns_cursor_of_next_page(staff_list):
+    offset_page = paginate_by_keyset(
+        Staff.objects.all(),
+        ordering=ORDERING,
+        limit=4,
+        offset=0,
+    )
+    next_offset_page = paginate_by_keyset(
+        Staff.objects.all(),
+        ordering=ORDERING,
+        limit=4,
+        offset=4,
+    )
+
+    cursor_page = paginate_by_keyset(
+        Staff.objects.all(),
+        ordering=ORDERING,
+        limit=4,
+        cursor=offset_page.next_cursor,
+    )
+
+    assert cursor_page.items == next_offset_page.items
+
+
+@pytest.mark.django_db
+def test_cursor_page_does_not_use_offset(staff_list):
+    first_page = paginate_by_keyset(
+        Staff.objects.all(),
+        ordering=ORDERING,
+        limit=4,
+    )
+
+    with CaptureQueriesContext(connection) as context:
+        paginate_by_keyset(
+            Staff.objects.all(),
+            ordering=ORDERING,
+            limit=4,
+            cursor=first_page.next_cursor,
+        )
+
+    assert "OFFSET" not in context.captured_queries[0]["sql"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor",
+        encode_cursor(("full_name", "id"), ["Ivan", 1]),
+        encode_cursor(ORDERING, ["yesterday", 1]),
+        encode_cursor(ORDERING, [1]),
+        encode_cursor(ORDERING, [[1], 1]),
+        encode_cursor(ORDERING, ["2025-03-01T00:00:00", {"id": 1}]),
+    ],
+)
+def test_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursorError):
+        paginate_by_keyset(
+            Staff.objects.all(),
+            ordering=ORDERING,
+            limit=4,
+            cursor=cursor,
+        )
+
+
+@pytest.mark.django_db
+def test_get_all_staff_by_cursor_skips_total_count(
+        staff_list,
+        django_assert_num_queries,
+):
+    first_page = get_all_staff(
+        order_by="-created_at",
+        include_banned=True,
+        limit=4,
+        offset=0,
+    )
+    assert first_page.pagination.total_count == 10
+
+    with django_assert_num_queries(1):
+        next_page = get_all_staff(
+            order_by="-created_at",
+            include_banned=True,
+            limit=4,
+            offset=0,
+            cursor=first_page.pagination.next_cursor,
+        )
+
+    assert next_page.pagination.total_count is None
+    assert [staff.id for staff in next_page.staff] == list(
+        Staff.objects.order_by("-created_at", "-id")
+        .values_list("id", flat=True)[4:8]
+    )
@@ -0,0 +1,113 @@
+import pytest
+from django.db.models import F
+
+from core.models import SettingsVersion
+from core.settings_registry import settings_registry
+from shifts.models import ShiftCarsThreshold
+
+
+def get_version() -> int | None:
+    return settings_registry.get_version(ShiftCarsThreshold)
+
+
+def publish_version_of_other_worker() -> None:
+    SettingsVersion.objects.filter(
+        model_label=settings_registry.get_version_key(ShiftCarsThreshold),
+    ).update(version=F("version") + 100)
+
+
+@pytest.mark.django_db
+def test_settings_row_cached(django_assert_num_queries):
+    ShiftCarsThreshold.objects.create(value=5)
+
+    with django_assert_num_queries(1):
+        assert ShiftCarsThreshold.get() == 5
+        assert ShiftCarsThreshold.get() == 5
+
+
+@pytest.mark.django_db
+def test_missing_settings_row_cached(django_assert_num_queries):
+    with django_assert_num_queries(1):
+        assert settings_registry.get(ShiftCarsThreshold) is None
+        assert settings_registry.get(ShiftCarsThreshold) is None
+
+
+@pytest.mark.django_db
+def test_settings_row_invalidated_on_save():
+    threshold = ShiftCarsThreshold.objects.create(value=5)
+    assert ShiftCarsThreshold.get() == 5
+    version = get_version()
+
+    threshold.value = 6
+    threshold.save()
+
+    assert ShiftCarsThreshold.get() == 6
+    assert get_version() == version + 1
+
+
+@pytest.mark.django_db
+def test_settings_row_invalidated_on_delete():
+    ShiftCarsThreshold.objects.create(value=5)
+    assert ShiftCarsThreshold.get() == 5
+
+    ShiftCarsThreshold.objects.all().delete()
+
+    assert ShiftCarsThreshold.get() == 8
+
+
+@pytest.mark.django_db
+def test_settings_row_reloaded_on_version_change(
+        settings,
+        django_assert_num_queries,
+):
+    settings.SETTINGS_REGISTRY_VERSION_CHECK_INTERVAL = 0
+    ShiftCarsThreshold.objects.create(value=5)
+    assert ShiftCarsThreshold.get() == 5
+
+    # Version check only.
+    with django_assert_num_queries(1):
+        assert ShiftCarsThreshold.get() == 5
+
+    # Row changed by another worker.
+    ShiftCarsThreshold.objects.update(value=7)
+    publish_version_of_other_worker()
+
+    # Version check and reload.
+    with django_assert_num_queries(2):
+        assert ShiftCarsThreshold.get() == 7
+
+
+@pytest.mark.django_db
+def test_settings_row_version_not_checked_within_interval(settings):
+    settings.SETTINGS_REGISTRY_VERSION_CHECK_INTERVAL = 60
+    ShiftCarsThreshold.objects.create(value=5)
+    assert ShiftCarsThreshold.get() == 5
+
+    ShiftCarsThreshold.objects.update(value=7)
+    publish_version_of_other_worker()
+
+    assert ShiftCarsThreshold.get() == 5
+
+
+@pytest.mark.django_db
+def test_settings_row_reloaded_after_max_age(settings):
+    settings.SETTINGS_REGISTRY_VERSION_CHECK_INTERVAL = 60
+    settings.SETTINGS_REGISTRY_MAX_AGE = 0
+    ShiftCarsThreshold.objects.create(value=5)
+    assert ShiftCarsThreshold.get() == 5
+
+    # Changed without version, e.g. by a queryset update.
+    ShiftCarsThreshold.objects.update(value=7)
+
+    assert ShiftCarsThreshold.get() == 7
+
+
+@pytest.mark.django_db
+def test_version_published_in_single_query(django_assert_num_queries):
+    with django_assert_num_queries(1):
+        settings_registry.publish_new_version(ShiftCarsThreshold)
+    assert get_version() == 1
+
+    with django_assert_num_queries(1):
+        settings_registry.publish_new_version(ShiftCarsThreshold)
+    assert get_version() == 2
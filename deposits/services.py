@@ -1,11 +1,15 @@
+import bisect
 import datetime
 from collections import defaultdict
 from collections.abc import Iterable
 from dataclasses import dataclass
 
+from django.db.models import Case, Count, Min, Value, When
+from django.db.models.expressions import Combinable
+from django.db.models.functions import ExtractMonth, ExtractYear
+
 from deposits.models import FineDepositException, RoadAccidentDepositException
 from shifts.models import Shift
-from shifts.services.report_periods import ReportPeriod
 
 
 def get_staff_excluded_from_fine_deposit(
@@ -59,30 +63,183 @@ def get_report_periods_for_staff_ids(
         staff_ids: Iterable[int],
         until: datetime.date,
 ) -> list[StaffReportPeriods]:
-    shifts = (
+    """Count distinct report periods each staff member had shifts in.
+
+    Report periods are counted in the database by a computed period index,
+    so shifts history is never loaded.
+
+    Keyword Args:
+        staff_ids: IDs of staff.
+        until: last date of shifts history to count.
+
+    Returns:
+        Report periods count of staff who had at least one shift.
+    """
+    staff_report_periods = (
         Shift.objects
         .filter(staff_id__in=staff_ids, date__lte=until)
-        .values("staff_id", "date")
+        .values("staff_id")
+        .annotate(
+            report_periods_count=Count(
+                get_report_period_index_expression("date"),
+                distinct=True,
+            ),
+        )
+        .order_by()
     )
+    return [
+        StaffReportPeriods(
+            staff_id=staff_report_period["staff_id"],
+            report_periods_count=staff_report_period["report_periods_count"],
+        )
+        for staff_report_period in staff_report_periods
+    ]
+
+
+def get_report_period_index_expression(field_name: str) -> Combinable:
+    """Database expression numbering report periods of date field in order.
+
+    Each month has two report periods: days 1-15 and 16 till month end.
 
-    staff_id_to_report_periods: dict[int, set[ReportPeriod]] = defaultdict(set)
+    Args:
+        field_name: name of date field.
+
+    Returns:
+        Expression evaluating to unique report period index.
+    """
+    return (
+            ExtractYear(field_name) * 24
+            + (ExtractMonth(field_name) - 1) * 2
+            + Case(
+                When(**{f"{field_name}__day__lte": 15}, then=Value(0)),
+                default=Value(1),
+            )
+    )
 
-    for shift in shifts:
-        shift_date = shift["date"]
-        staff_id = shift["staff_id"]
 
-        half = 1 if shift_date.day <= 15 else 2
-        period = ReportPeriod.from_number(
-            shift_date.year,
-            shift_date.month,
-            half,
+@dataclass(frozen=True, slots=True, kw_only=True)
+class StaffDepositException:
+    staff_id: int
+    from_date: datetime.date
+    to_date: datetime.date
+
+
+def get_fine_deposit_exceptions(
+        *,
+        from_date: datetime.date,
+        to_date: datetime.date,
+) -> list[StaffDepositException]:
+    exceptions = (
+        FineDepositException.objects
+        .filter(
+            from_date__lte=to_date,
+            to_date__gte=from_date,
         )
-        staff_id_to_report_periods[staff_id].add(period)
+        .values('staff_id', 'from_date', 'to_date')
+    )
+    return [StaffDepositException(**exception) for exception in exceptions]
 
-    return [
-        StaffReportPeriods(
-            staff_id=staff_id,
-            report_periods_count=len(report_periods),
+
+def get_road_accident_deposit_exceptions(
+        *,
+        from_date: datetime.date,
+        to_date: datetime.date,
+) -> list[StaffDepositException]:
+    exceptions = (
+        RoadAccidentDepositException.objects
+        .filter(
+            from_date__lte=to_date,
+            to_date__gte=from_date,
         )
-        for staff_id, report_periods in staff_id_to_report_periods.items()
-    ]
+        .values('staff_id', 'from_date', 'to_date')
+    )
+    return [StaffDepositException(**exception) for exception in exceptions]
+
+
+def filter_staff_excluded_from_deposit(
+        exceptions: Iterable[StaffDepositException],
+        *,
+        from_date: datetime.date,
+        to_date: datetime.date,
+) -> set[int]:
+    return {
+        exception.staff_id
+        for exception in exceptions
+        if exception.from_date <= to_date and exception.to_date >= from_date
+    }
+
+
+def get_report_period_key(date: datetime.date) -> tuple[int, int, int]:
+    """Sortable key of the report period the date belongs to.
+
+    Args:
+        date: any date.
+
+    Returns:
+        Year, month and report period number.
+    """
+    return date.year, date.month, 1 if date.day <= 15 else 2
+
+
+class StaffReportPeriodsHistory:
+    """Report periods of staff shifts history.
+
+    Answers how many report periods each staff member worked in up to
+    any date without querying shifts again.
+    """
+
+    def __init__(self, staff_shift_dates: Iterable[tuple[int, datetime.date]]):
+        staff_id_to_report_period_keys: dict[
+            int, set[tuple[int, int, int]]
+        ] = defaultdict(set)
+        for staff_id, shift_date in staff_shift_dates:
+            staff_id_to_report_period_keys[staff_id].add(
+                get_report_period_key(shift_date),
+            )
+        self.__staff_id_to_report_period_keys = {
+            staff_id: sorted(report_period_keys)
+            for staff_id, report_period_keys
+            in staff_id_to_report_period_keys.items()
+        }
+
+    def get_staff_report_periods(
+            self,
+            until: datetime.date,
+    ) -> list[StaffReportPeriods]:
+        until_key = get_report_period_key(until)
+        result: list[StaffReportPeriods] = []
+        for staff_id, report_period_keys in (
+                self.__staff_id_to_report_period_keys.items()
+        ):
+            report_periods_count = bisect.bisect_right(
+                report_period_keys,
+                until_key,
+            )
+            if report_periods_count:
+                result.append(
+                    StaffReportPeriods(
+                        staff_id=staff_id,
+                        report_periods_count=report_periods_count,
+                    )
+                )
+        return result
+
+
+def get_staff_report_periods_history(
+        *,
+        staff_ids: Iterable[int],
+        until: datetime.date,
+) -> StaffReportPeriodsHistory:
+    # One row with the earliest shift date per staff and report period.
+    shifts = (
+        Shift.objects
+        .filter(staff_id__in=staff_ids, date__lte=until)
+        .values(
+            "staff_id",
+            report_period_index=get_report_period_index_expression("date"),
+        )
+        .annotate(first_shift_date=Min("date"))
+        .values_list("staff_id", "first_shift_date")
+        .order_by()
+    )
+    return StaffReportPeriodsHistory(shifts)
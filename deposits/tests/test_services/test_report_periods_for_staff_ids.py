@@ -0,0 +1,39 @@
+import datetime
+
+import pytest
+
+from deposits.services import (
+    get_report_periods_for_staff_ids,
+    StaffReportPeriods,
+)
+from shifts.tests.factories import ShiftFactory
+from staff.tests.factories import StaffFactory
+
+
+@pytest.mark.django_db
+def test_get_report_periods_for_staff_ids():
+    staff = StaffFactory()
+    other_staff = StaffFactory()
+    for date in (
+            datetime.date(2024, 12, 31),
+            datetime.date(2025, 1, 1),
+            datetime.date(2025, 1, 15),
+            datetime.date(2025, 1, 16),
+            datetime.date(2025, 2, 1),
+            # After the counted history.
+            datetime.date(2025, 2, 16),
+    ):
+        ShiftFactory(staff=staff, date=date)
+    ShiftFactory(staff=other_staff, date=datetime.date(2025, 1, 1))
+    # Not requested staff.
+    ShiftFactory(date=datetime.date(2025, 1, 1))
+
+    result = get_report_periods_for_staff_ids(
+        staff_ids=[staff.id, other_staff.id],
+        until=datetime.date(2025, 2, 15),
+    )
+
+    assert sorted(result, key=lambda item: item.staff_id) == [
+        StaffReportPeriods(staff_id=staff.id, report_periods_count=4),
+        StaffReportPeriods(staff_id=other_staff.id, report_periods_count=1),
+    ]
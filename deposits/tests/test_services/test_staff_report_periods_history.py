@@ -0,0 +1,34 @@
+import datetime
+
+from deposits.services import StaffReportPeriods, StaffReportPeriodsHistory
+
+
+def test_staff_report_periods_history():
+    history = StaffReportPeriodsHistory(
+        [
+            (1, datetime.date(2025, 1, 1)),
+            (1, datetime.date(2025, 1, 15)),
+            (1, datetime.date(2025, 1, 16)),
+            (1, datetime.date(2025, 3, 31)),
+            (2, datetime.date(2025, 2, 1)),
+        ]
+    )
+
+    assert history.get_staff_report_periods(
+        until=datetime.date(2024, 12, 31),
+    ) == []
+    assert history.get_staff_report_periods(
+        until=datetime.date(2025, 1, 15),
+    ) == [StaffReportPeriods(staff_id=1, report_periods_count=1)]
+    assert history.get_staff_report_periods(
+        until=datetime.date(2025, 2, 15),
+    ) == [
+        StaffReportPeriods(staff_id=1, report_periods_count=2),
+        StaffReportPeriods(staff_id=2, report_periods_count=1),
+    ]
+    assert history.get_staff_report_periods(
+        until=datetime.date(2025, 3, 31),
+    ) == [
+        StaffReportPeriods(staff_id=1, report_periods_count=3),
+        StaffReportPeriods(staff_id=2, report_periods_count=1),
+    ]
@@ -0,0 +1,169 @@
+import datetime
+
+import pytest
+
+from deposits.models import FineDepositException, RoadAccidentDepositException
+from deposits.use_cases import DepositListUseCase
+from deposits.use_cases.deposit_list import (
+    DepositListItem,
+    ReportPeriodStaffDeposit,
+)
+from economics.services.shift_statistics_rollups import (
+    rebuild_shift_statistics_rollups,
+)
+from economics.tests.factories import (
+    CarTransporterPenaltyFactory,
+    CarTransporterSurchargeFactory,
+)
+from economics.use_cases import (
+    ReportPeriodCloseUseCase,
+    StaffShiftsStatisticsUseCase,
+)
+from shifts.services.report_periods import ReportPeriod
+from shifts.tests.factories import ShiftFactory, TransferredCarFactory
+from staff.models import StaffType
+from staff.tests.factories import StaffFactory
+
+
+def compute_deposits_per_report_period(
+        *,
+        from_report_period: ReportPeriod,
+        to_report_period: ReportPeriod,
+) -> list[DepositListItem]:
+    """Run full staff shifts statistics report for every report period."""
+    deposits: list[DepositListItem] = []
+    report_period = from_report_period
+    while report_period <= to_report_period:
+        response = StaffShiftsStatisticsUseCase(
+            year=report_period.year,
+            month=report_period.month,
+            report_period_number=report_period.number,
+        ).execute()
+        deposits.append(
+            DepositListItem(
+                report_period=report_period,
+                staff_deposits_breakdown=[
+                    ReportPeriodStaffDeposit(
+                        staff_id=staff.staff.id,
+                        road_accident_deposit_amount=(
+                            staff.total_statistics.road_accident_deposit_amount
+                        ),
+                        fine_deposit_amount=(
+                            staff.total_statistics.fine_deposit_amount
+                        ),
+                    )
+                    for staff in response.staff_list
+                ],
+            )
+        )
+        report_period = report_period.next()
+    return deposits
+
+
+@pytest.fixture
+def staff_shifts_history(service_prices):
+    veteran = StaffFactory(type=StaffType.CAR_TRANSPORTER)
+    newcomer = StaffFactory(type=StaffType.CAR_TRANSPORTER)
+    excluded = StaffFactory(type=StaffType.CAR_TRANSPORTER_AND_WASHER)
+
+    # Veteran worked in 6 report periods before the deposits range.
+    for month in range(10, 13):
+        for day in (3, 20):
+            ShiftFactory(staff=veteran, date=datetime.date(2024, month, day))
+
+    for staff in (veteran, newcomer, excluded):
+        for date in (
+                datetime.date(2025, 1, 5),
+                datetime.date(2025, 1, 20),
+                datetime.date(2025, 2, 10),
+                datetime.date(2025, 2, 25),
+        ):
+            shift = ShiftFactory(
+                staff=staff,
+                date=date,
+                transferred_cars_threshold=1,
+            )
+            TransferredCarFactory.create_batch(3, shift=shift)
+
+    CarTransporterPenaltyFactory(
+        staff=newcomer,
+        date=datetime.date(2025, 1, 20),
+        amount=200,
+    )
+    CarTransporterSurchargeFactory(
+        staff=newcomer,
+        date=datetime.date(2025, 2, 10),
+        amount=300,
+    )
+    FineDepositException.objects.create(
+        staff=excluded,
+        from_date=datetime.date(2025, 1, 10),
+        to_date=datetime.date(2025, 1, 20),
+    )
+    RoadAccidentDepositException.objects.create(
+        staff=excluded,
+        from_date=datetime.date(2025, 2, 20),
+        to_date=datetime.date(2025, 3, 5),
+    )
+    rebuild_shift_statistics_rollups()
+    return veteran, newcomer, excluded
+
+
+@pytest.mark.django_db
+def test_deposit_list_matches_per_report_period_reports(
+        staff_shifts_history,
+):
+    from_report_period = ReportPeriod.from_number(2025, 1, 1)
+    to_report_period = ReportPeriod.from_number(2025, 3, 1)
+
+    response = DepositListUseCase(
+        from_report_period=from_report_period,
+        to_report_period=to_report_period,
+    ).execute()
+
+    assert response.deposits == compute_deposits_per_report_period(
+        from_report_period=from_report_period,
+        to_report_period=to_report_period,
+    )
+
+
+@pytest.mark.django_db
+def test_deposit_list_uses_closed_report_period_snapshot(
+        staff_shifts_history,
+):
+    ReportPeriodCloseUseCase(
+        year=2025,
+        month=1,
+        report_period_number=2,
+    ).execute()
+    from_report_period = ReportPeriod.from_number(2025, 1, 1)
+    to_report_period = ReportPeriod.from_number(2025, 2, 2)
+
+    response = DepositListUseCase(
+        from_report_period=from_report_period,
+        to_report_period=to_report_period,
+    ).execute()
+
+    assert response.deposits == compute_deposits_per_report_period(
+        from_report_period=from_report_period,
+        to_report_period=to_report_period,
+    )
+
+
+@pytest.mark.django_db
+def test_deposit_list_totals(staff_shifts_history):
+    veteran, newcomer, excluded = staff_shifts_history
+
+    response = DepositListUseCase(
+        from_report_period=ReportPeriod.from_number(2025, 1, 1),
+        to_report_period=ReportPeriod.from_number(2025, 2, 2),
+    ).execute()
+
+    staff_id_to_total_fine_deposit_amount = {
+        staff.id: staff.total_fine_deposit_amount
+        for staff in response.staff_list
+    }
+    # Veteran has no fine deposit after 6 report periods.
+    assert staff_id_to_total_fine_deposit_amount[veteran.id] == 0
+    assert staff_id_to_total_fine_deposit_amount[newcomer.id] == 4 * 500
+    assert staff_id_to_total_fine_deposit_amount[excluded.id] == 2 * 500
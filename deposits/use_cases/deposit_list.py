@@ -3,8 +3,25 @@ from collections import defaultdict
 from collections.abc import Iterable
 from dataclasses import dataclass
 
-from deposits.services import compute_staff_deposit_return_date
-from economics.use_cases import StaffShiftsStatisticsUseCase
+from deposits.services import (
+    compute_staff_deposit_return_date, filter_staff_excluded_from_deposit,
+    get_fine_deposit_exceptions, get_report_period_key,
+    get_road_accident_deposit_exceptions, get_staff_report_periods_history,
+)
+from economics.selectors import (
+    get_car_transporters_penalties_for_period,
+    get_car_transporters_surcharges_for_period,
+    StaffPenaltiesOrSurchargesForSpecificShift,
+)
+from economics.services.report_period_snapshots import (
+    get_report_periods_snapshots_staff_lists,
+)
+from economics.services.reports.staff_shifts_statistics import (
+    FineDepositCalculator, get_cars_to_wash_statistics_from_rollups,
+    group_shifts_statistics_by_staff,
+    merge_staff_list_shifts_statistics_and_penalties_and_surcharges,
+    RoadAccidentDepositCalculator, ShiftStatistics, StaffShiftsStatistics,
+)
 from shifts.services.report_periods import ReportPeriod
 from staff.selectors import get_staff, StaffItem
 
@@ -72,13 +89,183 @@ def merge_staff_list(
     ]
 
 
+def split_penalties_or_surcharges_by_report_periods(
+        penalties_or_surcharges: Iterable[
+            StaffPenaltiesOrSurchargesForSpecificShift
+        ],
+) -> dict[
+    tuple[int, int, int],
+    list[StaffPenaltiesOrSurchargesForSpecificShift],
+]:
+    report_period_key_to_staff_id_to_items = defaultdict(
+        lambda: defaultdict(list),
+    )
+    for staff_penalties_or_surcharges in penalties_or_surcharges:
+        staff_id = staff_penalties_or_surcharges.staff_id
+        for item in staff_penalties_or_surcharges.items:
+            report_period_key = get_report_period_key(item.shift_date)
+            report_period_key_to_staff_id_to_items[report_period_key][
+                staff_id
+            ].append(item)
+
+    return {
+        report_period_key: [
+            StaffPenaltiesOrSurchargesForSpecificShift(
+                staff_id=staff_id,
+                items=items,
+            )
+            for staff_id, items in staff_id_to_items.items()
+        ]
+        for report_period_key, staff_id_to_items
+        in report_period_key_to_staff_id_to_items.items()
+    }
+
+
+def split_shifts_statistics_by_report_periods(
+        shifts_statistics: Iterable[ShiftStatistics],
+) -> dict[tuple[int, int, int], list[ShiftStatistics]]:
+    report_period_key_to_shifts_statistics = defaultdict(list)
+    for shift_statistics in shifts_statistics:
+        report_period_key = get_report_period_key(shift_statistics.shift_date)
+        report_period_key_to_shifts_statistics[report_period_key].append(
+            shift_statistics,
+        )
+    return report_period_key_to_shifts_statistics
+
+
+def get_report_periods_staff_shifts_statistics(
+        *,
+        staff_list: list[StaffItem],
+        report_periods: list[ReportPeriod],
+) -> list[list[StaffShiftsStatistics]]:
+    """Compute staff shifts statistics of consecutive report periods.
+
+    Rows of the whole date range are fetched once and split into report
+    periods in memory. Closed report periods are served from snapshots.
+
+    Keyword Args:
+        staff_list: staff to compute statistics for.
+        report_periods: consecutive report periods in ascending order.
+
+    Returns:
+        Staff shifts statistics of every report period in the same order.
+    """
+    from_date = report_periods[0].from_date
+    to_date = report_periods[-1].to_date
+
+    report_period_key_to_snapshot_staff_list = (
+        get_report_periods_snapshots_staff_lists(
+            from_date=from_date,
+            to_date=to_date,
+        )
+    )
+
+    report_period_key_to_penalties = (
+        split_penalties_or_surcharges_by_report_periods(
+            get_car_transporters_penalties_for_period(
+                from_date=from_date,
+                to_date=to_date,
+            )
+        )
+    )
+    report_period_key_to_surcharges = (
+        split_penalties_or_surcharges_by_report_periods(
+            get_car_transporters_surcharges_for_period(
+                from_date=from_date,
+                to_date=to_date,
+            )
+        )
+    )
+    report_period_key_to_shifts_statistics = (
+        split_shifts_statistics_by_report_periods(
+            get_cars_to_wash_statistics_from_rollups(
+                from_date=from_date,
+                to_date=to_date,
+            )
+        )
+    )
+    fine_deposit_exceptions = get_fine_deposit_exceptions(
+        from_date=from_date,
+        to_date=to_date,
+    )
+    road_accident_deposit_exceptions = get_road_accident_deposit_exceptions(
+        from_date=from_date,
+        to_date=to_date,
+    )
+    staff_report_periods_history = get_staff_report_periods_history(
+        staff_ids=[staff.id for staff in staff_list],
+        until=to_date,
+    )
+
+    result: list[list[StaffShiftsStatistics]] = []
+    for report_period in report_periods:
+        report_period_key = (
+            report_period.year,
+            report_period.month,
+            report_period.number,
+        )
+
+        snapshot_staff_list = report_period_key_to_snapshot_staff_list.get(
+            report_period_key,
+        )
+        if snapshot_staff_list is not None:
+            result.append(snapshot_staff_list)
+            continue
+
+        fine_deposit_calculator = FineDepositCalculator(
+            excluded_staff_ids=filter_staff_excluded_from_deposit(
+                fine_deposit_exceptions,
+                from_date=report_period.from_date,
+                to_date=report_period.to_date,
+            ),
+            staff_report_periods=(
+                staff_report_periods_history.get_staff_report_periods(
+                    until=report_period.to_date,
+                )
+            ),
+        )
+        road_accident_deposit_calculator = RoadAccidentDepositCalculator(
+            excluded_staff_ids=filter_staff_excluded_from_deposit(
+                road_accident_deposit_exceptions,
+                from_date=report_period.from_date,
+                to_date=report_period.to_date,
+            ),
+        )
+        staff_shifts_statistics = group_shifts_statistics_by_staff(
+            report_period_key_to_shifts_statistics.get(report_period_key, []),
+        )
+        result.append(
+            merge_staff_list_shifts_statistics_and_penalties_and_surcharges(
+                staff_list=staff_list,
+                staff_shifts_statistics=staff_shifts_statistics,
+                penalties=report_period_key_to_penalties.get(
+                    report_period_key,
+                    [],
+                ),
+                surcharges=report_period_key_to_surcharges.get(
+                    report_period_key,
+                    [],
+                ),
+                fine_deposit_calculator=fine_deposit_calculator,
+                road_accident_deposit_calculator=(
+                    road_accident_deposit_calculator
+                ),
+            )
+        )
+    return result
+
+
 @dataclass(frozen=True, slots=True, kw_only=True)
 class DepositListUseCase:
     from_report_period: ReportPeriod
     to_report_period: ReportPeriod
 
     def execute(self) -> DepositListResponse:
+        report_periods: list[ReportPeriod] = []
         current_report_period = self.from_report_period
+        while current_report_period <= self.to_report_period:
+            report_periods.append(current_report_period)
+            current_report_period = current_report_period.next()
 
         staff_list = get_staff()
 
@@ -87,15 +274,22 @@ class DepositListUseCase:
 
         deposits: list[DepositListItem] = []
 
-        while current_report_period <= self.to_report_period:
-            staff_shifts_statistics = StaffShiftsStatisticsUseCase(
-                year=current_report_period.year,
-                month=current_report_period.month,
-                report_period_number=current_report_period.number,
-            ).execute()
+        if report_periods:
+            report_periods_staff_shifts_statistics = (
+                get_report_periods_staff_shifts_statistics(
+                    staff_list=staff_list,
+                    report_periods=report_periods,
+                )
+            )
+        else:
+            report_periods_staff_shifts_statistics = []
 
+        for report_period, staff_shifts_statistics in zip(
+                report_periods,
+                report_periods_staff_shifts_statistics,
+        ):
             report_period_staff_deposits: list[ReportPeriodStaffDeposit] = []
-            for staff in staff_shifts_statistics.staff_list:
+            for staff in staff_shifts_statistics:
                 staff_id = staff.staff.id
 
                 road_accident_deposit_amount = (
@@ -124,13 +318,11 @@ class DepositListUseCase:
 
             deposits.append(
                 DepositListItem(
-                    report_period=current_report_period,
+                    report_period=report_period,
                     staff_deposits_breakdown=report_period_staff_deposits,
                 )
             )
 
-            current_report_period = current_report_period.next()
-
         return DepositListResponse(
             staff_list=merge_staff_list(
                 staff=staff_list,
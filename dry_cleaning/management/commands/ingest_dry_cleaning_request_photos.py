@@ -0,0 +1,58 @@
+import time
+
+from django.core.management import BaseCommand
+
+from dry_cleaning.services.dry_cleaning_requests import (
+    DryCleaningRequestPhotosIngestInteractor,
+)
+
+
+class Command(BaseCommand):
+    help = "Upload pending dry cleaning request photos from Telegram to S3"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=20,
+            help="Dry cleaning requests count handled at once",
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=5,
+        )
+        parser.add_argument(
+            "--forever",
+            action="store_true",
+            help="Keep polling pending photos instead of exiting",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1,
+            help="Seconds to wait when there are no pending photos",
+        )
+
+    def handle(self, *args, **options):
+        interactor = DryCleaningRequestPhotosIngestInteractor(
+            batch_size=options["batch_size"],
+            max_attempts=options["max_attempts"],
+        )
+        while True:
+            result = interactor.execute()
+            is_processed = (
+                result.uploaded_photos_count
+                or result.failed_photos_count
+                or result.ready_requests_count
+            )
+            if is_processed:
+                self.stdout.write(
+                    f"Photos uploaded: {result.uploaded_photos_count},"
+                    f" failed: {result.failed_photos_count},"
+                    f" requests ready: {result.ready_requests_count}"
+                )
+            elif not options["forever"]:
+                break
+            else:
+                time.sleep(options["poll_interval"])
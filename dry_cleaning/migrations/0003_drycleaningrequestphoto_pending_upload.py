@@ -0,0 +1,32 @@
+# Generated by Django 5.1.7 on 2026-10-18 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dry_cleaning', '0002_drycleaningadmin'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='drycleaningrequestphoto',
+            name='telegram_file_id',
+            field=models.CharField(blank=True, max_length=255, null=True, verbose_name='Telegram file ID'),
+        ),
+        migrations.AddField(
+            model_name='drycleaningrequestphoto',
+            name='upload_attempts_count',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Upload attempts count'),
+        ),
+        migrations.AlterField(
+            model_name='drycleaningrequestphoto',
+            name='url',
+            field=models.URLField(blank=True, max_length=255, null=True, verbose_name='url'),
+        ),
+        migrations.AddIndex(
+            model_name='drycleaningrequestphoto',
+            index=models.Index(condition=models.Q(('url__isnull', True)), fields=['request'], name='dry_cleaning_photo_pending'),
+        ),
+    ]
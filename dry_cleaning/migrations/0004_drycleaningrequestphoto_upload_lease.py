@@ -0,0 +1,24 @@
+# Generated by Django 5.1.7 on 2026-10-18 14:45
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dry_cleaning', '0003_drycleaningrequestphoto_pending_upload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='drycleaningrequestphoto',
+            name='last_error',
+            field=models.TextField(blank=True, null=True, verbose_name='Last error'),
+        ),
+        migrations.AddField(
+            model_name='drycleaningrequestphoto',
+            name='next_attempt_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Next attempt at'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from dry_cleaning.models.dry_cleaning_requests import DryCleaningRequest
@@ -11,8 +12,43 @@ class DryCleaningRequestPhoto(models.Model):
         related_name="photos",
         verbose_name=_("Dry cleaning request"),
     )
-    url = models.URLField(max_length=255, verbose_name=_("url"))
+    url = models.URLField(
+        max_length=255,
+        blank=True,
+        null=True,
+        verbose_name=_("url"),
+    )
+    telegram_file_id = models.CharField(
+        max_length=255,
+        blank=True,
+        null=True,
+        verbose_name=_("Telegram file ID"),
+    )
+    upload_attempts_count = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name=_("Upload attempts count"),
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name=_("Next attempt at"),
+    )
+    last_error = models.TextField(
+        blank=True,
+        null=True,
+        verbose_name=_("Last error"),
+    )
 
     class Meta:
         verbose_name = _("Dry cleaning request photo")
         verbose_name_plural = _("Dry cleaning request photos")
+        indexes = (
+            models.Index(
+                fields=("request",),
+                condition=models.Q(url__isnull=True),
+                name="dry_cleaning_photo_pending",
+            ),
+        )
+
+    @property
+    def is_uploaded(self) -> bool:
+        return self.url is not None
@@ -1,5 +1,9 @@
 from .approve import DryCleaningRequestApproveInteractor
 from .create import DryCleaningRequestCreateInteractor
+from .ingest_photos import (
+    DryCleaningRequestPhotosIngestInteractor,
+    DryCleaningRequestPhotosIngestResult,
+)
 from .list import DryCleaningRequestListInteractor
 from .reject import DryCleaningRequestRejectInteractor
 from .retrieve import DryCleaningRequestRetrieveByIdInteractor
@@ -11,4 +15,6 @@ __all__ = (
     "DryCleaningRequestRetrieveByIdInteractor",
     "DryCleaningRequestApproveInteractor",
     "DryCleaningRequestRejectInteractor",
+    "DryCleaningRequestPhotosIngestInteractor",
+    "DryCleaningRequestPhotosIngestResult",
 )
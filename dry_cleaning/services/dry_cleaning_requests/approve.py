@@ -14,7 +14,8 @@ from dry_cleaning.models import (
     DryCleaningRequestPhoto,
     DryCleaningRequestService,
 )
-from telegram.services import get_telegram_bot, try_send_photos_media_group
+from telegram.models import NotificationOutbox
+from telegram.services import enqueue_message, enqueue_photos_media_group
 
 
 class HasIdAndCount(TypedDict):
@@ -68,13 +69,12 @@ class DryCleaningRequestApproveInteractor:
 
         photo_urls = DryCleaningRequestPhoto.objects.filter(
             request=dry_cleaning_request,
+            url__isnull=False,
         ).values_list("url", flat=True)
         services = DryCleaningRequestService.objects.filter(
             request=dry_cleaning_request,
         ).select_related("service")
 
-        bot = get_telegram_bot()
-
         lines: list[str] = [
             "✅ Ваш запрос на химчистку одобрен",
             f"Гос.номер: {dry_cleaning_request.car_number}",
@@ -92,9 +92,16 @@ class DryCleaningRequestApproveInteractor:
 
         caption = "\n".join(lines)
 
-        try_send_photos_media_group(
-            bot=bot,
+        notification = enqueue_photos_media_group(
+            bot=NotificationOutbox.Bot.MAIN,
             file_ids=photo_urls,
             caption=caption,
             chat_id=dry_cleaning_request.shift.staff_id,
         )
+        # Photos are still pending or failed to upload.
+        if notification is None:
+            enqueue_message(
+                bot=NotificationOutbox.Bot.MAIN,
+                text=caption,
+                chat_id=dry_cleaning_request.shift.staff_id,
+            )
@@ -14,14 +14,11 @@ from dry_cleaning.models import (
     DryCleaningRequestService,
 )
 from dry_cleaning.models.dry_cleaning_admins import DryCleaningAdmin
-from photo_upload.services import upload_via_urls
 from shifts.services.shifts.validators import ensure_shift_exists
+from telegram.models import NotificationOutbox
 from telegram.services import (
-    get_dry_cleaning_telegram_bot,
-    get_file_urls,
-    get_telegram_bot,
-    try_send_message,
-    try_send_photos_media_group,
+    enqueue_message,
+    enqueue_photos_media_group,
 )
 
 
@@ -53,8 +50,67 @@ class DryCleaningRequestCreateResponseDto:
     updated_at: datetime.datetime
 
 
+def enqueue_dry_cleaning_request_created_notifications(
+        dry_cleaning_request: DryCleaningRequest,
+) -> None:
+    """Notify dry cleaning admins about the new request with its photos."""
+    callback_data = (
+        f"dry_cleaning_request:{dry_cleaning_request.id}:"
+        f"{settings.DEPARTMENT_NAME}"
+    )
+    button = InlineKeyboardButton(
+        text="Проверить",
+        callback_data=callback_data,
+    )
+    reply_markup = InlineKeyboardMarkup(keyboard=[[button]])
+
+    services = DryCleaningRequestService.objects.filter(
+        request=dry_cleaning_request,
+    ).select_related("service")
+    lines: list[str] = [
+        f"<b>Сотрудник {dry_cleaning_request.shift.staff.full_name} "
+        "запрашивает химчистку</b>",
+        f"Гос.номер: {dry_cleaning_request.car_number}",
+    ]
+    for service in services:
+        if service.service.is_countable:
+            lines.append(f"{service.service.name} - {service.count} шт.")
+        else:
+            lines.append(service.service.name)
+
+    photo_urls = DryCleaningRequestPhoto.objects.filter(
+        request=dry_cleaning_request,
+        url__isnull=False,
+    ).order_by("id").values_list("url", flat=True)
+
+    user_ids = DryCleaningAdmin.objects.values_list("id", flat=True)
+    for chat_id in user_ids:
+        enqueue_photos_media_group(
+            bot=NotificationOutbox.Bot.DRY_CLEANING,
+            file_ids=photo_urls,
+            chat_id=chat_id,
+            caption="\n".join(lines),
+        )
+
+        enqueue_message(
+            bot=NotificationOutbox.Bot.DRY_CLEANING,
+            reply_markup=reply_markup,
+            text="Новый запрос на химчистку",
+            chat_id=chat_id,
+        )
+
+
 @dataclass(frozen=True, slots=True, kw_only=True)
 class DryCleaningRequestCreateInteractor:
+    """
+    Create dry cleaning request.
+
+    Photos are stored as pending with their Telegram file IDs. They are
+    uploaded to S3 in background by
+    `DryCleaningRequestPhotosIngestInteractor`, which also notifies
+    admins once the photos are ready.
+    """
+
     shift_id: int
     car_number: str
     photo_file_ids: Iterable[str]
@@ -67,22 +123,15 @@ class DryCleaningRequestCreateInteractor:
             shift_id=self.shift_id,
             car_number=self.car_number,
         )
-        bot = get_telegram_bot()
-
-        urls = get_file_urls(bot, self.photo_file_ids)
-        urls = [
-            uploaded_photo.url
-            for uploaded_photo in upload_via_urls(urls, folder="dry_cleaning")
-        ]
 
         photos = DryCleaningRequestPhoto.objects.bulk_create(
             DryCleaningRequestPhoto(
                 request=dry_cleaning_request,
-                url=url,
+                telegram_file_id=file_id,
             )
-            for url in urls
+            for file_id in self.photo_file_ids
         )
-        services = DryCleaningRequestService.objects.bulk_create(
+        DryCleaningRequestService.objects.bulk_create(
             DryCleaningRequestService(
                 request=dry_cleaning_request,
                 service_id=service["id"],
@@ -90,43 +139,13 @@ class DryCleaningRequestCreateInteractor:
             )
             for service in self.services
         )
+        services = DryCleaningRequestService.objects.filter(
+            request=dry_cleaning_request,
+        ).select_related("service")
 
-        callback_data = (
-            f"dry_cleaning_request:{dry_cleaning_request.id}:"
-            f"{settings.DEPARTMENT_NAME}"
-        )
-        button = InlineKeyboardButton(
-            text="Проверить",
-            callback_data=callback_data,
-        )
-        reply_markup = InlineKeyboardMarkup(keyboard=[[button]])
-
-        lines: list[str] = [
-            f"<b>Сотрудник {dry_cleaning_request.shift.staff.full_name} "
-            "запрашивает химчистку</b>",
-            f"Гос.номер: {dry_cleaning_request.car_number}",
-        ]
-        for service in services:
-            if service.service.is_countable:
-                lines.append(f"{service.service.name} - {service.count} шт.")
-            else:
-                lines.append(service.service.name)
-
-        photo_urls = [photo.url for photo in photos]
-
-        bot = get_dry_cleaning_telegram_bot()
-        user_ids = DryCleaningAdmin.objects.values_list("id", flat=True)
-        for chat_id in user_ids:
-            try_send_photos_media_group(
-                bot=bot, file_ids=photo_urls, chat_id=chat_id,
-                caption="\n".join(lines)
-            )
-
-            try_send_message(
-                bot=bot,
-                reply_markup=reply_markup,
-                text="Новый запрос на химчистку",
-                chat_id=chat_id,
+        if not photos:
+            enqueue_dry_cleaning_request_created_notifications(
+                dry_cleaning_request,
             )
 
         return DryCleaningRequestCreateResponseDto(
@@ -135,7 +154,7 @@ class DryCleaningRequestCreateInteractor:
             staff_id=dry_cleaning_request.shift.staff_id,
             staff_full_name=dry_cleaning_request.shift.staff.full_name,
             car_number=dry_cleaning_request.car_number,
-            photo_urls=photo_urls,
+            photo_urls=[],
             services=[
                 DryCleaningRequestServiceDto(
                     id=service.service_id,
@@ -0,0 +1,228 @@
+import datetime
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from django.db import transaction
+from django.db.models import F, QuerySet
+from django.utils import timezone
+from minio import Minio
+from telebot import TeleBot
+
+from dry_cleaning.models import DryCleaningRequest, DryCleaningRequestPhoto
+from dry_cleaning.services.dry_cleaning_requests.create import (
+    enqueue_dry_cleaning_request_created_notifications,
+)
+from photo_upload.services import get_s3_client, upload_via_url
+from telegram.services import get_telegram_bot
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class DryCleaningRequestPhotosIngestResult:
+    uploaded_photos_count: int
+    failed_photos_count: int
+    ready_requests_count: int
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class TelegramPhotoUploadResult:
+    url: str | None = None
+    error: str | None = None
+
+
+def try_upload_telegram_photo(
+        *,
+        bot: TeleBot,
+        client: Minio,
+        file_id: str,
+) -> TelegramPhotoUploadResult:
+    """
+    Upload photo from Telegram to S3.
+
+    Returns:
+        Public URL of uploaded photo, or error if it was not uploaded.
+    """
+    try:
+        file_url = bot.get_file_url(file_id)
+        url = upload_via_url(
+            file_url,
+            folder="dry_cleaning",
+            client=client,
+        ).url
+    except Exception as error:
+        logger.exception("Could not upload Telegram photo %s", file_id)
+        return TelegramPhotoUploadResult(error=str(error) or repr(error))
+    return TelegramPhotoUploadResult(url=url)
+
+
+def get_pending_photos(max_attempts: int) -> QuerySet[DryCleaningRequestPhoto]:
+    return DryCleaningRequestPhoto.objects.filter(
+        url__isnull=True,
+        upload_attempts_count__lt=max_attempts,
+    )
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class DryCleaningRequestPhotosIngestInteractor:
+    """
+    Upload pending photos of dry cleaning requests from Telegram to S3.
+
+    A batch is claimed in a short transaction: requests are locked with
+    `SKIP LOCKED` and their pending photos are leased for
+    `lease_seconds`, so several workers may run at once and photos of a
+    crashed worker are picked up again after the lease expires. Photos
+    are uploaded concurrently outside of any transaction. Results are
+    saved in a second short transaction, and once a request has no
+    pending photos left, admins are notified about it. A photo which
+    failed to upload is retried after `retry_delay_seconds`, doubled on
+    every attempt. A photo which was not uploaded after `max_attempts`
+    attempts is given up, and the request is sent without it.
+    """
+
+    batch_size: int = 20
+    max_attempts: int = 5
+    max_workers: int = 10
+    lease_seconds: float = 300
+    retry_delay_seconds: float = 30
+
+    def get_next_attempt_at(
+            self,
+            *,
+            photo: DryCleaningRequestPhoto,
+            result: TelegramPhotoUploadResult,
+            now: datetime.datetime,
+    ) -> datetime.datetime:
+        if result.error is None:
+            return now
+        return now + datetime.timedelta(
+            seconds=(
+                self.retry_delay_seconds
+                * 2 ** (photo.upload_attempts_count - 1)
+            ),
+        )
+
+    def claim_batch(self) -> list[DryCleaningRequestPhoto]:
+        now = timezone.now()
+        with transaction.atomic():
+            claimable_photos = get_pending_photos(self.max_attempts).filter(
+                next_attempt_at__lte=now,
+            )
+            request_ids = list(
+                DryCleaningRequest.objects
+                .select_for_update(skip_locked=True)
+                .filter(id__in=claimable_photos.values("request_id"))
+                .order_by("id")
+                .values_list("id", flat=True)[:self.batch_size]
+            )
+            photos = list(
+                claimable_photos
+                .filter(request_id__in=request_ids)
+                .order_by("id")
+            )
+            DryCleaningRequestPhoto.objects.filter(
+                id__in=[photo.id for photo in photos],
+            ).update(
+                upload_attempts_count=F("upload_attempts_count") + 1,
+                next_attempt_at=now + datetime.timedelta(
+                    seconds=self.lease_seconds,
+                ),
+            )
+        for photo in photos:
+            photo.upload_attempts_count += 1
+        return photos
+
+    def upload_photos(
+            self,
+            photos: list[DryCleaningRequestPhoto],
+    ) -> list[TelegramPhotoUploadResult]:
+        bot = get_telegram_bot()
+        client = get_s3_client()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(
+                executor.map(
+                    lambda photo: try_upload_telegram_photo(
+                        bot=bot,
+                        client=client,
+                        file_id=photo.telegram_file_id,
+                    ),
+                    photos,
+                )
+            )
+
+    @transaction.atomic
+    def save_results(
+            self,
+            photos: list[DryCleaningRequestPhoto],
+            results: list[TelegramPhotoUploadResult],
+    ) -> DryCleaningRequestPhotosIngestResult:
+        dry_cleaning_requests = list(
+            DryCleaningRequest.objects
+            .select_for_update(of=("self",))
+            .select_related("shift__staff")
+            .filter(id__in={photo.request_id for photo in photos})
+            .order_by("id")
+        )
+        # Photo may have been uploaded by another worker after the lease
+        # of this one has expired.
+        still_pending_photo_ids = set(
+            DryCleaningRequestPhoto.objects
+            .filter(id__in=[photo.id for photo in photos], url__isnull=True)
+            .values_list("id", flat=True)
+        )
+        now = timezone.now()
+        saved_photos: list[DryCleaningRequestPhoto] = []
+        for photo, result in zip(photos, results, strict=True):
+            if photo.id not in still_pending_photo_ids:
+                continue
+            photo.url = result.url
+            photo.last_error = result.error
+            photo.next_attempt_at = self.get_next_attempt_at(
+                photo=photo,
+                result=result,
+                now=now,
+            )
+            saved_photos.append(photo)
+        DryCleaningRequestPhoto.objects.bulk_update(
+            saved_photos,
+            ("url", "last_error", "next_attempt_at"),
+        )
+
+        saved_request_ids = {photo.request_id for photo in saved_photos}
+        not_ready_request_ids = set(
+            get_pending_photos(self.max_attempts)
+            .filter(request_id__in=saved_request_ids)
+            .values_list("request_id", flat=True)
+        )
+        ready_requests = [
+            dry_cleaning_request
+            for dry_cleaning_request in dry_cleaning_requests
+            if dry_cleaning_request.id in saved_request_ids
+            and dry_cleaning_request.id not in not_ready_request_ids
+        ]
+        for dry_cleaning_request in ready_requests:
+            enqueue_dry_cleaning_request_created_notifications(
+                dry_cleaning_request,
+            )
+
+        uploaded_photos_count = sum(
+            photo.is_uploaded for photo in saved_photos
+        )
+        return DryCleaningRequestPhotosIngestResult(
+            uploaded_photos_count=uploaded_photos_count,
+            failed_photos_count=len(saved_photos) - uploaded_photos_count,
+            ready_requests_count=len(ready_requests),
+        )
+
+    def execute(self) -> DryCleaningRequestPhotosIngestResult:
+        photos = self.claim_batch()
+        if not photos:
+            return DryCleaningRequestPhotosIngestResult(
+                uploaded_photos_count=0,
+                failed_photos_count=0,
+                ready_requests_count=0,
+            )
+        results = self.upload_photos(photos)
+        return self.save_results(photos, results)
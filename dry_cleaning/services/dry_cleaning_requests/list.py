@@ -65,7 +65,11 @@ class DryCleaningRequestListInteractor:
         result: list[DryCleaningRequestListItemDto] = []
         for request in requests:
             services = request_id_to_services.get(request.id, [])
-            photo_urls = [photo.url for photo in request.photos.all()]
+            photo_urls = [
+                photo.url
+                for photo in request.photos.all()
+                if photo.is_uploaded
+            ]
             services = [
                 DryCleaningRequestServiceDto(
                     id=service.service_id,
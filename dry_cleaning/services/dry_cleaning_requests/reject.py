@@ -1,5 +1,7 @@
 from dataclasses import dataclass
 
+from django.db import transaction
+
 from dry_cleaning.exceptions import (
     DryCleaningRequestInvalidStatusError,
     DryCleaningRequestNotFoundError,
@@ -9,7 +11,8 @@ from dry_cleaning.models import (
     DryCleaningRequestPhoto,
     DryCleaningRequestService,
 )
-from telegram.services import get_telegram_bot, try_send_photos_media_group
+from telegram.models import NotificationOutbox
+from telegram.services import enqueue_message, enqueue_photos_media_group
 
 
 @dataclass(frozen=True, slots=True, kw_only=True)
@@ -17,11 +20,12 @@ class DryCleaningRequestRejectInteractor:
     dry_cleaning_request_id: int
     response_comment: str | None
 
+    @transaction.atomic
     def execute(self) -> None:
         try:
-            dry_cleaning_request = DryCleaningRequest.objects.get(
-                id=self.dry_cleaning_request_id
-            )
+            dry_cleaning_request = DryCleaningRequest.objects.select_related(
+                "shift"
+            ).get(id=self.dry_cleaning_request_id)
         except DryCleaningRequest.DoesNotExist:
             raise DryCleaningRequestNotFoundError
 
@@ -40,13 +44,12 @@ class DryCleaningRequestRejectInteractor:
 
         photo_urls = DryCleaningRequestPhoto.objects.filter(
             request=dry_cleaning_request,
+            url__isnull=False,
         ).values_list("url", flat=True)
         services = DryCleaningRequestService.objects.filter(
             request=dry_cleaning_request,
         ).select_related("service")
 
-        bot = get_telegram_bot()
-
         lines: list[str] = [
             "❌ Ваш запрос на химчистку отклонен",
             f"Гос.номер: {dry_cleaning_request.car_number}",
@@ -64,9 +67,16 @@ class DryCleaningRequestRejectInteractor:
 
         caption = "\n".join(lines)
 
-        try_send_photos_media_group(
-            bot=bot,
+        notification = enqueue_photos_media_group(
+            bot=NotificationOutbox.Bot.MAIN,
             file_ids=photo_urls,
             caption=caption,
             chat_id=dry_cleaning_request.shift.staff_id,
         )
+        # Photos are still pending or failed to upload.
+        if notification is None:
+            enqueue_message(
+                bot=NotificationOutbox.Bot.MAIN,
+                text=caption,
+                chat_id=dry_cleaning_request.shift.staff_id,
+            )
@@ -51,7 +51,10 @@ class DryCleaningRequestRetrieveByIdInteractor:
         services = DryCleaningRequestService.objects.filter(
             request=dry_cleaning_request
         ).select_related("service")
-        photos = DryCleaningRequestPhoto.objects.filter(request=dry_cleaning_request)
+        photos = DryCleaningRequestPhoto.objects.filter(
+            request=dry_cleaning_request,
+            url__isnull=False,
+        )
         return DryCleaningRequestRetrieveResponseDto(
             id=dry_cleaning_request.id,
             shift_id=dry_cleaning_request.shift_id,
@@ -0,0 +1,24 @@
+import pytest
+
+from car_washes.tests.factories import CarWashServiceFactory
+from dry_cleaning.models import DryCleaningAdmin
+from dry_cleaning.services.dry_cleaning_requests import (
+    DryCleaningRequestCreateInteractor,
+)
+from shifts.tests.factories import ShiftFactory
+
+
+@pytest.fixture
+def create_dry_cleaning_request():
+    DryCleaningAdmin.objects.create(id=1, name="admin")
+    service = CarWashServiceFactory(is_dry_cleaning=True)
+
+    def create(photo_file_ids: list[str]):
+        return DryCleaningRequestCreateInteractor(
+            shift_id=ShiftFactory().id,
+            car_number="A123BC777",
+            photo_file_ids=photo_file_ids,
+            services=[{"id": service.id, "count": 1}],
+        ).execute()
+
+    return create
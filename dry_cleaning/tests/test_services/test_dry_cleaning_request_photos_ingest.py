@@ -0,0 +1,225 @@
+import logging
+
+import pytest
+from django.utils import timezone
+
+from dry_cleaning.models import DryCleaningRequestPhoto
+from dry_cleaning.services.dry_cleaning_requests import (
+    DryCleaningRequestPhotosIngestInteractor,
+    DryCleaningRequestPhotosIngestResult,
+)
+from dry_cleaning.services.dry_cleaning_requests import ingest_photos
+from dry_cleaning.services.dry_cleaning_requests.ingest_photos import (
+    TelegramPhotoUploadResult,
+    try_upload_telegram_photo,
+)
+from telegram.models import NotificationOutbox
+
+
+BROKEN_FILE_ID = "broken"
+
+
+@pytest.fixture
+def fake_upload(monkeypatch):
+    def try_upload_telegram_photo(*, bot, client, file_id):
+        if file_id == BROKEN_FILE_ID:
+            return TelegramPhotoUploadResult(error="file is too big")
+        return TelegramPhotoUploadResult(
+            url=f"https://s3.example.com/dry_cleaning/{file_id}.jpg",
+        )
+
+    monkeypatch.setattr(
+        ingest_photos,
+        "try_upload_telegram_photo",
+        try_upload_telegram_photo,
+    )
+
+
+@pytest.mark.django_db
+def test_create_stores_pending_photos(create_dry_cleaning_request):
+    response = create_dry_cleaning_request(["photo-1", "photo-2"])
+
+    assert response.photo_urls == []
+    assert list(
+        DryCleaningRequestPhoto.objects
+        .order_by("id")
+        .values_list("telegram_file_id", "url")
+    ) == [("photo-1", None), ("photo-2", None)]
+    assert not NotificationOutbox.objects.exists()
+
+
+@pytest.mark.django_db
+def test_create_without_photos_notifies_admins(create_dry_cleaning_request):
+    create_dry_cleaning_request([])
+
+    assert NotificationOutbox.objects.get().kind == (
+        NotificationOutbox.Kind.MESSAGE
+    )
+
+
+@pytest.mark.django_db
+def test_ingest_uploads_photos_and_notifies_admins(
+        fake_upload,
+        create_dry_cleaning_request,
+):
+    response = create_dry_cleaning_request(["photo-1", "photo-2"])
+
+    result = DryCleaningRequestPhotosIngestInteractor().execute()
+
+    assert result == DryCleaningRequestPhotosIngestResult(
+        uploaded_photos_count=2,
+        failed_photos_count=0,
+        ready_requests_count=1,
+    )
+    assert list(
+        DryCleaningRequestPhoto.objects
+        .filter(request_id=response.id)
+        .order_by("id")
+        .values_list("url", flat=True)
+    ) == [
+        "https://s3.example.com/dry_cleaning/photo-1.jpg",
+        "https://s3.example.com/dry_cleaning/photo-2.jpg",
+    ]
+    media_group = NotificationOutbox.objects.get(
+        kind=NotificationOutbox.Kind.PHOTOS_MEDIA_GROUP,
+    )
+    assert media_group.chat_id == 1
+    assert len(media_group.payload["file_ids"]) == 2
+    assert NotificationOutbox.objects.count() == 2
+
+    # Nothing left to ingest.
+    assert DryCleaningRequestPhotosIngestInteractor().execute() == (
+        DryCleaningRequestPhotosIngestResult(
+            uploaded_photos_count=0,
+            failed_photos_count=0,
+            ready_requests_count=0,
+        )
+    )
+
+
+@pytest.mark.django_db
+def test_ingest_gives_up_broken_photo(
+        fake_upload,
+        create_dry_cleaning_request,
+):
+    create_dry_cleaning_request(["photo-1", BROKEN_FILE_ID])
+    interactor = DryCleaningRequestPhotosIngestInteractor(max_attempts=2)
+
+    result = interactor.execute()
+
+    assert result.uploaded_photos_count == 1
+    assert result.failed_photos_count == 1
+    assert result.ready_requests_count == 0
+    assert not NotificationOutbox.objects.exists()
+    assert DryCleaningRequestPhoto.objects.get(
+        telegram_file_id=BROKEN_FILE_ID,
+    ).last_error == "file is too big"
+
+    # Broken photo is retried only after its backoff delay.
+    assert interactor.execute() == DryCleaningRequestPhotosIngestResult(
+        uploaded_photos_count=0,
+        failed_photos_count=0,
+        ready_requests_count=0,
+    )
+    DryCleaningRequestPhoto.objects.update(next_attempt_at=timezone.now())
+
+    result = interactor.execute()
+
+    assert result.failed_photos_count == 1
+    assert result.ready_requests_count == 1
+    media_group = NotificationOutbox.objects.get(
+        kind=NotificationOutbox.Kind.PHOTOS_MEDIA_GROUP,
+    )
+    assert media_group.payload["file_ids"] == [
+        "https://s3.example.com/dry_cleaning/photo-1.jpg",
+    ]
+
+
+@pytest.mark.django_db
+def test_leased_photos_are_not_claimed_again(
+        fake_upload,
+        create_dry_cleaning_request,
+):
+    create_dry_cleaning_request(["photo-1"])
+    interactor = DryCleaningRequestPhotosIngestInteractor()
+
+    claimed_photos = interactor.claim_batch()
+
+    assert [photo.telegram_file_id for photo in claimed_photos] == ["photo-1"]
+    assert interactor.claim_batch() == []
+
+    # Lease of crashed worker expires, and the photo is claimed again.
+    expired_lease_interactor = DryCleaningRequestPhotosIngestInteractor(
+        lease_seconds=0,
+    )
+    DryCleaningRequestPhoto.objects.update(next_attempt_at=timezone.now())
+    result = expired_lease_interactor.execute()
+
+    assert result.uploaded_photos_count == 1
+    assert result.ready_requests_count == 1
+    assert DryCleaningRequestPhoto.objects.get().upload_attempts_count == 2
+
+
+@pytest.mark.django_db
+def test_photo_uploaded_by_other_worker_is_not_saved_again(
+        fake_upload,
+        create_dry_cleaning_request,
+):
+    create_dry_cleaning_request(["photo-1"])
+    interactor = DryCleaningRequestPhotosIngestInteractor()
+    photos = interactor.claim_batch()
+    DryCleaningRequestPhoto.objects.update(
+        url="https://s3.example.com/dry_cleaning/other.jpg",
+    )
+
+    result = interactor.save_results(
+        photos,
+        [TelegramPhotoUploadResult(url="https://s3.example.com/photo-1.jpg")],
+    )
+
+    assert result == DryCleaningRequestPhotosIngestResult(
+        uploaded_photos_count=0,
+        failed_photos_count=0,
+        ready_requests_count=0,
+    )
+    assert not NotificationOutbox.objects.exists()
+
+
+def test_upload_error_is_logged(caplog):
+    class BrokenBot:
+        def get_file_url(self, file_id):
+            raise ValueError("file not found")
+
+    with caplog.at_level(logging.ERROR):
+        result = try_upload_telegram_photo(
+            bot=BrokenBot(),
+            client=None,
+            file_id="photo-1",
+        )
+
+    assert result == TelegramPhotoUploadResult(error="file not found")
+    assert "Could not upload Telegram photo photo-1" in caplog.text
+
+
+@pytest.mark.django_db
+def test_failed_photo_retry_is_backed_off(
+        fake_upload,
+        create_dry_cleaning_request,
+):
+    create_dry_cleaning_request([BROKEN_FILE_ID])
+    interactor = DryCleaningRequestPhotosIngestInteractor(
+        retry_delay_seconds=60,
+    )
+    next_attempt_delays = []
+
+    for _ in range(2):
+        started_at = timezone.now()
+        interactor.execute()
+        photo = DryCleaningRequestPhoto.objects.get()
+        next_attempt_delays.append(
+            (photo.next_attempt_at - started_at).total_seconds(),
+        )
+        DryCleaningRequestPhoto.objects.update(next_attempt_at=timezone.now())
+
+    assert 60 <= next_attempt_delays[0] < 70
+    assert 120 <= next_attempt_delays[1] < 130
@@ -0,0 +1,71 @@
+import pytest
+
+from dry_cleaning.models import DryCleaningRequestPhoto
+from dry_cleaning.services.dry_cleaning_requests import (
+    DryCleaningRequestApproveInteractor,
+    DryCleaningRequestRejectInteractor,
+)
+from telegram.models import NotificationOutbox
+
+
+@pytest.mark.django_db
+def test_approve_sends_uploaded_photos(create_dry_cleaning_request):
+    response = create_dry_cleaning_request(["photo-1"])
+    DryCleaningRequestPhoto.objects.filter(request_id=response.id).update(
+        url="https://s3.example.com/dry_cleaning/photo-1.jpg",
+    )
+
+    DryCleaningRequestApproveInteractor(
+        dry_cleaning_request_id=response.id,
+        services=[],
+        response_comment=None,
+    ).execute()
+
+    notification = NotificationOutbox.objects.get(
+        bot=NotificationOutbox.Bot.MAIN,
+        chat_id=response.staff_id,
+    )
+    assert notification.kind == NotificationOutbox.Kind.PHOTOS_MEDIA_GROUP
+    assert notification.payload["file_ids"] == [
+        "https://s3.example.com/dry_cleaning/photo-1.jpg",
+    ]
+
+
+@pytest.mark.django_db
+def test_approve_with_pending_photos_sends_message(
+        create_dry_cleaning_request,
+):
+    response = create_dry_cleaning_request(["photo-1"])
+
+    DryCleaningRequestApproveInteractor(
+        dry_cleaning_request_id=response.id,
+        services=[],
+        response_comment="ok",
+    ).execute()
+
+    notification = NotificationOutbox.objects.get(
+        bot=NotificationOutbox.Bot.MAIN,
+        chat_id=response.staff_id,
+    )
+    assert notification.kind == NotificationOutbox.Kind.MESSAGE
+    assert "одобрен" in notification.payload["text"]
+    assert "Комментарий: ok" in notification.payload["text"]
+
+
+@pytest.mark.django_db
+def test_reject_with_pending_photos_sends_message(
+        create_dry_cleaning_request,
+):
+    response = create_dry_cleaning_request(["photo-1"])
+
+    DryCleaningRequestRejectInteractor(
+        dry_cleaning_request_id=response.id,
+        response_comment=None,
+    ).execute()
+
+    notification = NotificationOutbox.objects.get(
+        bot=NotificationOutbox.Bot.MAIN,
+        chat_id=response.staff_id,
+    )
+    assert notification.kind == NotificationOutbox.Kind.MESSAGE
+    assert "отклонен" in notification.payload["text"]
@@ -8,7 +8,7 @@ from core.admin import SingleRowMixin
 from economics.models import (
     CarTransporterAndWasherServicePrices, CarTransporterPenalty,
     CarTransporterServicePrices, CarTransporterSurcharge, CarWashPenalty,
-    CarWashSurcharge, PenaltyPhoto,
+    CarWashSurcharge, PenaltyPhoto, ReportPeriodSnapshot,
 )
 
 
@@ -169,3 +169,26 @@ class CarTransporterAndWasherServicePricesAdmin(
 @admin.register(CarTransporterServicePrices)
 class CarTransporterServicePricesAdmin(SingleRowMixin, admin.ModelAdmin):
     pass
+
+
+@admin.register(ReportPeriodSnapshot)
+class ReportPeriodSnapshotAdmin(admin.ModelAdmin):
+    list_display = (
+        "year",
+        "month",
+        "report_period_number",
+        "from_date",
+        "to_date",
+        "is_stale",
+        "closed_at",
+    )
+    list_filter = ("is_stale",)
+    exclude = ("staff_list",)
+    readonly_fields = (
+        "year",
+        "month",
+        "report_period_number",
+        "from_date",
+        "to_date",
+        "closed_at",
+    )
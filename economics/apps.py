@@ -6,3 +6,14 @@ class EconomicsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "economics"
     verbose_name = _("economics")
+
+    def ready(self):
+        from core.settings_registry import settings_registry
+        from economics import signals  # noqa: F401
+        from economics.models import (
+            CarTransporterAndWasherServicePrices,
+            CarTransporterServicePrices,
+        )
+
+        settings_registry.register(CarTransporterAndWasherServicePrices)
+        settings_registry.register(CarTransporterServicePrices)
@@ -7,6 +7,7 @@ __all__ = (
     "InvalidPenaltyConsequenceError",
     "CarTransporterPenaltyNotFoundError",
     "CarTransporterSurchargeNotFoundError",
+    "ReportPeriodNotFinishedError",
 )
 
 
@@ -44,3 +45,16 @@ class CarTransporterSurchargeNotFoundError(APIException):
     status_code = status.HTTP_404_NOT_FOUND
     default_code = "car_transfer_surcharge_not_found"
     default_detail = _("Car transfer surcharge not found")
+
+
+class ReportPeriodNotFinishedError(APIException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_code = "report_period_not_finished"
+    default_detail = _("Report period is not finished yet")
+
+    def __init__(self, year: int, month: int, report_period_number: int):
+        self.extra = {
+            "year": year,
+            "month": month,
+            "report_period_number": report_period_number,
+        }
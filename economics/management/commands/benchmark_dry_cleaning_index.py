@@ -0,0 +1,140 @@
+import time
+from collections.abc import Callable
+
+from django.core.management import BaseCommand
+
+from economics.services.reports.staff_shifts_statistics import (
+    CarDryCleaningItems,
+    ShiftDryCleaningIndex,
+)
+from shifts.models import TransferredCar
+
+
+DEFAULT_SHIFTS_COUNTS = (100, 500, 1000, 2500, 5000)
+
+
+def build_dataset(
+        *,
+        shifts_count: int,
+        cars_per_shift: int,
+) -> tuple[dict[int, list[TransferredCar]], list[CarDryCleaningItems]]:
+    shift_id_to_cars: dict[int, list[TransferredCar]] = {}
+    cars_dry_cleaning_items: list[CarDryCleaningItems] = []
+    car_id = 0
+    for shift_id in range(1, shifts_count + 1):
+        cars: list[TransferredCar] = []
+        for car_index in range(cars_per_shift):
+            car_id += 1
+            cars.append(
+                TransferredCar(
+                    id=car_id,
+                    shift_id=shift_id,
+                    item_dry_cleaning_price=50,
+                )
+            )
+            if car_index % 2 == 0:
+                cars_dry_cleaning_items.append(
+                    CarDryCleaningItems(car_id=car_id, count=2),
+                )
+        shift_id_to_cars[shift_id] = cars
+    return shift_id_to_cars, cars_dry_cleaning_items
+
+
+def lookup_per_shift_rebuild(
+        shift_id_to_cars: dict[int, list[TransferredCar]],
+        cars_dry_cleaning_items: list[CarDryCleaningItems],
+) -> int:
+    """Previous behaviour: every shift rebuilds the whole period mapping."""
+    total = 0
+    for cars in shift_id_to_cars.values():
+        car_id_to_count = {
+            car_dry_cleaning_items.car_id: car_dry_cleaning_items.count
+            for car_dry_cleaning_items in cars_dry_cleaning_items
+        }
+        for car in cars:
+            total += car_id_to_count.get(car.id, 0)
+    return total
+
+
+def lookup_shift_index(
+        shift_id_to_cars: dict[int, list[TransferredCar]],
+        cars_dry_cleaning_items: list[CarDryCleaningItems],
+) -> int:
+    index = ShiftDryCleaningIndex(
+        shift_id_to_cars=shift_id_to_cars,
+        cars_dry_cleaning_items=cars_dry_cleaning_items,
+    )
+    return sum(index.get_items_count(shift_id) for shift_id in shift_id_to_cars)
+
+
+def measure(
+        function: Callable[..., int],
+        *args,
+        repeat: int,
+) -> tuple[float, int]:
+    best = float("inf")
+    result = 0
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - started_at)
+    return best, result
+
+
+class Command(BaseCommand):
+    help = "Benchmark dry cleaning items lookup of staff shifts statistics"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--shifts-counts",
+            type=int,
+            nargs="+",
+            default=DEFAULT_SHIFTS_COUNTS,
+            help="Shifts counts to benchmark",
+        )
+        parser.add_argument(
+            "--cars-per-shift",
+            type=int,
+            default=10,
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+        )
+
+    def handle(self, *args, **options):
+        cars_per_shift: int = options["cars_per_shift"]
+        repeat: int = options["repeat"]
+
+        self.stdout.write(
+            f"{'shifts':>8} {'rebuild, ms':>14} {'index, ms':>12} {'speedup':>9}"
+        )
+        for shifts_count in options["shifts_counts"]:
+            dataset = build_dataset(
+                shifts_count=shifts_count,
+                cars_per_shift=cars_per_shift,
+            )
+            rebuild_seconds, rebuild_result = measure(
+                lookup_per_shift_rebuild,
+                *dataset,
+                repeat=repeat,
+            )
+            index_seconds, index_result = measure(
+                lookup_shift_index,
+                *dataset,
+                repeat=repeat,
+            )
+            if rebuild_result != index_result:
+                self.stdout.write(
+                    self.style.ERROR(
+                        f"Results differ for {shifts_count} shifts: "
+                        f"{rebuild_result} != {index_result}"
+                    )
+                )
+                continue
+            self.stdout.write(
+                f"{shifts_count:>8} {rebuild_seconds * 1000:>14.2f}"
+                f" {index_seconds * 1000:>12.2f}"
+                f" {rebuild_seconds / index_seconds:>8.1f}x"
+            )
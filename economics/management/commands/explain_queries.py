@@ -0,0 +1,81 @@
+from django.core.management import BaseCommand, CommandError
+
+from economics.services.query_plans import (
+    QueryPlanAdvisor,
+    get_query_plan_cases,
+    get_representative_params,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Explain queries of selectors with EXPLAIN (ANALYZE, BUFFERS) and"
+        " report sequential scans of large tables and spills to disk"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--cases",
+            nargs="+",
+            default=None,
+            help="Names of cases to run, all by default",
+        )
+        parser.add_argument(
+            "--large-table-rows",
+            type=int,
+            default=10_000,
+            help="Rows read by Seq Scan to flag it",
+        )
+        parser.add_argument(
+            "--period-days",
+            type=int,
+            default=30,
+        )
+        parser.add_argument(
+            "--show-sql",
+            action="store_true",
+        )
+        parser.add_argument(
+            "--fail-on-issues",
+            action="store_true",
+            help="Exit with error if any query has issues",
+        )
+
+    def handle(self, *args, **options):
+        params = get_representative_params(
+            period_days=options["period_days"],
+        )
+        cases = get_query_plan_cases(params)
+        if options["cases"] is not None:
+            cases = [case for case in cases if case.name in options["cases"]]
+
+        reports = QueryPlanAdvisor(
+            large_table_rows=options["large_table_rows"],
+        ).execute(cases)
+
+        self.stdout.write(
+            f"{'rank':>4} {'time, ms':>10} {'hit':>8} {'read':>8}"
+            f" {'temp':>6} case"
+        )
+        for rank, report in enumerate(reports, start=1):
+            self.stdout.write(
+                f"{rank:>4} {report.execution_time_ms:>10.2f}"
+                f" {report.shared_hit_blocks:>8}"
+                f" {report.shared_read_blocks:>8}"
+                f" {report.temp_written_blocks:>6} {report.case_name}"
+            )
+            for issue in report.issues:
+                self.stdout.write(
+                    self.style.WARNING(f"{'':>5}{issue.kind}: {issue.detail}")
+                )
+            if options["show_sql"]:
+                self.stdout.write(f"{'':>5}{report.sql}")
+
+        issues_count = sum(len(report.issues) for report in reports)
+        if options["fail_on_issues"] and issues_count:
+            raise CommandError(f"Queries have {issues_count} issues")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Queries explained: {len(reports)}, issues: {issues_count}"
+            )
+        )
@@ -0,0 +1,42 @@
+import datetime
+
+from django.core.management import BaseCommand
+
+from economics.services.shift_statistics_rollups import (
+    rebuild_shift_statistics_rollups,
+)
+
+
+class Command(BaseCommand):
+    help = "Backfill or repair shift statistics rollups"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--from-date",
+            type=datetime.date.fromisoformat,
+            default=None,
+            help="Rebuild rollups of shifts starting from date (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--to-date",
+            type=datetime.date.fromisoformat,
+            default=None,
+            help="Rebuild rollups of shifts until date (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+        )
+
+    def handle(self, *args, **options):
+        refreshed_count = rebuild_shift_statistics_rollups(
+            from_date=options["from_date"],
+            to_date=options["to_date"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Shift statistics rollups rebuilt: {refreshed_count}"
+            )
+        )
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('economics', '0010_alter_cartransporterpenalty_amount_and_more'),
+        ('shifts', '0019_shiftfinishphoto_url'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShiftStatisticsRollup',
+            fields=[
+                ('shift', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='statistics_rollup', serialize=False, to='shifts.shift', verbose_name='Shift')),
+                ('planned_comfort_cars_count', models.PositiveIntegerField(default=0, verbose_name='Planned comfort cars count')),
+                ('planned_business_cars_count', models.PositiveIntegerField(default=0, verbose_name='Planned business cars count')),
+                ('planned_vans_count', models.PositiveIntegerField(default=0, verbose_name='Planned vans count')),
+                ('urgent_cars_count', models.PositiveIntegerField(default=0, verbose_name='Urgent cars count')),
+                ('transfer_price_sum', models.PositiveIntegerField(default=0, verbose_name='Transfer price sum')),
+                ('dry_cleaning_items_count', models.PositiveIntegerField(default=0, verbose_name='Dry cleaning items count')),
+                ('dry_cleaning_cost', models.PositiveIntegerField(default=0, verbose_name='Dry cleaning cost')),
+                ('is_extra_shift', models.BooleanField(default=False, verbose_name='Is extra shift')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated at')),
+            ],
+            options={
+                'verbose_name': 'Shift statistics rollup',
+                'verbose_name_plural': 'Shift statistics rollups',
+            },
+        ),
+    ]
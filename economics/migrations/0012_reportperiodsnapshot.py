@@ -0,0 +1,34 @@
+# Generated by Django 5.1.7 on 2026-10-18 13:47
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('economics', '0011_shiftstatisticsrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportPeriodSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='Year')),
+                ('month', models.PositiveSmallIntegerField(verbose_name='Month')),
+                ('report_period_number', models.PositiveSmallIntegerField(verbose_name='Report period number')),
+                ('from_date', models.DateField(verbose_name='From date')),
+                ('to_date', models.DateField(verbose_name='To date')),
+                ('staff_list', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='Staff shifts statistics')),
+                ('is_stale', models.BooleanField(default=False, verbose_name='Is stale')),
+                ('closed_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Closed at')),
+            ],
+            options={
+                'verbose_name': 'Report period snapshot',
+                'verbose_name_plural': 'Report period snapshots',
+                'constraints': [models.UniqueConstraint(fields=('year', 'month', 'report_period_number'), name='unique_report_period_snapshot')],
+            },
+        ),
+    ]
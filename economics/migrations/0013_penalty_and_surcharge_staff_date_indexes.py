@@ -0,0 +1,37 @@
+# Generated by Django 5.1.7 on 2026-10-18 14:26
+
+import django.db.models.deletion
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Indexes are built without locking writes to the tables. Foreign key
+    # indexes covered by the new composite ones are dropped afterwards.
+    atomic = False
+
+    dependencies = [
+        ('economics', '0012_reportperiodsnapshot'),
+        ('staff', '0004_staff_type_staffregisterrequest_staff_type'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='cartransporterpenalty',
+            index=models.Index(fields=['staff', 'date'], name='penalty_staff_date'),
+        ),
+        AddIndexConcurrently(
+            model_name='cartransportersurcharge',
+            index=models.Index(fields=['staff', 'date'], name='surcharge_staff_date'),
+        ),
+        migrations.AlterField(
+            model_name='cartransporterpenalty',
+            name='staff',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='penalties', to='staff.staff', verbose_name='Staff'),
+        ),
+        migrations.AlterField(
+            model_name='cartransportersurcharge',
+            name='staff',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='surcharges', to='staff.staff', verbose_name='Staff'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('economics', '0013_penalty_and_surcharge_staff_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='shiftstatisticsrollup',
+            name='refreshed_version',
+            field=models.PositiveBigIntegerField(default=0, help_text='Version the statistics were computed at. Rollup is stale if it differs from version', verbose_name='Refreshed version'),
+        ),
+        migrations.AddField(
+            model_name='shiftstatisticsrollup',
+            name='version',
+            field=models.PositiveBigIntegerField(default=1, help_text='Incremented on every change of shift cars', verbose_name='Version'),
+        ),
+    ]
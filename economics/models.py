@@ -1,3 +1,4 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
@@ -66,6 +67,8 @@ class CarTransporterPenalty(models.Model):
         to=Staff,
         on_delete=models.CASCADE,
         related_name="penalties",
+        # Covered by the (staff, date) index.
+        db_index=False,
         verbose_name=_("Staff"),
     )
     date = models.DateField(default=timezone.localdate, verbose_name=_("Date"))
@@ -83,6 +86,12 @@ class CarTransporterPenalty(models.Model):
     class Meta:
         verbose_name = _("Car transporter penalty")
         verbose_name_plural = _("Car transporter penalties")
+        indexes = (
+            models.Index(
+                fields=("staff", "date"),
+                name="penalty_staff_date",
+            ),
+        )
 
     def __str__(self):
         return self.reason
@@ -110,6 +119,8 @@ class CarTransporterSurcharge(models.Model):
         to=Staff,
         on_delete=models.CASCADE,
         related_name="surcharges",
+        # Covered by the (staff, date) index.
+        db_index=False,
         verbose_name=_("Staff"),
     )
     date = models.DateField(
@@ -126,6 +137,12 @@ class CarTransporterSurcharge(models.Model):
     class Meta:
         verbose_name = _("Car transporter surcharge")
         verbose_name_plural = _("Car transporter surcharges")
+        indexes = (
+            models.Index(
+                fields=("staff", "date"),
+                name="surcharge_staff_date",
+            ),
+        )
 
     def __str__(self):
         return self.reason
@@ -195,3 +212,116 @@ class CarTransporterServicePrices(SingleRowModelMixin, models.Model):
     class Meta:
         verbose_name = _("Car transporter service price")
         verbose_name_plural = _("Car transporter service prices")
+
+
+class ShiftStatisticsRollup(models.Model):
+    """Precomputed transferred cars statistics of a single shift.
+
+    Kept up to date on transferred cars and their additional services
+    changes, so reports don't have to aggregate raw cars on every call.
+    Stale rollups (refreshed_version behind version) are not served.
+    """
+
+    shift = models.OneToOneField(
+        to=Shift,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="statistics_rollup",
+        verbose_name=_("Shift"),
+    )
+    planned_comfort_cars_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Planned comfort cars count"),
+    )
+    planned_business_cars_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Planned business cars count"),
+    )
+    planned_vans_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Planned vans count"),
+    )
+    urgent_cars_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Urgent cars count"),
+    )
+    transfer_price_sum = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Transfer price sum"),
+    )
+    dry_cleaning_items_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Dry cleaning items count"),
+    )
+    dry_cleaning_cost = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Dry cleaning cost"),
+    )
+    is_extra_shift = models.BooleanField(
+        default=False,
+        verbose_name=_("Is extra shift"),
+    )
+    version = models.PositiveBigIntegerField(
+        default=1,
+        verbose_name=_("Version"),
+        help_text=_("Incremented on every change of shift cars"),
+    )
+    refreshed_version = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name=_("Refreshed version"),
+        help_text=_(
+            "Version the statistics were computed at."
+            " Rollup is stale if it differs from version",
+        ),
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_("Updated at"),
+    )
+
+    class Meta:
+        verbose_name = _("Shift statistics rollup")
+        verbose_name_plural = _("Shift statistics rollups")
+
+    def __str__(self):
+        return str(self.shift_id)
+
+
+class ReportPeriodSnapshot(models.Model):
+    """Frozen staff shifts statistics of a closed report period.
+
+    Stale snapshots are not served and have to be closed again.
+    """
+
+    year = models.PositiveSmallIntegerField(verbose_name=_("Year"))
+    month = models.PositiveSmallIntegerField(verbose_name=_("Month"))
+    report_period_number = models.PositiveSmallIntegerField(
+        verbose_name=_("Report period number"),
+    )
+    from_date = models.DateField(verbose_name=_("From date"))
+    to_date = models.DateField(verbose_name=_("To date"))
+    staff_list = models.JSONField(
+        encoder=DjangoJSONEncoder,
+        verbose_name=_("Staff shifts statistics"),
+    )
+    is_stale = models.BooleanField(
+        default=False,
+        verbose_name=_("Is stale"),
+    )
+    closed_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name=_("Closed at"),
+    )
+
+    class Meta:
+        verbose_name = _("Report period snapshot")
+        verbose_name_plural = _("Report period snapshots")
+        constraints = (
+            models.UniqueConstraint(
+                fields=("year", "month", "report_period_number"),
+                name="unique_report_period_snapshot",
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.from_date} - {self.to_date}"
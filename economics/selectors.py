@@ -3,44 +3,49 @@ from collections import defaultdict
 from collections.abc import Iterable
 from dataclasses import dataclass
 
-from django.db.models import Sum
+from django.db.models import Count, F, OuterRef, Q, QuerySet, Subquery, Sum
+from django.db.models.functions import Coalesce
 
 from economics.models import (
     CarTransporterPenalty, CarTransporterSurcharge, CarWashPenalty,
     CarWashSurcharge,
 )
+from shifts.models import CarToWash, CarToWashAdditionalService, Shift
 
 
 __all__ = (
+    "annotate_shifts_cars_aggregates",
+    "SHIFT_CARS_AGGREGATE_FIELDS",
     "compute_staff_penalties_count",
     "StaffPenaltiesOrSurchargesForSpecificShift",
     "PenaltyOrSurchargeAmountAndShiftDate",
     "get_car_transporters_penalties_for_period",
     "get_car_transporters_surcharges_for_period",
-    "get_car_wash_penalties_and_surcharges_for_period",
-    "CarWashPenaltiesAndSurchargesByDate",
+    "get_car_wash_penalties_and_surcharges_by_car_wash_for_period",
+    "CarWashPenaltiesAndSurchargesByCarWashAndDate",
 )
 
 
 @dataclass(frozen=True, slots=True, kw_only=True)
-class CarWashPenaltiesAndSurchargesByDate:
+class CarWashPenaltiesAndSurchargesByCarWashAndDate:
+    car_wash_id: int
     date: datetime.date
     penalties_amount: int
     surcharges_amount: int
 
 
-def get_car_wash_penalties_and_surcharges_for_period(
+def get_car_wash_penalties_and_surcharges_by_car_wash_for_period(
         *,
         car_wash_ids: Iterable[int],
         from_date: datetime.date,
         to_date: datetime.date,
-) -> list[CarWashPenaltiesAndSurchargesByDate]:
+) -> list[CarWashPenaltiesAndSurchargesByCarWashAndDate]:
     penalties = (
         CarWashPenalty.objects.filter(
             date__range=(from_date, to_date),
             car_wash_id__in=car_wash_ids,
         )
-        .values("date")
+        .values("car_wash_id", "date")
         .annotate(total_amount=Sum("amount"))
     )
     surcharges = (
@@ -48,33 +53,36 @@ def get_car_wash_penalties_and_surcharges_for_period(
             date__range=(from_date, to_date),
             car_wash_id__in=car_wash_ids,
         )
-        .values("date")
+        .values("car_wash_id", "date")
         .annotate(total_amount=Sum("amount"))
     )
 
-    surcharge_date_to_amount = {
-        surcharge["date"]: surcharge["total_amount"] for surcharge in
-        surcharges
+    surcharge_key_to_amount = {
+        (surcharge["car_wash_id"], surcharge["date"]):
+            surcharge["total_amount"]
+        for surcharge in surcharges
     }
-    penalty_date_to_amount = {
-        penalty["date"]: penalty["total_amount"] for penalty in penalties
+    penalty_key_to_amount = {
+        (penalty["car_wash_id"], penalty["date"]): penalty["total_amount"]
+        for penalty in penalties
     }
-    dates = set(surcharge_date_to_amount).union(penalty_date_to_amount)
-
-    result: list[CarWashPenaltiesAndSurchargesByDate] = []
-    for date in dates:
-        penalties_amount = penalty_date_to_amount.get(date, 0)
-        surcharges_amount = surcharge_date_to_amount.get(date, 0)
-
-        result.append(
-            CarWashPenaltiesAndSurchargesByDate(
-                date=date,
-                penalties_amount=penalties_amount,
-                surcharges_amount=surcharges_amount,
-            )
-        )
+    keys = set(surcharge_key_to_amount).union(penalty_key_to_amount)
 
-    return result
+    return [
+        CarWashPenaltiesAndSurchargesByCarWashAndDate(
+            car_wash_id=car_wash_id,
+            date=date,
+            penalties_amount=penalty_key_to_amount.get(
+                (car_wash_id, date),
+                0,
+            ),
+            surcharges_amount=surcharge_key_to_amount.get(
+                (car_wash_id, date),
+                0,
+            ),
+        )
+        for car_wash_id, date in keys
+    ]
 
 
 @dataclass(frozen=True, slots=True)
@@ -168,3 +176,76 @@ def get_car_transporters_surcharges_for_period(
         "staff_id", "date"
     ).annotate(total_amount=Sum("amount"))
     return group_by_staff_id(surcharges_grouped_by_staff_id_and_shift_date)
+
+
+SHIFT_CARS_AGGREGATE_FIELDS = (
+    "planned_comfort_cars_count",
+    "planned_business_cars_count",
+    "planned_vans_count",
+    "urgent_cars_count",
+    "transfer_price_sum",
+    "dry_cleaning_items_count",
+    "dry_cleaning_cost",
+)
+
+
+def annotate_shifts_cars_aggregates(
+        shifts: QuerySet[Shift],
+) -> QuerySet[Shift]:
+    """Annotate shifts with aggregates of their transferred cars.
+
+    Cars are counted with conditional aggregates grouped by shift, dry
+    cleaning items are aggregated in correlated subqueries to avoid
+    multiplying cars rows by additional services rows.
+
+    Args:
+        shifts: shifts queryset.
+
+    Returns:
+        Shifts queryset annotated with SHIFT_CARS_AGGREGATE_FIELDS.
+    """
+    planned = Q(cartowash__wash_type=CarToWash.WashType.PLANNED)
+    shift_dry_cleaning_services = (
+        CarToWashAdditionalService.objects
+        .filter(car__shift_id=OuterRef("pk"), service__is_dry_cleaning=True)
+        .values("car__shift_id")
+    )
+    return shifts.annotate(
+        planned_comfort_cars_count=Count(
+            "cartowash",
+            filter=planned & Q(cartowash__car_class=CarToWash.CarType.COMFORT),
+        ),
+        planned_business_cars_count=Count(
+            "cartowash",
+            filter=planned & Q(
+                cartowash__car_class=CarToWash.CarType.BUSINESS,
+            ),
+        ),
+        planned_vans_count=Count(
+            "cartowash",
+            filter=planned & Q(cartowash__car_class=CarToWash.CarType.VAN),
+        ),
+        urgent_cars_count=Count(
+            "cartowash",
+            filter=Q(cartowash__wash_type=CarToWash.WashType.URGENT),
+        ),
+        transfer_price_sum=Coalesce(Sum("cartowash__transfer_price"), 0),
+        dry_cleaning_items_count=Coalesce(
+            Subquery(
+                shift_dry_cleaning_services
+                .annotate(items_count=Sum("count"))
+                .values("items_count")
+            ),
+            0,
+        ),
+        dry_cleaning_cost=Coalesce(
+            Subquery(
+                shift_dry_cleaning_services
+                .annotate(
+                    cost=Sum(F("count") * F("car__item_dry_cleaning_price")),
+                )
+                .values("cost")
+            ),
+            0,
+        ),
+    )
@@ -17,7 +17,9 @@ from .reports import (
     CarWashesRevenueReportInputSerializer,
     CarWashesRevenueReportOutputSerializer,
     CarWashRevenueForShiftAdditionalServiceSerializer,
-    CarWashRevenueForShiftSerializer, ShiftStatisticsSerializer,
+    CarWashRevenueBreakdownSerializer,
+    CarWashRevenueForShiftSerializer, ReportPeriodCloseInputSerializer,
+    ReportPeriodCloseOutputSerializer, ShiftStatisticsSerializer,
     StaffItemSerializer, StaffShiftsStatisticsReportInputSerializer,
     StaffShiftsStatisticsReportOutputSerializer,
     StaffShiftsStatisticsSerializer,
@@ -35,10 +37,13 @@ __all__ = (
     "StaffShiftsStatisticsSerializer",
     "StaffShiftsStatisticsReportInputSerializer",
     "StaffShiftsStatisticsReportOutputSerializer",
+    "ReportPeriodCloseInputSerializer",
+    "ReportPeriodCloseOutputSerializer",
     "CarWashesRevenueReportInputSerializer",
     "CarWashesRevenueReportOutputSerializer",
     "CarWashRevenueForShiftSerializer",
     "CarWashRevenueForShiftAdditionalServiceSerializer",
+    "CarWashRevenueBreakdownSerializer",
     "CarTransporterSurchargeCreateInputSerializer",
     "CarTransporterSurchargeCreateOutputSerializer",
     "SurchargeListOutputSerializer",
@@ -48,6 +48,7 @@ class PenaltyListInputSerializer(serializers.Serializer):
     )
     limit = serializers.IntegerField(min_value=1, max_value=1000, default=10)
     offset = serializers.IntegerField(min_value=0, default=0)
+    cursor = serializers.CharField(default=None, allow_null=True)
 
 
 class PenaltyListItemSerializer(serializers.Serializer):
@@ -68,3 +69,4 @@ class PenaltyListItemSerializer(serializers.Serializer):
 class PenaltyListOutputSerializer(serializers.Serializer):
     penalties = PenaltyListItemSerializer(many=True)
     is_end_of_list_reached = serializers.BooleanField()
+    next_cursor = serializers.CharField(allow_null=True)
@@ -10,10 +10,13 @@ __all__ = (
     "StaffShiftsStatisticsSerializer",
     "StaffShiftsStatisticsReportInputSerializer",
     "StaffShiftsStatisticsReportOutputSerializer",
+    "ReportPeriodCloseInputSerializer",
+    "ReportPeriodCloseOutputSerializer",
     "CarWashesRevenueReportInputSerializer",
     "CarWashesRevenueReportOutputSerializer",
     "CarWashRevenueForShiftSerializer",
     "CarWashRevenueForShiftAdditionalServiceSerializer",
+    "CarWashRevenueBreakdownSerializer",
 )
 
 from shifts.serializers import ReportPeriodSerializer
@@ -26,6 +29,7 @@ class CarWashesRevenueReportInputSerializer(serializers.Serializer):
         child=serializers.IntegerField(),
         allow_empty=False,
     )
+    is_breakdown = serializers.BooleanField(default=False)
 
     def validate(self, data: dict) -> dict:
         from_date: datetime.date = data["from_date"]
@@ -69,10 +73,21 @@ class CarWashRevenueForShiftSerializer(serializers.Serializer):
     surcharges_amount = serializers.IntegerField()
 
 
+class CarWashRevenueBreakdownSerializer(serializers.Serializer):
+    car_wash_id = serializers.IntegerField()
+    car_washes_revenue = serializers.ListField(
+        child=CarWashRevenueForShiftSerializer(),
+    )
+
+
 class CarWashesRevenueReportOutputSerializer(serializers.Serializer):
     car_washes_revenue = serializers.ListField(
         child=CarWashRevenueForShiftSerializer(),
     )
+    car_washes = serializers.ListField(
+        child=CarWashRevenueBreakdownSerializer(),
+        required=False,
+    )
 
 
 class StaffItemSerializer(serializers.Serializer):
@@ -140,3 +155,15 @@ class StaffShiftsStatisticsReportOutputSerializer(serializers.Serializer):
         child=StaffShiftsStatisticsSerializer(),
     )
     report_period = ReportPeriodSerializer()
+
+
+class ReportPeriodCloseInputSerializer(serializers.Serializer):
+    year = serializers.IntegerField(min_value=2000, max_value=3000)
+    month = serializers.IntegerField(min_value=1, max_value=12)
+    report_period_number = serializers.IntegerField(min_value=1, max_value=2)
+
+
+class ReportPeriodCloseOutputSerializer(serializers.Serializer):
+    report_period = ReportPeriodSerializer()
+    staff_count = serializers.IntegerField()
+    closed_at = serializers.DateTimeField()
@@ -0,0 +1,367 @@
+import datetime
+import json
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.exceptions import APIException
+
+from car_washes.models import CarWash
+from economics.selectors import (
+    get_car_transporters_penalties_for_period,
+    get_car_transporters_surcharges_for_period,
+)
+from economics.services.reports.staff_shifts_statistics import (
+    get_cars_to_wash_statistics,
+    get_cars_to_wash_statistics_from_rollups,
+)
+from economics.use_cases import CarTransporterPenaltyListUseCase
+from shifts.models import Shift
+from shifts.selectors import (
+    get_additional_services_daily_totals_for_period,
+    get_cars_to_wash_daily_totals_for_period,
+    get_shifts_page,
+    get_staff_current_shift,
+    get_staff_ids_with_active_shift,
+)
+from shifts.services.cars_to_wash import get_staff_cars_count_by_date
+from shifts.services.shifts.dead_souls import (
+    get_staff_with_no_shifts,
+    get_staff_with_one_test_shift,
+)
+from staff.selectors import get_all_staff
+
+
+__all__ = (
+    "QueryPlanCase",
+    "QueryPlanIssue",
+    "QueryPlanReport",
+    "RepresentativeParams",
+    "get_representative_params",
+    "get_query_plan_cases",
+    "QueryPlanAdvisor",
+)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class QueryPlanCase:
+    name: str
+    run: Callable[[], object]
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class QueryPlanIssue:
+    kind: str
+    detail: str
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class QueryPlanReport:
+    case_name: str
+    sql: str
+    execution_time_ms: float
+    shared_hit_blocks: int
+    shared_read_blocks: int
+    temp_written_blocks: int
+    issues: list[QueryPlanIssue]
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class RepresentativeParams:
+    date: datetime.date
+    from_date: datetime.date
+    to_date: datetime.date
+    car_wash_ids: list[int]
+    staff_ids: list[int]
+    active_shift_staff_id: int | None
+
+
+def get_representative_params(
+        period_days: int = 30,
+        staff_count: int = 10,
+) -> RepresentativeParams:
+    """
+    Pick parameter values resembling real requests from the database.
+
+    The period ends at the latest shift date, staff are the ones with
+    the most shifts, so the queries touch as much data as the heaviest
+    real requests do.
+    """
+    latest_shift = Shift.objects.order_by("-date").only("date").first()
+    date = timezone.localdate() if latest_shift is None else latest_shift.date
+    staff_ids = list(
+        Shift.objects.values("staff_id")
+        .annotate(shifts_count=Count("id"))
+        .order_by("-shifts_count")
+        .values_list("staff_id", flat=True)[:staff_count]
+    )
+    active_shift_staff_id = next(iter(get_staff_ids_with_active_shift()), None)
+    return RepresentativeParams(
+        date=date,
+        from_date=date - datetime.timedelta(days=period_days - 1),
+        to_date=date,
+        car_wash_ids=list(CarWash.objects.values_list("id", flat=True)),
+        staff_ids=staff_ids,
+        active_shift_staff_id=active_shift_staff_id,
+    )
+
+
+def get_shifts_page_by_cursor() -> object:
+    first_page = get_shifts_page(
+        from_date=None,
+        to_date=None,
+        staff_ids=None,
+        limit=50,
+        offset=0,
+        shift_types=(),
+    )
+    return get_shifts_page(
+        from_date=None,
+        to_date=None,
+        staff_ids=None,
+        limit=50,
+        offset=0,
+        shift_types=(),
+        cursor=first_page.next_cursor,
+    )
+
+
+def get_query_plan_cases(params: RepresentativeParams) -> list[QueryPlanCase]:
+    period = {"from_date": params.from_date, "to_date": params.to_date}
+    cases = [
+        QueryPlanCase(
+            name="get_cars_to_wash_daily_totals_for_period",
+            run=lambda: get_cars_to_wash_daily_totals_for_period(
+                car_wash_ids=params.car_wash_ids,
+                **period,
+            ),
+        ),
+        QueryPlanCase(
+            name="get_additional_services_daily_totals_for_period",
+            run=lambda: get_additional_services_daily_totals_for_period(
+                car_wash_ids=params.car_wash_ids,
+                **period,
+            ),
+        ),
+        QueryPlanCase(
+            name="get_cars_to_wash_statistics",
+            run=lambda: get_cars_to_wash_statistics(
+                staff_ids=params.staff_ids,
+                **period,
+            ),
+        ),
+        QueryPlanCase(
+            name="get_cars_to_wash_statistics_from_rollups",
+            run=lambda: get_cars_to_wash_statistics_from_rollups(
+                staff_ids=params.staff_ids,
+                **period,
+            ),
+        ),
+        QueryPlanCase(
+            name="get_car_transporters_penalties_for_period",
+            run=lambda: get_car_transporters_penalties_for_period(
+                staff_ids=params.staff_ids,
+                **period,
+            ),
+        ),
+        QueryPlanCase(
+            name="get_car_transporters_surcharges_for_period",
+            run=lambda: get_car_transporters_surcharges_for_period(
+                staff_ids=params.staff_ids,
+                **period,
+            ),
+        ),
+        QueryPlanCase(
+            name="get_staff_cars_count_by_date",
+            run=lambda: get_staff_cars_count_by_date(params.date),
+        ),
+        QueryPlanCase(
+            name="get_staff_with_no_shifts",
+            run=lambda: get_staff_with_no_shifts(
+                year=params.date.year,
+                month=params.date.month,
+            ),
+        ),
+        QueryPlanCase(
+            name="get_staff_with_one_test_shift",
+            run=lambda: get_staff_with_one_test_shift(
+                year=params.date.year,
+                month=params.date.month,
+            ),
+        ),
+        QueryPlanCase(
+            name="get_shifts_page",
+            run=lambda: get_shifts_page(
+                staff_ids=params.staff_ids,
+                limit=50,
+                offset=0,
+                shift_types=(),
+                **period,
+            ),
+        ),
+        QueryPlanCase(
+            name="get_shifts_page_by_cursor",
+            run=get_shifts_page_by_cursor,
+        ),
+        QueryPlanCase(
+            name="get_staff_ids_with_active_shift",
+            run=get_staff_ids_with_active_shift,
+        ),
+        QueryPlanCase(
+            name="get_all_staff",
+            run=lambda: get_all_staff(
+                order_by="full_name",
+                include_banned=False,
+                limit=100,
+                offset=0,
+            ),
+        ),
+        QueryPlanCase(
+            name="car_transporter_penalty_list",
+            run=lambda: CarTransporterPenaltyListUseCase(
+                limit=10,
+                offset=0,
+            ).execute(),
+        ),
+    ]
+    if params.active_shift_staff_id is not None:
+        cases.append(
+            QueryPlanCase(
+                name="get_staff_current_shift",
+                run=lambda: get_staff_current_shift(
+                    params.active_shift_staff_id,
+                ),
+            )
+        )
+    return cases
+
+
+def iter_plan_nodes(plan: dict) -> Iterator[dict]:
+    yield plan
+    for child_plan in plan.get("Plans", ()):
+        yield from iter_plan_nodes(child_plan)
+
+
+def find_plan_issues(
+        plan: dict,
+        *,
+        large_table_rows: int,
+) -> list[QueryPlanIssue]:
+    """
+    Find sequential scans of large tables and sorts or hashes spilled
+    to disk.
+
+    Table is considered large if the scan has read at least
+    `large_table_rows` rows, which works without fresh statistics.
+    """
+    issues: list[QueryPlanIssue] = []
+    for node in iter_plan_nodes(plan):
+        node_type = node["Node Type"]
+        loops = node.get("Actual Loops", 1)
+        if node_type == "Seq Scan":
+            scanned_rows = loops * (
+                node.get("Actual Rows", 0)
+                + node.get("Rows Removed by Filter", 0)
+            )
+            if scanned_rows >= large_table_rows:
+                issues.append(
+                    QueryPlanIssue(
+                        kind="seq_scan",
+                        detail=(
+                            f"Seq Scan on {node['Relation Name']}"
+                            f" read {scanned_rows} rows"
+                        ),
+                    )
+                )
+        if node.get("Sort Space Type") == "Disk":
+            issues.append(
+                QueryPlanIssue(
+                    kind="sort_spill",
+                    detail=(
+                        f"{node.get('Sort Method', 'sort')} spilled"
+                        f" {node.get('Sort Space Used', 0)} kB to disk"
+                    ),
+                )
+            )
+        if node.get("Hash Batches", 1) > 1:
+            issues.append(
+                QueryPlanIssue(
+                    kind="hash_spill",
+                    detail=f"Hash spilled in {node['Hash Batches']} batches",
+                )
+            )
+    return issues
+
+
+def is_read_query(sql: str) -> bool:
+    return sql.lstrip().upper().startswith(("SELECT", "WITH"))
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class QueryPlanAdvisor:
+    """
+    Replay queries of selectors with `EXPLAIN (ANALYZE, BUFFERS)`.
+
+    Each case is run with queries captured, then every read query it has
+    made is explained. Everything runs in a transaction which is rolled
+    back, so cases which write do not change the database.
+
+    Reports are ranked by issues count, then by execution time.
+    """
+
+    large_table_rows: int = 10_000
+
+    def explain(self, sql: str) -> dict:
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}")
+            explained = cursor.fetchone()[0]
+        if isinstance(explained, str):
+            explained = json.loads(explained)
+        return explained[0]
+
+    def build_report(self, case_name: str, sql: str) -> QueryPlanReport:
+        explained = self.explain(sql)
+        plan = explained["Plan"]
+        return QueryPlanReport(
+            case_name=case_name,
+            sql=sql,
+            execution_time_ms=explained["Execution Time"],
+            shared_hit_blocks=plan.get("Shared Hit Blocks", 0),
+            shared_read_blocks=plan.get("Shared Read Blocks", 0),
+            temp_written_blocks=plan.get("Temp Written Blocks", 0),
+            issues=find_plan_issues(
+                plan,
+                large_table_rows=self.large_table_rows,
+            ),
+        )
+
+    def analyze_case(self, case: QueryPlanCase) -> list[QueryPlanReport]:
+        with CaptureQueriesContext(connection) as context:
+            try:
+                case.run()
+            except (APIException, ValueError):
+                # Queries made before the domain error are still analyzed.
+                pass
+        return [
+            self.build_report(case.name, query["sql"])
+            for query in context.captured_queries
+            if is_read_query(query["sql"])
+        ]
+
+    def execute(self, cases: list[QueryPlanCase]) -> list[QueryPlanReport]:
+        reports: list[QueryPlanReport] = []
+        with transaction.atomic():
+            for case in cases:
+                reports += self.analyze_case(case)
+            transaction.set_rollback(True)
+        return sorted(
+            reports,
+            key=lambda report: (
+                len(report.issues),
+                report.execution_time_ms,
+            ),
+            reverse=True,
+        )
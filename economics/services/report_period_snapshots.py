@@ -0,0 +1,213 @@
+import dataclasses
+import datetime
+from collections.abc import Iterable
+
+from django.db.models import Max, Min
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from economics.models import ReportPeriodSnapshot
+from economics.services.reports.staff_shifts_statistics import (
+    DailyShiftStatistics,
+    StaffShiftsStatistics,
+    StaffShiftsStatisticsResponse,
+    TotalStatistics,
+)
+from shifts.models import Shift
+from shifts.services.report_periods import ReportPeriod
+from staff.selectors import StaffItem
+
+
+__all__ = (
+    "serialize_staff_shifts_statistics",
+    "deserialize_staff_shifts_statistics",
+    "get_report_period_snapshot_staff_list",
+    "get_report_periods_snapshots_staff_lists",
+    "save_report_period_snapshot",
+    "mark_report_period_snapshots_stale",
+    "mark_shifts_report_period_snapshots_stale",
+)
+
+
+def serialize_staff_shifts_statistics(
+        staff_list: Iterable[StaffShiftsStatistics],
+) -> list[dict]:
+    result: list[dict] = []
+    for staff in staff_list:
+        staff_dict = dataclasses.asdict(staff)
+        # JSON encoder truncates microseconds of datetimes.
+        staff_item = staff.staff
+        staff_dict["staff"]["created_at"] = staff_item.created_at.isoformat()
+        if staff_item.banned_at is not None:
+            staff_dict["staff"]["banned_at"] = (
+                staff_item.banned_at.isoformat()
+            )
+        result.append(staff_dict)
+    return result
+
+
+def deserialize_staff_shifts_statistics(
+        staff_list: Iterable[dict],
+) -> list[StaffShiftsStatistics]:
+    result: list[StaffShiftsStatistics] = []
+    for staff in staff_list:
+        staff_item = staff["staff"]
+        banned_at = staff_item["banned_at"]
+        if banned_at is not None:
+            banned_at = parse_datetime(banned_at)
+        shifts_statistics = [
+            DailyShiftStatistics(
+                **(
+                    shift_statistics
+                    | {"date": parse_date(shift_statistics["date"])}
+                ),
+            )
+            for shift_statistics in staff["shifts_statistics"]
+        ]
+        result.append(
+            StaffShiftsStatistics(
+                staff=StaffItem(
+                    **(
+                        staff_item
+                        | {
+                            "created_at": parse_datetime(
+                                staff_item["created_at"],
+                            ),
+                            "banned_at": banned_at,
+                        }
+                    ),
+                ),
+                shifts_statistics=shifts_statistics,
+                total_statistics=TotalStatistics(**staff["total_statistics"]),
+            )
+        )
+    return result
+
+
+def get_report_period_snapshot_staff_list(
+        report_period: ReportPeriod,
+) -> list[StaffShiftsStatistics] | None:
+    """Get staff shifts statistics of closed report period.
+
+    Args:
+        report_period: report period.
+
+    Returns:
+        Staff shifts statistics or None if period is not closed or its
+        snapshot is stale.
+    """
+    snapshot = (
+        ReportPeriodSnapshot.objects
+        .filter(
+            year=report_period.year,
+            month=report_period.month,
+            report_period_number=report_period.number,
+            is_stale=False,
+        )
+        .only("staff_list")
+        .first()
+    )
+    if snapshot is None:
+        return None
+    return deserialize_staff_shifts_statistics(snapshot.staff_list)
+
+
+def get_report_periods_snapshots_staff_lists(
+        *,
+        from_date: datetime.date,
+        to_date: datetime.date,
+) -> dict[tuple[int, int, int], list[StaffShiftsStatistics]]:
+    """Get staff shifts statistics of closed report periods within dates.
+
+    Keyword Args:
+        from_date: period start date.
+        to_date: period end date.
+
+    Returns:
+        Staff shifts statistics by year, month and report period number.
+        Report periods which are not closed or have stale snapshots are
+        missing.
+    """
+    snapshots = (
+        ReportPeriodSnapshot.objects
+        .filter(
+            from_date__gte=from_date,
+            to_date__lte=to_date,
+            is_stale=False,
+        )
+        .values("year", "month", "report_period_number", "staff_list")
+    )
+    return {
+        (
+            snapshot["year"],
+            snapshot["month"],
+            snapshot["report_period_number"],
+        ): deserialize_staff_shifts_statistics(snapshot["staff_list"])
+        for snapshot in snapshots
+    }
+
+
+def save_report_period_snapshot(
+        response: StaffShiftsStatisticsResponse,
+) -> ReportPeriodSnapshot:
+    report_period = response.report_period
+    snapshot, _ = ReportPeriodSnapshot.objects.update_or_create(
+        year=report_period.year,
+        month=report_period.month,
+        report_period_number=report_period.number,
+        defaults={
+            "from_date": report_period.from_date,
+            "to_date": report_period.to_date,
+            "staff_list": serialize_staff_shifts_statistics(
+                response.staff_list,
+            ),
+            "is_stale": False,
+            "closed_at": timezone.now(),
+        },
+    )
+    return snapshot
+
+
+def mark_report_period_snapshots_stale(
+        *,
+        from_date: datetime.date,
+        to_date: datetime.date | None = None,
+) -> int:
+    """Mark snapshots of closed report periods overlapping dates as stale.
+
+    Keyword Args:
+        from_date: changed period start date.
+        to_date: changed period end date. If None, all following report
+            periods are affected.
+
+    Returns:
+        Count of snapshots marked as stale.
+    """
+    snapshots = ReportPeriodSnapshot.objects.filter(
+        to_date__gte=from_date,
+        is_stale=False,
+    )
+    if to_date is not None:
+        snapshots = snapshots.filter(from_date__lte=to_date)
+    return snapshots.update(is_stale=True)
+
+
+def mark_shifts_report_period_snapshots_stale(shift_ids: Iterable[int]) -> int:
+    """Mark snapshots of report periods containing shifts as stale.
+
+    Args:
+        shift_ids: IDs of changed shifts.
+
+    Returns:
+        Count of snapshots marked as stale.
+    """
+    dates = Shift.objects.filter(id__in=shift_ids).aggregate(
+        from_date=Min("date"),
+        to_date=Max("date"),
+    )
+    if dates["from_date"] is None:
+        return 0
+    return mark_report_period_snapshots_stale(
+        from_date=dates["from_date"],
+        to_date=dates["to_date"],
+    )
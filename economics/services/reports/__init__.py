@@ -1,21 +1,27 @@
-from .car_washes_revenue import get_car_washes_sales_report
+from .car_washes_revenue import get_car_washes_sales_report_aggregated
 from .staff_shifts_statistics import (
     get_cars_dry_cleaning_items,
     group_by_shift_id,
     group_by_staff_id,
     group_shifts_statistics_by_staff,
     get_cars_to_wash_statistics,
+    get_cars_to_wash_statistics_aggregated,
+    get_cars_to_wash_statistics_from_rollups,
     map_shift_statistics_with_penalty_and_surcharge,
     merge_shifts_statistics_and_penalties_and_surcharges,
+    merge_staff_list_shifts_statistics_and_penalties_and_surcharges,
 )
 
 __all__ = (
-    "get_car_washes_sales_report",
+    "get_car_washes_sales_report_aggregated",
     "get_cars_dry_cleaning_items",
     "group_by_shift_id",
     "group_by_staff_id",
     "group_shifts_statistics_by_staff",
     "get_cars_to_wash_statistics",
+    "get_cars_to_wash_statistics_aggregated",
+    "get_cars_to_wash_statistics_from_rollups",
     "map_shift_statistics_with_penalty_and_surcharge",
     "merge_shifts_statistics_and_penalties_and_surcharges",
+    "merge_staff_list_shifts_statistics_and_penalties_and_surcharges",
 )
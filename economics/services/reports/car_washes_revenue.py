@@ -1,134 +1,122 @@
+import dataclasses
 import datetime
 from collections import defaultdict
 from collections.abc import Iterable
+from typing import Protocol, TypeVar
+from uuid import UUID
 
 from economics.selectors import (
-    CarWashPenaltiesAndSurchargesByDate,
-    get_car_wash_penalties_and_surcharges_for_period,
+    CarWashPenaltiesAndSurchargesByCarWashAndDate,
+    get_car_wash_penalties_and_surcharges_by_car_wash_for_period,
 )
-from shifts.models import CarToWash
 from shifts.selectors import (
-    CarToWashAdditionalServiceDTO,
-    CarToWashDTO,
-    get_cars_to_wash_for_period,
+    AdditionalServiceDailyTotals,
+    CarsToWashDailyTotals,
+    get_additional_services_daily_totals_for_period,
+    get_cars_to_wash_daily_totals_for_period,
 )
 
 
-__all__ = ("get_car_washes_sales_report",)
+__all__ = ("get_car_washes_sales_report_aggregated",)
 
 
-def compute_total_cost(car_to_wash: CarToWashDTO) -> int:
-    """
-    Calculate the total cost of washing a car.
-
-    This includes the washing price, windshield washer price,
-    and the total cost of all additional services.
+class HasCarWashId(Protocol):
+    car_wash_id: int
 
-    Args:
-        car_to_wash (CarToWashDTO): The car washing details.
-
-    Returns:
-        int: The total cost of washing the car.
-    """
-    additional_services_total_cost = sum(
-        service.total_price for service in car_to_wash.additional_services
-    )
-    return (
-        car_to_wash.washing_price
-        + car_to_wash.windshield_washer_price
-        + additional_services_total_cost
-    )
 
+HasCarWashIdT = TypeVar("HasCarWashIdT", bound=HasCarWashId)
 
-def merge_additional_services(
-    additional_services: Iterable[CarToWashAdditionalServiceDTO],
-) -> list[CarToWashAdditionalServiceDTO]:
-    service_id_to_service = {}
-
-    for service in additional_services:
-        if service.id not in service_id_to_service:
-            service_id_to_service[service.id] = service
-        else:
-            previous_service = service_id_to_service[service.id]
-            merged_service = CarToWashAdditionalServiceDTO(
-                id=service.id,
-                name=service.name,
-                count=previous_service.count + service.count,
-                total_price=previous_service.total_price + service.total_price,
-                car_to_wash_id=service.car_to_wash_id,
-            )
-            service_id_to_service[service.id] = merged_service
-
-    return list(service_id_to_service.values())
-
-
-def merge_cars_to_wash_to_statistics(
-    cars: Iterable[CarToWashDTO],
-) -> dict:
-    cars_statistics = {
-        "comfort_cars_washed_count": 0,
-        "business_cars_washed_count": 0,
-        "van_cars_washed_count": 0,
-        "windshield_washer_refilled_bottle_count": 0,
-        "total_cost": 0,
-        "additional_services": [],
-    }
-
-    car_class_counts: dict[CarToWash.CarType | str, str] = {
-        CarToWash.CarType.COMFORT: "comfort_cars_washed_count",
-        CarToWash.CarType.BUSINESS: "business_cars_washed_count",
-        CarToWash.CarType.VAN: "van_cars_washed_count",
-    }
 
-    for car in cars:
-        if car.car_class in car_class_counts:
-            cars_statistics[car_class_counts[car.car_class]] += 1
-        else:
-            raise ValueError(f"Unknown car class: {car.car_class}")
+def merge_daily_totals(
+    cars_to_wash_daily_totals: Iterable[CarsToWashDailyTotals],
+    additional_services_daily_totals: Iterable[AdditionalServiceDailyTotals],
+    penalties_and_surcharges: Iterable[
+        CarWashPenaltiesAndSurchargesByCarWashAndDate
+    ],
+) -> list[dict]:
+    """
+    Merge daily totals into per-date report items.
 
+    Totals of the same date, for example of different car washes,
+    are summed up. Additional services of a date are ordered by name.
+    """
+    shift_date_to_cars_statistics = defaultdict(
+        lambda: {
+            "comfort_cars_washed_count": 0,
+            "business_cars_washed_count": 0,
+            "van_cars_washed_count": 0,
+            "windshield_washer_refilled_bottle_count": 0,
+            "total_cost": 0,
+        }
+    )
+    for cars_totals in cars_to_wash_daily_totals:
+        cars_statistics = shift_date_to_cars_statistics[cars_totals.shift_date]
+        cars_statistics["comfort_cars_washed_count"] += (
+            cars_totals.comfort_cars_count
+        )
+        cars_statistics["business_cars_washed_count"] += (
+            cars_totals.business_cars_count
+        )
+        cars_statistics["van_cars_washed_count"] += cars_totals.vans_count
         cars_statistics["windshield_washer_refilled_bottle_count"] += (
-            car.windshield_washer_refilled_bottle_count
+            cars_totals.windshield_washer_refilled_bottle_count
         )
-        cars_statistics["additional_services"] = merge_additional_services(
-            cars_statistics["additional_services"] + car.additional_services
+        cars_statistics["total_cost"] += (
+            cars_totals.washing_price + cars_totals.windshield_washer_price
         )
-        cars_statistics["total_cost"] += compute_total_cost(car)
-
-    return cars_statistics
-
 
-def group_cars_to_wash_by_shift_date(
-    cars_to_wash: Iterable[CarToWashDTO],
-    penalties_and_surcharges: Iterable[CarWashPenaltiesAndSurchargesByDate],
-) -> list[dict]:
-    shift_date_to_cars = defaultdict(list)
-
-    for car in cars_to_wash:
-        shift_date_to_cars[car.shift_date].append(car)
+    shift_date_to_service_id_to_service: dict[
+        datetime.date, dict[UUID, AdditionalServiceDailyTotals]
+    ] = defaultdict(dict)
+    for additional_service in additional_services_daily_totals:
+        service_id_to_service = shift_date_to_service_id_to_service[
+            additional_service.shift_date
+        ]
+        previous_service = service_id_to_service.get(additional_service.id)
+        if previous_service is not None:
+            additional_service = dataclasses.replace(
+                additional_service,
+                count=previous_service.count + additional_service.count,
+                total_price=(
+                    previous_service.total_price
+                    + additional_service.total_price
+                ),
+            )
+        service_id_to_service[additional_service.id] = additional_service
 
-    shift_date_to_penalties_and_surcharges = {
-        penalty_and_surcharge.date: penalty_and_surcharge
-        for penalty_and_surcharge in penalties_and_surcharges
-    }
+    shift_date_to_penalties_amount = defaultdict(int)
+    shift_date_to_surcharges_amount = defaultdict(int)
+    for penalty_and_surcharge in penalties_and_surcharges:
+        shift_date_to_penalties_amount[penalty_and_surcharge.date] += (
+            penalty_and_surcharge.penalties_amount
+        )
+        shift_date_to_surcharges_amount[penalty_and_surcharge.date] += (
+            penalty_and_surcharge.surcharges_amount
+        )
 
-    all_dates = set(shift_date_to_cars).union(shift_date_to_penalties_and_surcharges)
+    all_dates = (
+        set(shift_date_to_cars_statistics)
+        .union(shift_date_to_service_id_to_service)
+        .union(shift_date_to_penalties_amount)
+    )
 
     result = []
 
-    for date in all_dates:
-        cars = shift_date_to_cars.get(date, [])
-        penalty_and_surcharge = shift_date_to_penalties_and_surcharges.get(date)
-
-        if penalty_and_surcharge is None:
-            penalties_amount = 0
-            surcharges_amount = 0
-        else:
-            penalties_amount = penalty_and_surcharge.penalties_amount
-            surcharges_amount = penalty_and_surcharge.surcharges_amount
+    for date in sorted(all_dates):
+        cars_statistics = shift_date_to_cars_statistics[date]
+        additional_services = sorted(
+            shift_date_to_service_id_to_service[date].values(),
+            key=lambda service: (service.name, str(service.id)),
+        )
+        penalties_amount = shift_date_to_penalties_amount[date]
+        surcharges_amount = shift_date_to_surcharges_amount[date]
 
-        cars_to_wash_to_statistics = merge_cars_to_wash_to_statistics(cars)
+        additional_services_total_cost = sum(
+            service.total_price for service in additional_services
+        )
         total_cost = (
-            cars_to_wash_to_statistics.get("total_cost", 0)
+            cars_statistics["total_cost"]
+            + additional_services_total_cost
             - penalties_amount
             + surcharges_amount
         )
@@ -136,8 +124,9 @@ def group_cars_to_wash_by_shift_date(
         result.append(
             {
                 "shift_date": date,
-                **cars_to_wash_to_statistics,
+                **cars_statistics,
                 "total_cost": total_cost,
+                "additional_services": additional_services,
                 "penalties_amount": penalties_amount,
                 "surcharges_amount": surcharges_amount,
             }
@@ -145,26 +134,104 @@ def group_cars_to_wash_by_shift_date(
     return result
 
 
-def get_car_washes_sales_report(
+def group_by_car_wash_id(
+    items: Iterable[HasCarWashIdT],
+) -> dict[int, list[HasCarWashIdT]]:
+    result: dict[int, list[HasCarWashIdT]] = defaultdict(list)
+    for item in items:
+        result[item.car_wash_id].append(item)
+    return dict(result)
+
+
+def get_car_washes_sales_report_aggregated(
     *,
     car_wash_ids: Iterable[int],
     from_date: datetime.date,
     to_date: datetime.date,
-):
-    cars_to_wash = get_cars_to_wash_for_period(
+    is_breakdown: bool = False,
+) -> dict:
+    """
+    Get daily sales of car washes for period.
+
+    Cars and additional services are counted and summed by grouped
+    queries. A report item is made for every date with washed cars,
+    penalties or surcharges; dates are in ascending order, additional
+    services of a date are ordered by name.
+
+    Keyword Args:
+        car_wash_ids: IDs of car washes.
+        from_date: period start date.
+        to_date: period end date.
+        is_breakdown: also include report of every car wash separately.
+            Computed from the same queries as the report of all car washes.
+
+    Returns:
+        Report of all car washes under "car_washes_revenue" key, reports of
+        separate car washes under "car_washes" key if breakdown requested.
+    """
+    cars_to_wash_daily_totals = get_cars_to_wash_daily_totals_for_period(
         from_date=from_date,
         to_date=to_date,
         car_wash_ids=car_wash_ids,
     )
+    additional_services_daily_totals = (
+        get_additional_services_daily_totals_for_period(
+            from_date=from_date,
+            to_date=to_date,
+            car_wash_ids=car_wash_ids,
+        )
+    )
     car_wash_penalties_and_surcharges = (
-        get_car_wash_penalties_and_surcharges_for_period(
+        get_car_wash_penalties_and_surcharges_by_car_wash_for_period(
             car_wash_ids=car_wash_ids,
             from_date=from_date,
             to_date=to_date,
         )
     )
 
-    return group_cars_to_wash_by_shift_date(
-        cars_to_wash=cars_to_wash,
-        penalties_and_surcharges=car_wash_penalties_and_surcharges,
+    report = {
+        "car_washes_revenue": merge_daily_totals(
+            cars_to_wash_daily_totals=cars_to_wash_daily_totals,
+            additional_services_daily_totals=additional_services_daily_totals,
+            penalties_and_surcharges=car_wash_penalties_and_surcharges,
+        ),
+    }
+    if not is_breakdown:
+        return report
+
+    car_wash_id_to_cars_to_wash_daily_totals = group_by_car_wash_id(
+        cars_to_wash_daily_totals,
+    )
+    car_wash_id_to_additional_services_daily_totals = group_by_car_wash_id(
+        additional_services_daily_totals,
+    )
+    car_wash_id_to_penalties_and_surcharges = group_by_car_wash_id(
+        car_wash_penalties_and_surcharges,
     )
+    report["car_washes"] = [
+        {
+            "car_wash_id": car_wash_id,
+            "car_washes_revenue": merge_daily_totals(
+                cars_to_wash_daily_totals=(
+                    car_wash_id_to_cars_to_wash_daily_totals.get(
+                        car_wash_id,
+                        [],
+                    )
+                ),
+                additional_services_daily_totals=(
+                    car_wash_id_to_additional_services_daily_totals.get(
+                        car_wash_id,
+                        [],
+                    )
+                ),
+                penalties_and_surcharges=(
+                    car_wash_id_to_penalties_and_surcharges.get(
+                        car_wash_id,
+                        [],
+                    )
+                ),
+            ),
+        }
+        for car_wash_id in dict.fromkeys(car_wash_ids)
+    ]
+    return report
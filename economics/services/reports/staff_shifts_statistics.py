@@ -1,17 +1,21 @@
 import datetime
 from abc import ABC, abstractmethod
 from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass
 from functools import cached_property
 from typing import Protocol, TypeVar
 
+from django.db.models import F, Q
+
 from deposits.services import StaffReportPeriods
 from economics.models import (
     CarTransporterAndWasherServicePrices,
     CarTransporterServicePrices,
 )
 from economics.selectors import (
+    annotate_shifts_cars_aggregates,
+    SHIFT_CARS_AGGREGATE_FIELDS,
     StaffPenaltiesOrSurchargesForSpecificShift,
 )
 from shifts.models import (
@@ -367,6 +371,40 @@ def merge_shifts_statistics_and_penalties_and_surcharges(
     )
 
 
+def merge_staff_list_shifts_statistics_and_penalties_and_surcharges(
+        *,
+        staff_list: Iterable[StaffItem],
+        staff_shifts_statistics: Iterable[ShiftStatisticsGroupedByStaff],
+        penalties: Iterable[StaffPenaltiesOrSurchargesForSpecificShift],
+        surcharges: Iterable[StaffPenaltiesOrSurchargesForSpecificShift],
+        fine_deposit_calculator: FineDepositCalculator,
+        road_accident_deposit_calculator: RoadAccidentDepositCalculator,
+) -> list[StaffShiftsStatistics]:
+    """Merge shifts statistics, penalties and surcharges for every staff.
+
+    All inputs are grouped by staff id once, so each staff member is merged
+    only with its own rows instead of scanning rows of the whole staff.
+    """
+    staff_id_to_shifts_statistics = group_by_staff_id(staff_shifts_statistics)
+    staff_id_to_penalties = group_by_staff_id(penalties)
+    staff_id_to_surcharges = group_by_staff_id(surcharges)
+
+    return [
+        merge_shifts_statistics_and_penalties_and_surcharges(
+            staff=staff,
+            staff_shifts_statistics=staff_id_to_shifts_statistics.get(
+                staff.id,
+                [],
+            ),
+            penalties=staff_id_to_penalties.get(staff.id, []),
+            surcharges=staff_id_to_surcharges.get(staff.id, []),
+            fine_deposit_calculator=fine_deposit_calculator,
+            road_accident_deposit_calculator=road_accident_deposit_calculator,
+        )
+        for staff in staff_list
+    ]
+
+
 class HasItemDryCleaningPrice(Protocol):
     item_dry_cleaning: int
 
@@ -377,25 +415,51 @@ class CarDryCleaningItems:
     count: int
 
 
+class ShiftDryCleaningIndex:
+    """Dry cleaning items count and cost of the period indexed by shift id.
+
+    Built once per report run and shared by all shift calculators.
+    """
+
+    def __init__(
+            self,
+            *,
+            shift_id_to_cars: Mapping[int, Iterable[TransferredCar]],
+            cars_dry_cleaning_items: Iterable[CarDryCleaningItems],
+    ):
+        car_id_to_count = {
+            car_dry_cleaning_items.car_id: car_dry_cleaning_items.count
+            for car_dry_cleaning_items in cars_dry_cleaning_items
+        }
+        self.__shift_id_to_items_count: dict[int, int] = defaultdict(int)
+        self.__shift_id_to_cost: dict[int, int] = defaultdict(int)
+        for shift_id, cars in shift_id_to_cars.items():
+            for car in cars:
+                count = car_id_to_count.get(car.id, 0)
+                if not count:
+                    continue
+                self.__shift_id_to_items_count[shift_id] += count
+                self.__shift_id_to_cost[shift_id] += (
+                        count * car.item_dry_cleaning_price
+                )
+
+    def get_items_count(self, shift_id: int) -> int:
+        return self.__shift_id_to_items_count.get(shift_id, 0)
+
+    def get_cost(self, shift_id: int) -> int:
+        return self.__shift_id_to_cost.get(shift_id, 0)
+
+
 @dataclass(kw_only=True)
 class ShiftTransferredCarsTotalCostCalculator(ABC):
+    shift_id: int
     cars: Iterable[TransferredCar]
-    cars_dry_cleaning_items: Iterable[CarDryCleaningItems]
+    dry_cleaning_index: ShiftDryCleaningIndex
     prices: HasItemDryCleaningPrice
 
     @cached_property
-    def car_id_to_dry_cleaning_items_count(self) -> dict[int, int]:
-        return {
-            car_dry_cleaning_items.car_id: car_dry_cleaning_items.count
-            for car_dry_cleaning_items in self.cars_dry_cleaning_items
-        }
-
-    def get_dry_cleaning_items_count_by_shift_id(self, shift_id: int) -> int:
-        count = 0
-        for car in self.cars:
-            if car.shift_id == shift_id:
-                count += self.car_id_to_dry_cleaning_items_count.get(car.id, 0)
-        return count
+    def dry_cleaning_items_count(self) -> int:
+        return self.dry_cleaning_index.get_items_count(self.shift_id)
 
     @cached_property
     def planned_cars(self) -> list[TransferredCar]:
@@ -456,11 +520,7 @@ class ShiftTransferredCarsTotalCostCalculator(ABC):
         return self.planned_cars_count + self.urgent_cars_count
 
     def calculate_dry_cleaning_cost(self) -> int:
-        total_dry_cleaning_price = 0
-        for car in self.cars:
-            count = self.car_id_to_dry_cleaning_items_count.get(car.id, 0)
-            total_dry_cleaning_price += count * car.item_dry_cleaning_price
-        return total_dry_cleaning_price
+        return self.dry_cleaning_index.get_cost(self.shift_id)
 
     @abstractmethod
     def calculate_total_cost(self):
@@ -613,10 +673,13 @@ def get_cars_to_wash_statistics(
     if staff_ids is not None:
         shifts = shifts.filter(staff_id__in=staff_ids)
 
-    cars_dry_cleaning_items = get_cars_dry_cleaning_items(
-        from_date=from_date,
-        to_date=to_date,
-        staff_ids=staff_ids,
+    dry_cleaning_index = ShiftDryCleaningIndex(
+        shift_id_to_cars=shift_id_to_cars,
+        cars_dry_cleaning_items=get_cars_dry_cleaning_items(
+            from_date=from_date,
+            to_date=to_date,
+            staff_ids=staff_ids,
+        ),
     )
 
     shifts_statistics: list[ShiftStatistics] = []
@@ -631,8 +694,9 @@ def get_cars_to_wash_statistics(
 
         if shift.staff.type == StaffType.CAR_TRANSPORTER:
             calculator = CarTransporterTransferredCarsTotalCostCalculator(
+                shift_id=shift.id,
                 cars=shift_cars,
-                cars_dry_cleaning_items=cars_dry_cleaning_items,
+                dry_cleaning_index=dry_cleaning_index,
                 prices=car_transporter_service_prices,
                 is_extra_shift=shift.is_extra,
                 transferred_cars_min_count=shift.transferred_cars_threshold,
@@ -640,8 +704,9 @@ def get_cars_to_wash_statistics(
         else:
             calculator = (
                 CarTransporterAndWasherTransferredCarsTotalCostCalculator(
+                    shift_id=shift.id,
                     cars=shift_cars,
-                    cars_dry_cleaning_items=cars_dry_cleaning_items,
+                    dry_cleaning_index=dry_cleaning_index,
                     prices=car_transporter_and_washer_service_prices,
                 )
             )
@@ -654,9 +719,7 @@ def get_cars_to_wash_statistics(
             planned_business_cars_washed_count=calculator.business_cars_count,
             planned_vans_washed_count=calculator.vans_count,
             urgent_cars_washed_count=calculator.urgent_cars_count,
-            dry_cleaning_items_count=(
-                calculator.get_dry_cleaning_items_count_by_shift_id(shift.id)
-            ),
+            dry_cleaning_items_count=calculator.dry_cleaning_items_count,
             is_extra_shift=shift.is_extra,
         )
         shifts_statistics.append(shift_statistics)
@@ -664,6 +727,207 @@ def get_cars_to_wash_statistics(
     return shifts_statistics
 
 
+SHIFT_STATISTICS_VALUES_FIELDS = (
+    "id",
+    "staff_id",
+    "staff__type",
+    "date",
+    "is_extra",
+    "transferred_cars_threshold",
+)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ShiftCarsAggregate:
+    planned_comfort_cars_count: int
+    planned_business_cars_count: int
+    planned_vans_count: int
+    urgent_cars_count: int
+    transfer_price_sum: int
+    dry_cleaning_items_count: int
+    dry_cleaning_cost: int
+
+    @property
+    def planned_cars_count(self) -> int:
+        return (
+                self.planned_comfort_cars_count
+                + self.planned_business_cars_count
+                + self.planned_vans_count
+        )
+
+    @property
+    def total_cars_count(self) -> int:
+        return self.planned_cars_count + self.urgent_cars_count
+
+
+def calculate_shift_cars_aggregate_total_cost(
+        *,
+        aggregate: ShiftCarsAggregate,
+        staff_type: int,
+        is_extra_shift: bool,
+        transferred_cars_min_count: int,
+        car_transporter_service_prices: CarTransporterServicePrices,
+) -> int:
+    """Calculate shift total cost from precomputed cars aggregate.
+
+    Mirrors the rules of the shift transferred cars total cost calculators.
+    """
+    if staff_type != StaffType.CAR_TRANSPORTER:
+        return aggregate.transfer_price_sum + aggregate.dry_cleaning_cost
+
+    prices = car_transporter_service_prices
+    urgent_cars_transfer_cost = (
+            prices.urgent_car_transfer * aggregate.urgent_cars_count
+    )
+    if is_extra_shift:
+        planned_cars_transfer_cost = (
+                prices.extra_shift * aggregate.planned_cars_count
+        )
+    elif aggregate.total_cars_count < transferred_cars_min_count:
+        planned_cars_transfer_cost = (
+                prices.under_plan_planned_car_transfer
+                * aggregate.planned_cars_count
+        )
+    else:
+        return aggregate.transfer_price_sum + aggregate.dry_cleaning_cost
+    return (
+            planned_cars_transfer_cost
+            + urgent_cars_transfer_cost
+            + aggregate.dry_cleaning_cost
+    )
+
+
+def map_shifts_cars_aggregates_to_statistics(
+        shifts: Iterable[dict],
+) -> list[ShiftStatistics]:
+    """Map shifts annotated with cars aggregates to shifts statistics.
+
+    Args:
+        shifts: shift values with cars aggregates fields, staff type,
+            extra shift flag and transferred cars threshold.
+
+    Returns:
+        list of ShiftStatistics.
+    """
+    car_transporter_service_prices = CarTransporterServicePrices.get()
+
+    shifts_statistics: list[ShiftStatistics] = []
+    for shift in shifts:
+        aggregate = ShiftCarsAggregate(
+            planned_comfort_cars_count=shift["planned_comfort_cars_count"],
+            planned_business_cars_count=shift["planned_business_cars_count"],
+            planned_vans_count=shift["planned_vans_count"],
+            urgent_cars_count=shift["urgent_cars_count"],
+            transfer_price_sum=shift["transfer_price_sum"],
+            dry_cleaning_items_count=shift["dry_cleaning_items_count"],
+            dry_cleaning_cost=shift["dry_cleaning_cost"],
+        )
+        washed_cars_total_cost = calculate_shift_cars_aggregate_total_cost(
+            aggregate=aggregate,
+            staff_type=shift["staff__type"],
+            is_extra_shift=shift["is_extra"],
+            transferred_cars_min_count=shift["transferred_cars_threshold"],
+            car_transporter_service_prices=car_transporter_service_prices,
+        )
+        shifts_statistics.append(
+            ShiftStatistics(
+                staff_id=shift["staff_id"],
+                shift_id=shift["id"],
+                shift_date=shift["date"],
+                washed_cars_total_cost=washed_cars_total_cost,
+                planned_comfort_cars_washed_count=(
+                    aggregate.planned_comfort_cars_count
+                ),
+                planned_business_cars_washed_count=(
+                    aggregate.planned_business_cars_count
+                ),
+                planned_vans_washed_count=aggregate.planned_vans_count,
+                urgent_cars_washed_count=aggregate.urgent_cars_count,
+                dry_cleaning_items_count=aggregate.dry_cleaning_items_count,
+                is_extra_shift=shift["is_extra"],
+            )
+        )
+
+    return shifts_statistics
+
+
+def get_cars_to_wash_statistics_aggregated(
+        *,
+        from_date: datetime.date,
+        to_date: datetime.date,
+        staff_ids: Iterable[int] | None = None,
+) -> list[ShiftStatistics]:
+    """Get shifts statistics computed by the database.
+
+    Same output as `get_cars_to_wash_statistics`, but cars counts, transfer
+    price sums and dry cleaning items are aggregated in a single grouped
+    query over shifts instead of loading every car of the period.
+
+    Keyword Args:
+        from_date: period start date.
+        to_date: period end date.
+        staff_ids: staff ids to filter by. If None, all staff will be included.
+
+    Returns:
+        list of ShiftStatistics.
+    """
+    shifts = Shift.objects.filter(date__range=(from_date, to_date))
+    if staff_ids is not None:
+        shifts = shifts.filter(staff_id__in=staff_ids)
+    shifts = annotate_shifts_cars_aggregates(shifts).values(
+        *SHIFT_STATISTICS_VALUES_FIELDS,
+        *SHIFT_CARS_AGGREGATE_FIELDS,
+    )
+    return map_shifts_cars_aggregates_to_statistics(shifts)
+
+
+def get_cars_to_wash_statistics_from_rollups(
+        *,
+        from_date: datetime.date,
+        to_date: datetime.date,
+        staff_ids: Iterable[int] | None = None,
+) -> list[ShiftStatistics]:
+    """Get shifts statistics from persisted shift statistics rollups.
+
+    Shifts which have no rollup yet (not backfilled, or refresh has not
+    been committed) or whose rollup is stale (refresh failed, or cars
+    changed after it) are aggregated from their cars, so the report stays
+    correct while `rebuild_shift_statistics_rollups` has not been run.
+
+    Keyword Args:
+        from_date: period start date.
+        to_date: period end date.
+        staff_ids: staff ids to filter by. If None, all staff will be included.
+
+    Returns:
+        list of ShiftStatistics.
+    """
+    shifts = Shift.objects.filter(date__range=(from_date, to_date))
+    if staff_ids is not None:
+        shifts = shifts.filter(staff_id__in=staff_ids)
+    is_rollup_fresh = Q(
+        statistics_rollup__version=F("statistics_rollup__refreshed_version"),
+    )
+    shifts_with_rollup = shifts.filter(is_rollup_fresh).annotate(
+        **{
+            field_name: F(f"statistics_rollup__{field_name}")
+            for field_name in SHIFT_CARS_AGGREGATE_FIELDS
+        }
+    ).values(
+        *SHIFT_STATISTICS_VALUES_FIELDS,
+        *SHIFT_CARS_AGGREGATE_FIELDS,
+    )
+    shifts_without_rollup = annotate_shifts_cars_aggregates(
+        shifts.exclude(is_rollup_fresh),
+    ).values(
+        *SHIFT_STATISTICS_VALUES_FIELDS,
+        *SHIFT_CARS_AGGREGATE_FIELDS,
+    )
+    return map_shifts_cars_aggregates_to_statistics(
+        [*shifts_with_rollup, *shifts_without_rollup],
+    )
+
+
 def group_shifts_statistics_by_staff(
         shifts_statistics: Iterable[ShiftStatistics],
 ) -> list[ShiftStatisticsGroupedByStaff]:
@@ -0,0 +1,157 @@
+import datetime
+from collections.abc import Iterable
+
+from django.db import connection, transaction
+from django.db.models import F
+
+from economics.models import ShiftStatisticsRollup
+from economics.selectors import (
+    annotate_shifts_cars_aggregates,
+    SHIFT_CARS_AGGREGATE_FIELDS,
+)
+from shifts.models import Shift
+
+
+__all__ = (
+    "refresh_shift_statistics_rollups",
+    "schedule_shift_statistics_rollups_refresh",
+    "rebuild_shift_statistics_rollups",
+)
+
+
+def refresh_shift_statistics_rollups(shift_ids: Iterable[int]) -> int:
+    """Recompute statistics rollups of shifts from their transferred cars.
+
+    Missing rollups are created, existing ones are overwritten.
+    Not existing shifts are skipped.
+
+    Rollup rows are locked before cars are aggregated, so concurrent
+    refreshes of the same shift are serialized and the last one always
+    sees cars committed by the others. Rows are locked until the
+    transaction ends, so version can not be bumped by cars changes
+    in the meantime, and the rollup is marked refreshed at it.
+
+    Args:
+        shift_ids: IDs of shifts to refresh.
+
+    Returns:
+        Refreshed rollups count.
+    """
+    shift_ids = sorted(set(shift_ids))
+    with transaction.atomic():
+        ShiftStatisticsRollup.objects.bulk_create(
+            [
+                ShiftStatisticsRollup(shift_id=shift_id)
+                for shift_id in Shift.objects.filter(
+                    id__in=shift_ids,
+                ).order_by("id").values_list("id", flat=True)
+            ],
+            ignore_conflicts=True,
+        )
+        locked_shift_ids = list(
+            ShiftStatisticsRollup.objects
+            .select_for_update()
+            .filter(shift_id__in=shift_ids)
+            .order_by("shift_id")
+            .values_list("shift_id", flat=True)
+        )
+        if not locked_shift_ids:
+            return 0
+
+        shifts_sql, shifts_params = annotate_shifts_cars_aggregates(
+            Shift.objects.filter(id__in=locked_shift_ids),
+        ).values(
+            "id",
+            "is_extra",
+            *SHIFT_CARS_AGGREGATE_FIELDS,
+        ).query.sql_with_params()
+        rollups_table = connection.ops.quote_name(
+            ShiftStatisticsRollup._meta.db_table,
+        )
+        aggregate_columns = [
+            connection.ops.quote_name(field_name)
+            for field_name in SHIFT_CARS_AGGREGATE_FIELDS
+        ]
+        assignments = ", ".join(
+            f"{column} = shifts.{column}" for column in aggregate_columns
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {rollups_table}"
+                f" SET {assignments},"
+                f" is_extra_shift = shifts.is_extra,"
+                f" refreshed_version = {rollups_table}.version,"
+                f" updated_at = NOW()"
+                f" FROM ({shifts_sql}) AS shifts"
+                f" WHERE {rollups_table}.shift_id = shifts.id",
+                shifts_params,
+            )
+            return cursor.rowcount
+
+
+def refresh_shift_statistics_rollups_in_batches(
+        shift_ids: Iterable[int],
+        batch_size: int = 1000,
+) -> int:
+    shift_ids = sorted(set(shift_ids))
+    refreshed_count = 0
+    for offset in range(0, len(shift_ids), batch_size):
+        refreshed_count += refresh_shift_statistics_rollups(
+            shift_ids[offset:offset + batch_size],
+        )
+    return refreshed_count
+
+
+def schedule_shift_statistics_rollups_refresh(
+        shift_ids: Iterable[int],
+) -> None:
+    """Mark statistics rollups of shifts stale and refresh them once
+    the transaction commits.
+
+    Rollups are marked stale in the current transaction, so reports
+    aggregate these shifts from cars until the refresh succeeds, even if
+    it fails or the process exits before it runs. Deferring the refresh
+    lets cascade deletes of shifts finish first.
+
+    Args:
+        shift_ids: IDs of shifts to refresh.
+    """
+    shift_ids = set(shift_ids)
+    if not shift_ids:
+        return
+    ShiftStatisticsRollup.objects.filter(shift_id__in=shift_ids).update(
+        version=F("version") + 1,
+    )
+    transaction.on_commit(
+        lambda: refresh_shift_statistics_rollups_in_batches(shift_ids),
+        robust=True,
+    )
+
+
+def rebuild_shift_statistics_rollups(
+        *,
+        from_date: datetime.date | None = None,
+        to_date: datetime.date | None = None,
+        batch_size: int = 1000,
+) -> int:
+    """Recompute statistics rollups of all shifts in batches.
+
+    Used to backfill and repair rollups table.
+
+    Keyword Args:
+        from_date: shifts period start date. If None, no lower bound.
+        to_date: shifts period end date. If None, no upper bound.
+        batch_size: shifts count refreshed in a single query.
+
+    Returns:
+        Refreshed rollups count.
+    """
+    shifts = Shift.objects.order_by("id")
+    if from_date is not None:
+        shifts = shifts.filter(date__gte=from_date)
+    if to_date is not None:
+        shifts = shifts.filter(date__lte=to_date)
+    return refresh_shift_statistics_rollups_in_batches(
+        shifts.values_list("id", flat=True),
+        batch_size=batch_size,
+    )
@@ -0,0 +1,180 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from car_washes.models import CarWashService
+from deposits.models import FineDepositException, RoadAccidentDepositException
+from economics.models import CarTransporterPenalty, CarTransporterSurcharge
+from economics.services.report_period_snapshots import (
+    mark_report_period_snapshots_stale,
+    mark_shifts_report_period_snapshots_stale,
+)
+from economics.services.shift_statistics_rollups import (
+    schedule_shift_statistics_rollups_refresh,
+)
+from shifts.models import CarToWash, CarToWashAdditionalService, Shift
+
+
+def get_previous_field_value(sender, instance, field_name: str):
+    if instance.pk is None:
+        return None
+    return (
+        sender.objects
+        .filter(pk=instance.pk)
+        .values_list(field_name, flat=True)
+        .first()
+    )
+
+
+@receiver(pre_save, sender=Shift)
+@receiver(pre_save, sender=CarTransporterPenalty)
+@receiver(pre_save, sender=CarTransporterSurcharge)
+def remember_previous_date(sender, instance, **kwargs) -> None:
+    # Report periods of the date the record is moved from are stale too.
+    instance._previous_date = get_previous_field_value(
+        sender,
+        instance,
+        "date",
+    )
+
+
+@receiver(pre_save, sender=CarToWash)
+def remember_previous_car_shift_id(
+        sender,
+        instance: CarToWash,
+        **kwargs,
+) -> None:
+    instance._previous_shift_id = get_previous_field_value(
+        sender,
+        instance,
+        "shift_id",
+    )
+
+
+@receiver(post_save, sender=Shift)
+def refresh_shift_statistics_rollup_on_shift_save(
+        sender,
+        instance: Shift,
+        created: bool,
+        **kwargs,
+) -> None:
+    if created:
+        return
+    schedule_shift_statistics_rollups_refresh([instance.id])
+
+
+@receiver(post_save, sender=Shift)
+@receiver(post_delete, sender=Shift)
+def mark_report_period_snapshots_stale_on_shift_change(
+        sender,
+        instance: Shift,
+        **kwargs,
+) -> None:
+    # Shifts count of staff affects fine deposit of all following periods.
+    # Snapshots hold all staff, so moving shift to other staff is covered
+    # by its date.
+    from_date = instance.date
+    previous_date = getattr(instance, "_previous_date", None)
+    if previous_date is not None:
+        from_date = min(from_date, previous_date)
+    mark_report_period_snapshots_stale(from_date=from_date)
+
+
+@receiver(post_save, sender=CarToWash)
+@receiver(post_delete, sender=CarToWash)
+def refresh_shift_statistics_rollup_on_car_change(
+        sender,
+        instance: CarToWash,
+        **kwargs,
+) -> None:
+    shift_ids = {
+        instance.shift_id,
+        getattr(instance, "_previous_shift_id", None),
+    } - {None}
+    schedule_shift_statistics_rollups_refresh(shift_ids)
+    mark_shifts_report_period_snapshots_stale(shift_ids)
+
+
+@receiver(post_save, sender=CarToWashAdditionalService)
+@receiver(post_delete, sender=CarToWashAdditionalService)
+def refresh_shift_statistics_rollup_on_additional_service_change(
+        sender,
+        instance: CarToWashAdditionalService,
+        **kwargs,
+) -> None:
+    shift_ids = set(
+        CarToWash.objects.filter(
+            id=instance.car_id,
+        ).values_list("shift_id", flat=True)
+    )
+    schedule_shift_statistics_rollups_refresh(shift_ids)
+    mark_shifts_report_period_snapshots_stale(shift_ids)
+
+
+@receiver(pre_save, sender=CarWashService)
+def remember_car_wash_service_dry_cleaning_flag(
+        sender,
+        instance: CarWashService,
+        **kwargs,
+) -> None:
+    instance._previous_is_dry_cleaning = get_previous_field_value(
+        sender,
+        instance,
+        "is_dry_cleaning",
+    )
+
+
+@receiver(post_save, sender=CarWashService)
+def refresh_shift_statistics_rollups_on_dry_cleaning_flag_change(
+        sender,
+        instance: CarWashService,
+        created: bool,
+        **kwargs,
+) -> None:
+    previous_is_dry_cleaning = getattr(
+        instance,
+        "_previous_is_dry_cleaning",
+        None,
+    )
+    if created or previous_is_dry_cleaning in (
+            None,
+            instance.is_dry_cleaning,
+    ):
+        return
+    # Dry cleaning items of every shift the service was provided in
+    # are counted differently now.
+    shift_ids = set(
+        CarToWashAdditionalService.objects.filter(
+            service_id=instance.id,
+        ).values_list("car__shift_id", flat=True)
+    )
+    schedule_shift_statistics_rollups_refresh(shift_ids)
+    mark_shifts_report_period_snapshots_stale(shift_ids)
+
+
+@receiver(post_save, sender=CarTransporterPenalty)
+@receiver(post_delete, sender=CarTransporterPenalty)
+@receiver(post_save, sender=CarTransporterSurcharge)
+@receiver(post_delete, sender=CarTransporterSurcharge)
+def mark_report_period_snapshots_stale_on_penalty_or_surcharge_change(
+        sender,
+        instance: CarTransporterPenalty | CarTransporterSurcharge,
+        **kwargs,
+) -> None:
+    dates = {instance.date, getattr(instance, "_previous_date", None)}
+    for date in dates - {None}:
+        mark_report_period_snapshots_stale(from_date=date, to_date=date)
+
+
+@receiver(post_save, sender=FineDepositException)
+@receiver(post_delete, sender=FineDepositException)
+@receiver(post_save, sender=RoadAccidentDepositException)
+@receiver(post_delete, sender=RoadAccidentDepositException)
+def mark_report_period_snapshots_stale_on_deposit_exception_change(
+        sender,
+        instance: FineDepositException | RoadAccidentDepositException,
+        **kwargs,
+) -> None:
+    mark_report_period_snapshots_stale(
+        from_date=instance.from_date,
+        to_date=instance.to_date,
+    )
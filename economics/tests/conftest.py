@@ -0,0 +1,81 @@
+import datetime
+
+import pytest
+
+from car_washes.tests.factories import CarWashServiceFactory
+from shifts.models import CarToWash
+from shifts.tests.factories import (
+    ShiftFactory,
+    TransferredCarAdditionalServiceFactory,
+    TransferredCarFactory,
+)
+from staff.models import StaffType
+from staff.tests.factories import StaffFactory
+
+
+@pytest.fixture
+def shifts_with_cars(service_prices):
+    dry_cleaning_service = CarWashServiceFactory(is_dry_cleaning=True)
+    other_service = CarWashServiceFactory(is_dry_cleaning=False)
+
+    car_transporter = StaffFactory(type=StaffType.CAR_TRANSPORTER)
+    car_transporter_and_washer = StaffFactory(
+        type=StaffType.CAR_TRANSPORTER_AND_WASHER,
+    )
+
+    shifts = [
+        # Minimal plan completed.
+        ShiftFactory(
+            staff=car_transporter,
+            date=datetime.date(2025, 3, 1),
+            transferred_cars_threshold=3,
+        ),
+        # Minimal plan not completed.
+        ShiftFactory(
+            staff=car_transporter,
+            date=datetime.date(2025, 3, 2),
+            transferred_cars_threshold=10,
+        ),
+        ShiftFactory(
+            staff=car_transporter,
+            date=datetime.date(2025, 3, 3),
+            is_extra=True,
+        ),
+        ShiftFactory(
+            staff=car_transporter_and_washer,
+            date=datetime.date(2025, 3, 1),
+        ),
+        # Shift without cars.
+        ShiftFactory(
+            staff=car_transporter_and_washer,
+            date=datetime.date(2025, 3, 2),
+        ),
+        # Shift out of the period.
+        ShiftFactory(
+            staff=car_transporter,
+            date=datetime.date(2025, 3, 20),
+        ),
+    ]
+    car_classes = CarToWash.CarType.values
+    wash_types = CarToWash.WashType.values
+    for shift_index, shift in enumerate(shifts):
+        if shift_index == 4:
+            continue
+        for car_index in range(6):
+            car = TransferredCarFactory(
+                shift=shift,
+                car_class=car_classes[car_index % len(car_classes)],
+                wash_type=wash_types[car_index % len(wash_types)],
+                item_dry_cleaning_price=40 + car_index,
+            )
+            if car_index % 2 == 0:
+                TransferredCarAdditionalServiceFactory(
+                    car=car,
+                    service=dry_cleaning_service,
+                    count=car_index + 1,
+                )
+            TransferredCarAdditionalServiceFactory(
+                car=car,
+                service=other_service,
+            )
+    return shifts
@@ -0,0 +1,237 @@
+import datetime
+
+import pytest
+
+from car_washes.tests.factories import CarWashFactory, CarWashServiceFactory
+from economics.services.reports import (
+    get_car_washes_sales_report_aggregated,
+)
+from economics.tests.factories import (
+    CarWashPenaltyFactory,
+    CarWashSurchargeFactory,
+)
+from shifts.models import CarToWash
+from shifts.tests.factories import (
+    ShiftFactory,
+    TransferredCarAdditionalServiceFactory,
+    TransferredCarFactory,
+)
+from staff.models import StaffType
+from staff.tests.factories import StaffFactory
+
+
+@pytest.fixture
+def car_wash_sales():
+    car_wash = CarWashFactory()
+    other_car_wash = CarWashFactory()
+    first_service = CarWashServiceFactory(name="Seats cleaning")
+    second_service = CarWashServiceFactory(name="Wheels polishing")
+
+    car_transporter_shift = ShiftFactory(
+        staff=StaffFactory(type=StaffType.CAR_TRANSPORTER),
+        date=datetime.date(2025, 3, 1),
+    )
+    car_transporter_and_washer_shift = ShiftFactory(
+        staff=StaffFactory(type=StaffType.CAR_TRANSPORTER_AND_WASHER),
+        date=datetime.date(2025, 3, 2),
+    )
+
+    comfort_car = TransferredCarFactory(
+        shift=car_transporter_shift,
+        car_wash=car_wash,
+        car_class=CarToWash.CarType.COMFORT,
+        comfort_class_car_washing_price=1000,
+        windshield_washer_refilled_bottle_percentage=50,
+        windshield_washer_price_per_bottle=100,
+    )
+    TransferredCarAdditionalServiceFactory(
+        car=comfort_car,
+        service=first_service,
+        count=2,
+        price=50,
+    )
+    TransferredCarAdditionalServiceFactory(
+        car=comfort_car,
+        service=second_service,
+        count=1,
+        price=30,
+    )
+    van = TransferredCarFactory(
+        shift=car_transporter_shift,
+        car_wash=car_wash,
+        car_class=CarToWash.CarType.VAN,
+        van_washing_price=2000,
+        windshield_washer_refilled_bottle_percentage=0,
+        windshield_washer_price_per_bottle=100,
+    )
+    TransferredCarAdditionalServiceFactory(
+        car=van,
+        service=first_service,
+        count=1,
+        price=50,
+    )
+    TransferredCarFactory(
+        shift=car_transporter_shift,
+        car_wash=car_wash,
+        car_class=CarToWash.CarType.BUSINESS,
+        business_class_car_washing_price=1500,
+        windshield_washer_refilled_bottle_percentage=150,
+        windshield_washer_price_per_bottle=100,
+    )
+    washer_car = TransferredCarFactory(
+        shift=car_transporter_and_washer_shift,
+        car_wash=car_wash,
+        car_class=CarToWash.CarType.COMFORT,
+        comfort_class_car_washing_price=800,
+        windshield_washer_refilled_bottle_percentage=100,
+        windshield_washer_price_per_bottle=50,
+    )
+    TransferredCarAdditionalServiceFactory(
+        car=washer_car,
+        service=first_service,
+        count=4,
+        price=50,
+        price_for_car_transporters_and_washers=25,
+    )
+    # Car of not requested car wash.
+    TransferredCarFactory(
+        shift=car_transporter_shift,
+        car_wash=other_car_wash,
+        car_class=CarToWash.CarType.VAN,
+    )
+
+    CarWashPenaltyFactory(
+        car_wash=car_wash,
+        date=datetime.date(2025, 3, 1),
+        amount=300,
+    )
+    CarWashSurchargeFactory(
+        car_wash=car_wash,
+        date=datetime.date(2025, 3, 2),
+        amount=200,
+    )
+    CarWashPenaltyFactory(
+        car_wash=car_wash,
+        date=datetime.date(2025, 3, 3),
+        amount=100,
+    )
+    return car_wash, first_service, second_service
+
+
+def map_additional_services(report_item: dict) -> list[tuple]:
+    return [
+        (service.id, service.name, service.count, service.total_price)
+        for service in report_item["additional_services"]
+    ]
+
+
+@pytest.mark.django_db
+def test_car_washes_sales_report(car_wash_sales):
+    car_wash, first_service, second_service = car_wash_sales
+
+    report = get_car_washes_sales_report_aggregated(
+        car_wash_ids=[car_wash.id],
+        from_date=datetime.date(2025, 3, 1),
+        to_date=datetime.date(2025, 3, 31),
+    )["car_washes_revenue"]
+
+    assert [
+        {
+            key: value
+            for key, value in item.items()
+            if key != "additional_services"
+        }
+        for item in report
+    ] == [
+        {
+            "shift_date": datetime.date(2025, 3, 1),
+            "comfort_cars_washed_count": 1,
+            "business_cars_washed_count": 1,
+            "van_cars_washed_count": 1,
+            "windshield_washer_refilled_bottle_count": 3,
+            "total_cost": 1230 + 2050 + 1700 - 300,
+            "penalties_amount": 300,
+            "surcharges_amount": 0,
+        },
+        {
+            "shift_date": datetime.date(2025, 3, 2),
+            "comfort_cars_washed_count": 1,
+            "business_cars_washed_count": 0,
+            "van_cars_washed_count": 0,
+            "windshield_washer_refilled_bottle_count": 1,
+            "total_cost": 950 + 200,
+            "penalties_amount": 0,
+            "surcharges_amount": 200,
+        },
+        {
+            "shift_date": datetime.date(2025, 3, 3),
+            "comfort_cars_washed_count": 0,
+            "business_cars_washed_count": 0,
+            "van_cars_washed_count": 0,
+            "windshield_washer_refilled_bottle_count": 0,
+            "total_cost": -100,
+            "penalties_amount": 100,
+            "surcharges_amount": 0,
+        },
+    ]
+    assert list(report[0]) == [
+        "shift_date",
+        "comfort_cars_washed_count",
+        "business_cars_washed_count",
+        "van_cars_washed_count",
+        "windshield_washer_refilled_bottle_count",
+        "total_cost",
+        "additional_services",
+        "penalties_amount",
+        "surcharges_amount",
+    ]
+    assert map_additional_services(report[0]) == [
+        (first_service.id, "Seats cleaning", 3, 150),
+        (second_service.id, "Wheels polishing", 1, 30),
+    ]
+    assert map_additional_services(report[1]) == [
+        (first_service.id, "Seats cleaning", 4, 100),
+    ]
+    assert report[2]["additional_services"] == []
+
+
+@pytest.mark.django_db
+def test_car_washes_sales_report_breakdown(car_wash_sales):
+    car_wash, _, _ = car_wash_sales
+    other_car_wash = CarWashFactory()
+    TransferredCarAdditionalServiceFactory(
+        car=TransferredCarFactory(
+            car_wash=other_car_wash,
+            shift__date=datetime.date(2025, 3, 1),
+        ),
+    )
+    CarWashSurchargeFactory(
+        car_wash=other_car_wash,
+        date=datetime.date(2025, 3, 1),
+    )
+    car_wash_ids = [car_wash.id, other_car_wash.id]
+
+    report = get_car_washes_sales_report_aggregated(
+        car_wash_ids=car_wash_ids,
+        from_date=datetime.date(2025, 3, 1),
+        to_date=datetime.date(2025, 3, 31),
+        is_breakdown=True,
+    )
+
+    total_report = get_car_washes_sales_report_aggregated(
+        car_wash_ids=car_wash_ids,
+        from_date=datetime.date(2025, 3, 1),
+        to_date=datetime.date(2025, 3, 31),
+    )
+    assert report["car_washes_revenue"] == total_report["car_washes_revenue"]
+    assert report["car_washes"] == [
+        {
+            "car_wash_id": car_wash_id,
+            "car_washes_revenue": get_car_washes_sales_report_aggregated(
+                car_wash_ids=[car_wash_id],
+                from_date=datetime.date(2025, 3, 1),
+                to_date=datetime.date(2025, 3, 31),
+            )["car_washes_revenue"],
+        }
+        for car_wash_id in car_wash_ids
+    ]
@@ -0,0 +1,87 @@
+import datetime
+
+import pytest
+
+from economics.services.reports import (
+    get_cars_to_wash_statistics,
+    get_cars_to_wash_statistics_aggregated,
+)
+from economics.services.reports.staff_shifts_statistics import (
+    CarDryCleaningItems,
+    ShiftDryCleaningIndex,
+)
+from shifts.models import CarToWash
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "staff_ids_index",
+    [None, 0, 1],
+)
+def test_aggregated_statistics_match_python_statistics(
+        shifts_with_cars,
+        staff_ids_index,
+):
+    staff_ids = None
+    if staff_ids_index is not None:
+        staff_ids = [shifts_with_cars[staff_ids_index * 3].staff_id]
+
+    expected = get_cars_to_wash_statistics(
+        from_date=datetime.date(2025, 3, 1),
+        to_date=datetime.date(2025, 3, 15),
+        staff_ids=staff_ids,
+    )
+    actual = get_cars_to_wash_statistics_aggregated(
+        from_date=datetime.date(2025, 3, 1),
+        to_date=datetime.date(2025, 3, 15),
+        staff_ids=staff_ids,
+    )
+
+    assert expected
+    assert sorted(actual, key=lambda item: item.shift_id) == sorted(
+        expected,
+        key=lambda item: item.shift_id,
+    )
+
+
+@pytest.mark.django_db
+def test_aggregated_statistics_counts(shifts_with_cars):
+    shift = shifts_with_cars[3]
+
+    result = get_cars_to_wash_statistics_aggregated(
+        from_date=shift.date,
+        to_date=shift.date,
+        staff_ids=[shift.staff_id],
+    )
+
+    assert len(result) == 1
+    shift_statistics = result[0]
+    assert shift_statistics.shift_id == shift.id
+    assert shift_statistics.planned_comfort_cars_washed_count == 1
+    assert shift_statistics.planned_business_cars_washed_count == 1
+    assert shift_statistics.planned_vans_washed_count == 1
+    assert shift_statistics.urgent_cars_washed_count == 3
+    assert shift_statistics.dry_cleaning_items_count == 1 + 3 + 5
+
+
+def test_shift_dry_cleaning_index():
+    shift_id_to_cars = {
+        1: [
+            CarToWash(id=1, shift_id=1, item_dry_cleaning_price=50),
+            CarToWash(id=2, shift_id=1, item_dry_cleaning_price=60),
+        ],
+        2: [CarToWash(id=3, shift_id=2, item_dry_cleaning_price=70)],
+    }
+    index = ShiftDryCleaningIndex(
+        shift_id_to_cars=shift_id_to_cars,
+        cars_dry_cleaning_items=[
+            CarDryCleaningItems(car_id=1, count=2),
+            CarDryCleaningItems(car_id=2, count=1),
+        ],
+    )
+
+    assert index.get_items_count(1) == 3
+    assert index.get_cost(1) == 2 * 50 + 60
+    assert index.get_items_count(2) == 0
+    assert index.get_cost(2) == 0
+    assert index.get_items_count(3) == 0
@@ -0,0 +1,127 @@
+import datetime
+import random
+
+from django.utils import timezone
+
+from deposits.services import StaffReportPeriods
+from economics.selectors import (
+    PenaltyOrSurchargeAmountAndShiftDate,
+    StaffPenaltiesOrSurchargesForSpecificShift,
+)
+from economics.services.reports import (
+    group_shifts_statistics_by_staff,
+    merge_shifts_statistics_and_penalties_and_surcharges,
+    merge_staff_list_shifts_statistics_and_penalties_and_surcharges,
+)
+from economics.services.reports.staff_shifts_statistics import (
+    FineDepositCalculator,
+    RoadAccidentDepositCalculator,
+    ShiftStatistics,
+)
+from staff.models import StaffType
+from staff.selectors import StaffItem
+
+
+def generate_penalties_or_surcharges(
+        *,
+        staff_ids: list[int],
+        dates: list[datetime.date],
+        generator: random.Random,
+) -> list[StaffPenaltiesOrSurchargesForSpecificShift]:
+    return [
+        StaffPenaltiesOrSurchargesForSpecificShift(
+            staff_id=staff_id,
+            items=[
+                PenaltyOrSurchargeAmountAndShiftDate(
+                    staff_id=staff_id,
+                    shift_date=date,
+                    total_amount=generator.randint(100, 1000),
+                )
+                for date in generator.sample(dates, 3)
+            ],
+        )
+        for staff_id in staff_ids
+    ]
+
+
+def test_merge_staff_list_matches_merge_per_staff():
+    generator = random.Random(42)
+    dates = [
+        datetime.date(2025, 3, 1) + datetime.timedelta(days=day)
+        for day in range(15)
+    ]
+    staff_list = [
+        StaffItem(
+            id=staff_id,
+            full_name=f"Staff {staff_id}",
+            car_sharing_phone_number="",
+            console_phone_number="",
+            type=StaffType.CAR_TRANSPORTER,
+            created_at=timezone.now(),
+            banned_at=None,
+        )
+        for staff_id in range(1, 21)
+    ]
+    staff_ids = [staff.id for staff in staff_list]
+    shifts_statistics = [
+        ShiftStatistics(
+            staff_id=staff_id,
+            shift_id=staff_id * 100 + day,
+            shift_date=date,
+            washed_cars_total_cost=generator.randint(0, 5000),
+            planned_comfort_cars_washed_count=generator.randint(0, 5),
+            planned_business_cars_washed_count=generator.randint(0, 5),
+            planned_vans_washed_count=generator.randint(0, 5),
+            urgent_cars_washed_count=generator.randint(0, 5),
+            dry_cleaning_items_count=generator.randint(0, 5),
+            is_extra_shift=generator.random() < 0.2,
+        )
+        for staff_id in generator.sample(staff_ids, 15)
+        for day, date in enumerate(generator.sample(dates, 5))
+    ]
+    staff_shifts_statistics = group_shifts_statistics_by_staff(
+        shifts_statistics,
+    )
+    penalties = generate_penalties_or_surcharges(
+        staff_ids=generator.sample(staff_ids, 10),
+        dates=dates,
+        generator=generator,
+    )
+    surcharges = generate_penalties_or_surcharges(
+        staff_ids=generator.sample(staff_ids, 10),
+        dates=dates,
+        generator=generator,
+    )
+    fine_deposit_calculator = FineDepositCalculator(
+        excluded_staff_ids=staff_ids[:2],
+        staff_report_periods=[
+            StaffReportPeriods(staff_id=staff_id, report_periods_count=staff_id)
+            for staff_id in staff_ids
+        ],
+    )
+    road_accident_deposit_calculator = RoadAccidentDepositCalculator(
+        excluded_staff_ids=staff_ids[2:4],
+    )
+
+    expected = [
+        merge_shifts_statistics_and_penalties_and_surcharges(
+            staff=staff,
+            staff_shifts_statistics=staff_shifts_statistics,
+            penalties=penalties,
+            surcharges=surcharges,
+            fine_deposit_calculator=fine_deposit_calculator,
+            road_accident_deposit_calculator=road_accident_deposit_calculator,
+        )
+        for staff in staff_list
+    ]
+    actual = merge_staff_list_shifts_statistics_and_penalties_and_surcharges(
+        staff_list=staff_list,
+        staff_shifts_statistics=staff_shifts_statistics,
+        penalties=penalties,
+        surcharges=surcharges,
+        fine_deposit_calculator=fine_deposit_calculator,
+        road_accident_deposit_calculator=road_accident_deposit_calculator,
+    )
+
+    assert actual == expected
+    assert [staff.staff for staff in actual] == staff_list
@@ -0,0 +1,120 @@
+import io
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from economics.services.query_plans import (
+    QueryPlanAdvisor,
+    QueryPlanCase,
+    QueryPlanIssue,
+    find_plan_issues,
+    get_query_plan_cases,
+    get_representative_params,
+)
+from shifts.models import Shift
+from shifts.tests.factories import TransferredCarFactory
+
+
+def test_find_plan_issues():
+    plan = {
+        "Node Type": "Sort",
+        "Sort Method": "external merge",
+        "Sort Space Type": "Disk",
+        "Sort Space Used": 2048,
+        "Plans": [
+            {
+                "Node Type": "Hash Join",
+                "Plans": [
+                    {
+                        "Node Type": "Seq Scan",
+                        "Relation Name": "shifts_cartowash",
+                        "Actual Rows": 10,
+                        "Rows Removed by Filter": 19_990,
+                        "Actual Loops": 1,
+                    },
+                    {
+                        "Node Type": "Hash",
+                        "Hash Batches": 4,
+                        "Plans": [
+                            {
+                                "Node Type": "Seq Scan",
+                                "Relation Name": "car_washes_carwash",
+                                "Actual Rows": 5,
+                                "Actual Loops": 1,
+                            },
+                        ],
+                    },
+                ],
+            },
+        ],
+    }
+
+    issues = find_plan_issues(plan, large_table_rows=10_000)
+
+    assert issues == [
+        QueryPlanIssue(
+            kind="sort_spill",
+            detail="external merge spilled 2048 kB to disk",
+        ),
+        QueryPlanIssue(
+            kind="seq_scan",
+            detail="Seq Scan on shifts_cartowash read 20000 rows",
+        ),
+        QueryPlanIssue(kind="hash_spill", detail="Hash spilled in 4 batches"),
+    ]
+
+
+@pytest.mark.django_db
+def test_advisor_explains_read_queries_and_rolls_back():
+    TransferredCarFactory.create_batch(3)
+
+    def delete_and_count_shifts():
+        Shift.objects.all().delete()
+        return Shift.objects.count()
+
+    reports = QueryPlanAdvisor(large_table_rows=1).execute(
+        [QueryPlanCase(name="delete", run=delete_and_count_shifts)],
+    )
+
+    assert Shift.objects.count() == 3
+    assert reports
+    assert all(report.sql.upper().startswith("SELECT") for report in reports)
+    assert all(report.case_name == "delete" for report in reports)
+
+
+@pytest.mark.django_db
+def test_all_cases_are_explained(service_prices):
+    TransferredCarFactory.create_batch(3, shift__finished_at=None)
+    params = get_representative_params()
+
+    reports = QueryPlanAdvisor().execute(get_query_plan_cases(params))
+
+    explained_case_names = {report.case_name for report in reports}
+    assert explained_case_names == {
+        case.name for case in get_query_plan_cases(params)
+    }
+    assert not any(report.issues for report in reports)
+    # Reports are ranked by execution time when there are no issues.
+    assert [report.execution_time_ms for report in reports] == sorted(
+        (report.execution_time_ms for report in reports),
+        reverse=True,
+    )
+
+
+@pytest.mark.django_db
+def test_command_fails_on_issues():
+    TransferredCarFactory.create_batch(3)
+    stdout = io.StringIO()
+
+    with pytest.raises(CommandError):
+        call_command(
+            "explain_queries",
+            "--cases",
+            "get_staff_with_no_shifts",
+            "--large-table-rows",
+            "1",
+            "--fail-on-issues",
+            stdout=stdout,
+        )
+
+    assert "seq_scan: Seq Scan on staff_staff" in stdout.getvalue()
@@ -0,0 +1,255 @@
+import datetime
+import logging
+
+import pytest
+
+from car_washes.tests.factories import CarWashServiceFactory
+from economics.models import ShiftStatisticsRollup
+from economics.services.reports import (
+    get_cars_to_wash_statistics_aggregated,
+    get_cars_to_wash_statistics_from_rollups,
+)
+from economics.services import shift_statistics_rollups
+from economics.services.shift_statistics_rollups import (
+    rebuild_shift_statistics_rollups,
+    refresh_shift_statistics_rollups,
+)
+from shifts.models import CarToWash
+from shifts.tests.factories import (
+    ShiftFactory,
+    TransferredCarAdditionalServiceFactory,
+    TransferredCarFactory,
+)
+from shifts.use_cases.batch_edit_item_update import BatchEditItemUpdateUseCase
+
+
+@pytest.mark.django_db
+def test_rebuild_shift_statistics_rollups(shifts_with_cars):
+    refreshed_count = rebuild_shift_statistics_rollups(batch_size=2)
+
+    assert refreshed_count == len(shifts_with_cars)
+    assert ShiftStatisticsRollup.objects.count() == len(shifts_with_cars)
+
+
+@pytest.mark.django_db
+def test_rollups_statistics_match_aggregated_statistics(shifts_with_cars):
+    rebuild_shift_statistics_rollups()
+
+    expected = get_cars_to_wash_statistics_aggregated(
+        from_date=datetime.date(2025, 3, 1),
+        to_date=datetime.date(2025, 3, 31),
+    )
+    actual = get_cars_to_wash_statistics_from_rollups(
+        from_date=datetime.date(2025, 3, 1),
+        to_date=datetime.date(2025, 3, 31),
+    )
+
+    assert sorted(actual, key=lambda item: item.shift_id) == sorted(
+        expected,
+        key=lambda item: item.shift_id,
+    )
+
+
+@pytest.mark.django_db
+def test_shift_without_rollup_has_zero_statistics(service_prices):
+    shift = ShiftFactory(date=datetime.date(2025, 3, 1), is_extra=True)
+
+    result = get_cars_to_wash_statistics_from_rollups(
+        from_date=shift.date,
+        to_date=shift.date,
+    )
+
+    assert len(result) == 1
+    assert result[0].shift_id == shift.id
+    assert result[0].washed_cars_total_count == 0
+    assert result[0].washed_cars_total_cost == 0
+    assert result[0].is_extra_shift
+
+
+@pytest.mark.django_db
+def test_shifts_without_rollup_are_aggregated_from_cars(shifts_with_cars):
+    refresh_shift_statistics_rollups([shifts_with_cars[0].id])
+
+    expected = get_cars_to_wash_statistics_aggregated(
+        from_date=datetime.date(2025, 3, 1),
+        to_date=datetime.date(2025, 3, 31),
+    )
+    actual = get_cars_to_wash_statistics_from_rollups(
+        from_date=datetime.date(2025, 3, 1),
+        to_date=datetime.date(2025, 3, 31),
+    )
+
+    assert ShiftStatisticsRollup.objects.count() == 1
+    assert sorted(actual, key=lambda item: item.shift_id) == sorted(
+        expected,
+        key=lambda item: item.shift_id,
+    )
+
+
+@pytest.mark.django_db
+def test_refresh_overwrites_existing_rollup():
+    car = TransferredCarFactory(wash_type=CarToWash.WashType.URGENT)
+    refresh_shift_statistics_rollups([car.shift_id])
+    TransferredCarFactory(
+        shift=car.shift,
+        wash_type=CarToWash.WashType.URGENT,
+    )
+
+    refresh_shift_statistics_rollups([car.shift_id])
+
+    rollup = ShiftStatisticsRollup.objects.get(shift_id=car.shift_id)
+    assert rollup.urgent_cars_count == 2
+
+
+@pytest.mark.django_db
+def test_rollup_refreshed_on_car_changes(django_capture_on_commit_callbacks):
+    service = CarWashServiceFactory(is_dry_cleaning=True)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        car = TransferredCarFactory(
+            wash_type=CarToWash.WashType.URGENT,
+            transfer_price=300,
+        )
+        TransferredCarAdditionalServiceFactory(
+            car=car,
+            service=service,
+            count=3,
+        )
+
+    rollup = ShiftStatisticsRollup.objects.get(shift_id=car.shift_id)
+    assert rollup.urgent_cars_count == 1
+    assert rollup.transfer_price_sum == 300
+    assert rollup.dry_cleaning_items_count == 3
+
+    with django_capture_on_commit_callbacks(execute=True):
+        car.delete()
+
+    rollup.refresh_from_db()
+    assert rollup.urgent_cars_count == 0
+    assert rollup.transfer_price_sum == 0
+    assert rollup.dry_cleaning_items_count == 0
+
+
+@pytest.mark.django_db
+def test_rollup_refreshed_on_shift_delete(django_capture_on_commit_callbacks):
+    car = TransferredCarFactory()
+    refresh_shift_statistics_rollups([car.shift_id])
+
+    with django_capture_on_commit_callbacks(execute=True):
+        car.shift.delete()
+
+    assert not ShiftStatisticsRollup.objects.exists()
+
+
+@pytest.mark.django_db
+def test_rollup_refreshed_on_batch_edit(django_capture_on_commit_callbacks):
+    car = TransferredCarFactory(
+        car_class=CarToWash.CarType.COMFORT,
+        wash_type=CarToWash.WashType.PLANNED,
+    )
+    refresh_shift_statistics_rollups([car.shift_id])
+
+    with django_capture_on_commit_callbacks(execute=True):
+        BatchEditItemUpdateUseCase(
+            items=[
+                {
+                    "shift_id": car.shift_id,
+                    "car_wash_id": car.car_wash_id,
+                    "car_number": car.number,
+                    "class_type": CarToWash.CarType.VAN,
+                    "wash_type": CarToWash.WashType.PLANNED,
+                    "windshield_washer_type": car.windshield_washer_type,
+                    "windshield_washer_refilled_bottle_percentage": 0,
+                    "additional_services": [],
+                },
+            ],
+        ).execute()
+
+    rollup = ShiftStatisticsRollup.objects.get(shift_id=car.shift_id)
+    assert rollup.planned_comfort_cars_count == 0
+    assert rollup.planned_vans_count == 1
+
+
+@pytest.mark.django_db
+def test_refresh_marks_rollup_fresh():
+    car = TransferredCarFactory()
+
+    refresh_shift_statistics_rollups([car.shift_id])
+
+    rollup = ShiftStatisticsRollup.objects.get(shift_id=car.shift_id)
+    assert rollup.refreshed_version == rollup.version
+
+
+@pytest.mark.django_db
+def test_stale_rollup_is_aggregated_from_cars(service_prices):
+    car = TransferredCarFactory(wash_type=CarToWash.WashType.URGENT)
+    refresh_shift_statistics_rollups([car.shift_id])
+
+    # Refresh callback never runs, since the test transaction is not
+    # committed, so the rollup stays stale.
+    TransferredCarFactory(
+        shift=car.shift,
+        wash_type=CarToWash.WashType.URGENT,
+    )
+
+    rollup = ShiftStatisticsRollup.objects.get(shift_id=car.shift_id)
+    result = get_cars_to_wash_statistics_from_rollups(
+        from_date=car.shift.date,
+        to_date=car.shift.date,
+    )
+    assert rollup.urgent_cars_count == 1
+    assert rollup.refreshed_version < rollup.version
+    assert len(result) == 1
+    assert result[0].urgent_cars_washed_count == 2
+
+
+@pytest.mark.django_db
+def test_failed_rollup_refresh_is_logged(
+        service_prices,
+        django_capture_on_commit_callbacks,
+        monkeypatch,
+        caplog,
+):
+    def refresh_shift_statistics_rollups(shift_ids):
+        raise RuntimeError("database is gone")
+
+    monkeypatch.setattr(
+        shift_statistics_rollups,
+        "refresh_shift_statistics_rollups",
+        refresh_shift_statistics_rollups,
+    )
+    car = TransferredCarFactory(wash_type=CarToWash.WashType.URGENT)
+
+    with (
+        caplog.at_level(logging.ERROR),
+        django_capture_on_commit_callbacks(execute=True),
+    ):
+        TransferredCarFactory(
+            shift=car.shift,
+            wash_type=CarToWash.WashType.URGENT,
+        )
+
+    result = get_cars_to_wash_statistics_from_rollups(
+        from_date=car.shift.date,
+        to_date=car.shift.date,
+    )
+    assert "database is gone" in caplog.text
+    assert result[0].urgent_cars_washed_count == 2
+
+
+@pytest.mark.django_db
+def test_rollup_refreshed_on_dry_cleaning_flag_change(
+        django_capture_on_commit_callbacks,
+):
+    service = CarWashServiceFactory(is_dry_cleaning=False)
+    car = TransferredCarFactory()
+    TransferredCarAdditionalServiceFactory(car=car, service=service, count=2)
+    refresh_shift_statistics_rollups([car.shift_id])
+
+    with django_capture_on_commit_callbacks(execute=True):
+        service.is_dry_cleaning = True
+        service.save()
+
+    rollup = ShiftStatisticsRollup.objects.get(shift_id=car.shift_id)
+    assert rollup.dry_cleaning_items_count == 2
+    assert rollup.refreshed_version == rollup.version
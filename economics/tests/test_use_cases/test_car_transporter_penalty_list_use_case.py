@@ -62,3 +62,25 @@ def test_has_next_page():
     ).execute()
 
     assert not response.is_end_of_list_reached
+
+
+@pytest.mark.django_db
+def test_next_page_by_cursor():
+    CarTransporterPenaltyFactory.create_batch(3)
+    offset_page = CarTransporterPenaltyListUseCase(
+        limit=1,
+        offset=1,
+    ).execute()
+
+    first_page = CarTransporterPenaltyListUseCase(
+        limit=1,
+        offset=0,
+    ).execute()
+    cursor_page = CarTransporterPenaltyListUseCase(
+        limit=1,
+        offset=0,
+        cursor=first_page.next_cursor,
+    ).execute()
+
+    assert cursor_page.penalties == offset_page.penalties
+    assert cursor_page.next_cursor is not None
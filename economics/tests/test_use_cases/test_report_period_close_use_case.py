@@ -0,0 +1,170 @@
+import datetime
+
+import pytest
+
+from economics.exceptions import ReportPeriodNotFinishedError
+from economics.models import ReportPeriodSnapshot
+from economics.tests.factories import CarTransporterPenaltyFactory
+from economics.use_cases import (
+    ReportPeriodCloseUseCase,
+    StaffShiftsStatisticsUseCase,
+)
+from shifts.tests.factories import TransferredCarFactory
+
+
+@pytest.mark.django_db
+def test_close_report_period_stores_snapshot(shifts_with_cars):
+    result = ReportPeriodCloseUseCase(
+        year=2025,
+        month=3,
+        report_period_number=1,
+    ).execute()
+
+    snapshot = ReportPeriodSnapshot.objects.get()
+    assert result.staff_count == len(snapshot.staff_list)
+    assert snapshot.from_date == datetime.date(2025, 3, 1)
+    assert snapshot.to_date == datetime.date(2025, 3, 15)
+    assert not snapshot.is_stale
+
+
+@pytest.mark.django_db
+def test_closed_report_period_served_from_snapshot(shifts_with_cars):
+    use_case = StaffShiftsStatisticsUseCase(
+        year=2025,
+        month=3,
+        report_period_number=1,
+    )
+    expected = use_case.execute()
+    ReportPeriodCloseUseCase(
+        year=2025,
+        month=3,
+        report_period_number=1,
+    ).execute()
+
+    assert use_case.execute() == expected
+
+    snapshot = ReportPeriodSnapshot.objects.get()
+    snapshot.staff_list[0]["total_statistics"]["dirty_revenue"] = 1
+    snapshot.save(update_fields=("staff_list",))
+
+    response = use_case.execute()
+    assert response.staff_list[0].total_statistics.dirty_revenue == 1
+
+
+@pytest.mark.django_db
+def test_closed_report_period_snapshot_filtered_by_staff(shifts_with_cars):
+    ReportPeriodCloseUseCase(
+        year=2025,
+        month=3,
+        report_period_number=1,
+    ).execute()
+    staff_id = shifts_with_cars[0].staff_id
+
+    response = StaffShiftsStatisticsUseCase(
+        year=2025,
+        month=3,
+        report_period_number=1,
+        staff_ids=[staff_id],
+    ).execute()
+
+    assert [staff.staff.id for staff in response.staff_list] == [staff_id]
+
+
+@pytest.mark.django_db
+def test_snapshot_marked_stale_on_penalty_create(shifts_with_cars):
+    ReportPeriodCloseUseCase(
+        year=2025,
+        month=3,
+        report_period_number=1,
+    ).execute()
+
+    CarTransporterPenaltyFactory(
+        staff=shifts_with_cars[0].staff,
+        date=datetime.date(2025, 3, 2),
+    )
+
+    assert ReportPeriodSnapshot.objects.get().is_stale
+
+
+@pytest.mark.django_db
+def test_snapshot_not_marked_stale_on_other_period_changes(shifts_with_cars):
+    ReportPeriodCloseUseCase(
+        year=2025,
+        month=3,
+        report_period_number=1,
+    ).execute()
+
+    CarTransporterPenaltyFactory(date=datetime.date(2025, 3, 20))
+    TransferredCarFactory(shift=shifts_with_cars[5])
+
+    assert not ReportPeriodSnapshot.objects.get().is_stale
+
+
+@pytest.mark.django_db
+def test_snapshot_marked_stale_on_penalty_moved_out_of_period(
+        shifts_with_cars,
+):
+    penalty = CarTransporterPenaltyFactory(date=datetime.date(2025, 3, 2))
+    ReportPeriodCloseUseCase(
+        year=2025,
+        month=3,
+        report_period_number=1,
+    ).execute()
+
+    penalty.date = datetime.date(2025, 3, 20)
+    penalty.save()
+
+    assert ReportPeriodSnapshot.objects.get().is_stale
+
+
+@pytest.mark.django_db
+def test_snapshot_marked_stale_on_car_moved_out_of_period(shifts_with_cars):
+    car = TransferredCarFactory(shift=shifts_with_cars[0])
+    ReportPeriodCloseUseCase(
+        year=2025,
+        month=3,
+        report_period_number=1,
+    ).execute()
+
+    car.shift = shifts_with_cars[5]
+    car.save()
+
+    assert ReportPeriodSnapshot.objects.get().is_stale
+
+
+@pytest.mark.django_db
+def test_stale_snapshot_ignored(shifts_with_cars):
+    ReportPeriodCloseUseCase(
+        year=2025,
+        month=3,
+        report_period_number=1,
+    ).execute()
+    staff = shifts_with_cars[0].staff
+
+    CarTransporterPenaltyFactory(
+        staff=staff,
+        date=datetime.date(2025, 3, 2),
+        amount=500,
+    )
+    response = StaffShiftsStatisticsUseCase(
+        year=2025,
+        month=3,
+        report_period_number=1,
+        staff_ids=[staff.id],
+    ).execute()
+
+    assert response.staff_list[0].total_statistics.penalty_amount == 500
+
+
+@pytest.mark.django_db
+def test_close_not_finished_report_period():
+    today = datetime.date.today()
+
+    with pytest.raises(ReportPeriodNotFinishedError):
+        ReportPeriodCloseUseCase(
+            year=today.year,
+            month=today.month,
+            report_period_number=2,
+        ).execute()
+
+    assert not ReportPeriodSnapshot.objects.exists()
@@ -40,6 +40,7 @@ def test_staff_has_multiple_penalties():
             )
             ],
         'is_end_of_list_reached': True,
+        'next_cursor': None,
     }
 
 
@@ -71,6 +72,7 @@ def test_staff_has_single_penalty():
                 }
             ],
         'is_end_of_list_reached': True,
+        'next_cursor': None,
     }
 
 
@@ -86,4 +88,5 @@ def test_staff_has_no_penalty():
     assert response_data == {
         'penalties': [],
         'is_end_of_list_reached': True,
+        'next_cursor': None,
     }
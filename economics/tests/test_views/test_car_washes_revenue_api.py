@@ -0,0 +1,59 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from car_washes.tests.factories import CarWashFactory
+from economics.tests.factories import CarWashPenaltyFactory
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("is_breakdown", [None, "false"])
+def test_car_washes_revenue_api_without_breakdown(is_breakdown):
+    penalty = CarWashPenaltyFactory(amount=100)
+    url = reverse("economics:service-costs")
+    client = APIClient()
+    params = {
+        "car_wash_ids": penalty.car_wash_id,
+        "from_date": str(penalty.date),
+        "to_date": str(penalty.date),
+    }
+    if is_breakdown is not None:
+        params["is_breakdown"] = is_breakdown
+
+    response = client.get(url, params)
+
+    assert response.status_code == status.HTTP_200_OK
+    response_data = response.json()
+    assert "car_washes" not in response_data
+    assert len(response_data["car_washes_revenue"]) == 1
+    assert response_data["car_washes_revenue"][0]["total_cost"] == -100
+
+
+@pytest.mark.django_db
+def test_car_washes_revenue_api_breakdown():
+    penalty = CarWashPenaltyFactory(amount=100)
+    other_car_wash = CarWashFactory()
+    url = reverse("economics:service-costs")
+    client = APIClient()
+
+    response = client.get(
+        url,
+        {
+            "car_wash_ids": [penalty.car_wash_id, other_car_wash.id],
+            "from_date": str(penalty.date),
+            "to_date": str(penalty.date),
+            "is_breakdown": "true",
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    response_data = response.json()
+    assert len(response_data["car_washes_revenue"]) == 1
+    car_washes = response_data["car_washes"]
+    assert [car_wash["car_wash_id"] for car_wash in car_washes] == [
+        penalty.car_wash_id,
+        other_car_wash.id,
+    ]
+    assert car_washes[0]["car_washes_revenue"][0]["penalties_amount"] == 100
+    assert car_washes[1]["car_washes_revenue"] == []
@@ -3,6 +3,7 @@ from django.urls import include, path
 from economics.views import (
     CarTransporterPenaltyListCreateApi,
     CarWashesRevenueApi,
+    ReportPeriodCloseApi,
     StaffShiftsStatisticsReportApi,
     CarTransporterSurchargeListCreateApi,
     CarWashPenaltyListCreateApi,
@@ -25,6 +26,11 @@ reports_urlpatterns = [
         StaffShiftsStatisticsReportApi.as_view(),
         name="staff-shifts-statistics",
     ),
+    path(
+        r"staff-shifts-statistics/close/",
+        ReportPeriodCloseApi.as_view(),
+        name="report-period-close",
+    ),
 ]
 
 app_name = "economics"
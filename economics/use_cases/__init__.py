@@ -8,4 +8,5 @@ from .car_transporter_surcharge_delete import (
     CarTransporterSurchargeDeleteUseCase,
 )
 from .car_transporter_surcharge_list import CarTransporterSurchargeListUseCase
+from .report_period_close import ReportPeriodCloseUseCase
 from .staff_shifts_statistics import StaffShiftsStatisticsUseCase
@@ -3,6 +3,7 @@ from collections import defaultdict
 from collections.abc import Iterable
 from dataclasses import dataclass
 
+from core.pagination import paginate_by_keyset
 from economics.models import CarTransporterPenalty, PenaltyPhoto
 
 
@@ -23,6 +24,7 @@ class PenaltiesPageItem:
 class PenaltiesPage:
     penalties: list[PenaltiesPageItem]
     is_end_of_list_reached: bool
+    next_cursor: str | None = None
 
 
 def map_penalties_to_page_items(
@@ -54,11 +56,11 @@ class CarTransporterPenaltyListUseCase:
     staff_ids: Iterable[int] | None = None
     limit: int
     offset: int
+    cursor: str | None = None
 
     def execute(self):
         penalties = (
             CarTransporterPenalty.objects.select_related("staff")
-            .order_by("-created_at")
             .only(
                 "id",
                 "staff__id",
@@ -72,18 +74,22 @@ class CarTransporterPenaltyListUseCase:
         )
         if self.staff_ids is not None:
             penalties = penalties.filter(staff_id__in=self.staff_ids)
-        penalties = penalties[self.offset: self.offset + self.limit + 1]
-
-        is_end_of_list_reached = len(penalties) <= self.limit
-        penalties = penalties[:self.limit]
+        page = paginate_by_keyset(
+            penalties,
+            ordering=("-created_at", "-id"),
+            limit=self.limit,
+            offset=self.offset,
+            cursor=self.cursor,
+        )
 
-        penalty_ids = [penalty.id for penalty in penalties]
+        penalty_ids = [penalty.id for penalty in page.items]
         photos = PenaltyPhoto.objects.filter(penalty_id__in=penalty_ids)
 
         return PenaltiesPage(
             penalties=map_penalties_to_page_items(
-                penalties=penalties,
+                penalties=page.items,
                 photos=photos,
             ),
-            is_end_of_list_reached=is_end_of_list_reached,
+            is_end_of_list_reached=page.is_end_of_list_reached,
+            next_cursor=page.next_cursor,
         )
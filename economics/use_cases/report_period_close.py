@@ -0,0 +1,69 @@
+import datetime
+from dataclasses import dataclass
+
+from django.db import transaction
+
+from core.services import get_current_shift_date
+from economics.exceptions import ReportPeriodNotFinishedError
+from economics.services.report_period_snapshots import (
+    save_report_period_snapshot,
+)
+from economics.use_cases.staff_shifts_statistics import (
+    StaffShiftsStatisticsUseCase,
+)
+from shifts.services.report_periods import (
+    get_report_period_by_number,
+    ReportPeriod,
+)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ReportPeriodCloseResult:
+    report_period: ReportPeriod
+    staff_count: int
+    closed_at: datetime.datetime
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ReportPeriodCloseUseCase:
+    """
+    Freeze staff shifts statistics of finished report period.
+
+    Closing already closed period recomputes its snapshot, so it is
+    also used to refresh stale snapshots.
+    """
+
+    year: int
+    month: int
+    report_period_number: int
+
+    @transaction.atomic
+    def execute(self) -> ReportPeriodCloseResult:
+        """
+        Raises:
+            ReportPeriodNotFinishedError: If report period has not ended yet.
+        """
+        period = get_report_period_by_number(
+            year=self.year,
+            month=self.month,
+            report_period_number=self.report_period_number,
+        )
+        if period.to_date >= get_current_shift_date():
+            raise ReportPeriodNotFinishedError(
+                year=self.year,
+                month=self.month,
+                report_period_number=self.report_period_number,
+            )
+
+        response = StaffShiftsStatisticsUseCase(
+            year=self.year,
+            month=self.month,
+            report_period_number=self.report_period_number,
+        ).compute(period)
+        snapshot = save_report_period_snapshot(response)
+
+        return ReportPeriodCloseResult(
+            report_period=period,
+            staff_count=len(response.staff_list),
+            closed_at=snapshot.closed_at,
+        )
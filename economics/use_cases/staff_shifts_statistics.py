@@ -9,13 +9,19 @@ from economics.selectors import (
     get_car_transporters_penalties_for_period,
     get_car_transporters_surcharges_for_period,
 )
+from economics.services.report_period_snapshots import (
+    get_report_period_snapshot_staff_list,
+)
 from economics.services.reports.staff_shifts_statistics import (
-    FineDepositCalculator, get_cars_to_wash_statistics,
+    FineDepositCalculator, get_cars_to_wash_statistics_from_rollups,
     group_shifts_statistics_by_staff,
-    merge_shifts_statistics_and_penalties_and_surcharges,
+    merge_staff_list_shifts_statistics_and_penalties_and_surcharges,
     RoadAccidentDepositCalculator, StaffShiftsStatisticsResponse,
 )
-from shifts.services.report_periods import get_report_period_by_number
+from shifts.services.report_periods import (
+    get_report_period_by_number,
+    ReportPeriod,
+)
 from staff.selectors import get_staff
 
 
@@ -32,6 +38,23 @@ class StaffShiftsStatisticsUseCase:
             month=self.month,
             report_period_number=self.report_period_number,
         )
+        snapshot_staff_list = get_report_period_snapshot_staff_list(period)
+        if snapshot_staff_list is None:
+            return self.compute(period)
+
+        if self.staff_ids is not None:
+            staff_ids = set(self.staff_ids)
+            snapshot_staff_list = [
+                staff for staff in snapshot_staff_list
+                if staff.staff.id in staff_ids
+            ]
+        return StaffShiftsStatisticsResponse(
+            staff_list=snapshot_staff_list,
+            report_period=period,
+        )
+
+    def compute(self, period: ReportPeriod) -> StaffShiftsStatisticsResponse:
+        """Compute report from scratch, ignoring closed period snapshot."""
         staff_list = get_staff(staff_ids=self.staff_ids)
         penalties = get_car_transporters_penalties_for_period(
             staff_ids=self.staff_ids,
@@ -43,7 +66,7 @@ class StaffShiftsStatisticsUseCase:
             from_date=period.from_date,
             to_date=period.to_date,
         )
-        shifts_statistics = get_cars_to_wash_statistics(
+        shifts_statistics = get_cars_to_wash_statistics_from_rollups(
             staff_ids=self.staff_ids,
             from_date=period.from_date,
             to_date=period.to_date,
@@ -77,17 +100,16 @@ class StaffShiftsStatisticsUseCase:
             excluded_staff_ids=staff_ids_excluded_from_road_accident_deposit,
         )
 
-        staff_statistics = [
-            merge_shifts_statistics_and_penalties_and_surcharges(
-                staff=staff,
+        staff_statistics = (
+            merge_staff_list_shifts_statistics_and_penalties_and_surcharges(
+                staff_list=staff_list,
                 penalties=penalties,
                 surcharges=surcharges,
                 staff_shifts_statistics=staff_shifts_statistics,
                 fine_deposit_calculator=fine_deposit_calculator,
                 road_accident_deposit_calculator=road_accident_deposit_calculator,
             )
-            for staff in staff_list
-        ]
+        )
         return StaffShiftsStatisticsResponse(
             staff_list=staff_statistics,
             report_period=period,
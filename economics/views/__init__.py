@@ -10,7 +10,11 @@ from .car_washes import (
     CarWashSurchargeDeleteApi,
     CarWashSurchargeListCreateApi,
 )
-from .reports import CarWashesRevenueApi, StaffShiftsStatisticsReportApi
+from .reports import (
+    CarWashesRevenueApi,
+    ReportPeriodCloseApi,
+    StaffShiftsStatisticsReportApi,
+)
 
 
 __all__ = (
@@ -24,4 +28,5 @@ __all__ = (
     "CarTransporterSurchargeListCreateApi",
     "CarWashesRevenueApi",
     "StaffShiftsStatisticsReportApi",
+    "ReportPeriodCloseApi",
 )
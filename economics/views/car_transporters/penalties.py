@@ -28,11 +28,13 @@ class CarTransporterPenaltyListCreateApi(APIView):
         staff_ids: list[int] | None = serialized_data["staff_ids"]
         limit: int = serialized_data["limit"]
         offset: int = serialized_data["offset"]
+        cursor: str | None = serialized_data["cursor"]
 
         penalties_page = CarTransporterPenaltyListUseCase(
             staff_ids=staff_ids,
             limit=limit,
             offset=offset,
+            cursor=cursor,
         ).execute()
 
         serializer = PenaltyListOutputSerializer(penalties_page)
@@ -1,5 +1,10 @@
 from .car_washes_revenue import CarWashesRevenueApi
+from .report_period_close import ReportPeriodCloseApi
 from .staff_shifts_statistics import StaffShiftsStatisticsReportApi
 
 
-__all__ = ("StaffShiftsStatisticsReportApi", "CarWashesRevenueApi")
+__all__ = (
+    "StaffShiftsStatisticsReportApi",
+    "CarWashesRevenueApi",
+    "ReportPeriodCloseApi",
+)
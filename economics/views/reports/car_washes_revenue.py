@@ -8,7 +8,9 @@ from economics.serializers import (
     CarWashesRevenueReportOutputSerializer,
     CarWashesRevenueReportInputSerializer,
 )
-from economics.services.reports import get_car_washes_sales_report
+from economics.services.reports import (
+    get_car_washes_sales_report_aggregated,
+)
 
 __all__ = ("CarWashesRevenueApi",)
 
@@ -22,13 +24,14 @@ class CarWashesRevenueApi(APIView):
         from_date: datetime.date = serialized_data["from_date"]
         to_date: datetime.date = serialized_data["to_date"]
         car_wash_ids: list[int] = serialized_data["car_wash_ids"]
+        is_breakdown: bool = serialized_data["is_breakdown"]
 
-        report = get_car_washes_sales_report(
+        report = get_car_washes_sales_report_aggregated(
             car_wash_ids=car_wash_ids,
             from_date=from_date,
             to_date=to_date,
+            is_breakdown=is_breakdown,
         )
-        response_data = {"car_washes_revenue": report}
-        serializer = CarWashesRevenueReportOutputSerializer(response_data)
+        serializer = CarWashesRevenueReportOutputSerializer(report)
 
         return Response(serializer.data)
@@ -0,0 +1,30 @@
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from economics.serializers import (
+    ReportPeriodCloseInputSerializer,
+    ReportPeriodCloseOutputSerializer,
+)
+from economics.use_cases import ReportPeriodCloseUseCase
+
+
+__all__ = ("ReportPeriodCloseApi",)
+
+
+class ReportPeriodCloseApi(APIView):
+
+    def post(self, request: Request) -> Response:
+        serializer = ReportPeriodCloseInputSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serialized_data: dict = serializer.validated_data
+
+        result = ReportPeriodCloseUseCase(
+            year=serialized_data["year"],
+            month=serialized_data["month"],
+            report_period_number=serialized_data["report_period_number"],
+        ).execute()
+
+        serializer = ReportPeriodCloseOutputSerializer(result)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -9,7 +9,25 @@ class PhotoNotProvidedError(APIException):
     default_detail = _("Photo not provided")
 
 
+class PhotoInvalidError(APIException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_code = "photo_invalid"
+    default_detail = _("Photo is not a valid image")
+
+
+class PhotoTooLargeError(APIException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_code = "photo_too_large"
+    default_detail = _("Photo is too large")
+
+
 class PhotoNotUploadedError(APIException):
     status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
     default_code = "photo_not_uploaded"
     default_detail = _("Photo not uploaded")
+
+
+class PhotoNotProcessedError(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_code = "photo_not_processed"
+    default_detail = _("Photo could not be processed, try again later")
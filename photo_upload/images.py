@@ -0,0 +1,99 @@
+"""
+CPU-bound image processing.
+
+The module does not depend on Django, so its functions can be run in
+worker processes of `ProcessPoolExecutor`.
+"""
+import io
+from dataclasses import dataclass
+
+from PIL import Image, ImageOps
+
+
+__all__ = (
+    "NormalizedImage",
+    "normalize_image",
+    "DownscaledImage",
+    "downscale_image",
+)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class NormalizedImage:
+    content: bytes
+    thumbnail_content: bytes
+
+
+def encode_jpeg(image: Image.Image, max_size: int, quality: int) -> bytes:
+    image = image.copy()
+    image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+    with io.BytesIO() as file_io:
+        # Metadata is not saved unless it is passed explicitly.
+        image.save(file_io, format="JPEG", quality=quality, optimize=True)
+        return file_io.getvalue()
+
+
+def normalize_image(
+        content: bytes,
+        *,
+        max_size: int,
+        quality: int,
+        thumbnail_max_size: int,
+        thumbnail_quality: int,
+) -> NormalizedImage:
+    """
+    Re-encode image to JPEG without metadata and make its thumbnail.
+
+    Image is rotated according to its EXIF orientation before EXIF is
+    dropped, and downscaled to fit into square of `max_size` pixels.
+
+    Raises:
+        PIL.UnidentifiedImageError: content is not an image.
+    """
+    with Image.open(io.BytesIO(content)) as image:
+        image = ImageOps.exif_transpose(image).convert("RGB")
+    return NormalizedImage(
+        content=encode_jpeg(image, max_size, quality),
+        thumbnail_content=encode_jpeg(
+            image,
+            thumbnail_max_size,
+            thumbnail_quality,
+        ),
+    )
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class DownscaledImage:
+    content: bytes
+    width: int
+    height: int
+
+
+def downscale_image(
+        content: bytes | str,
+        *,
+        max_size: int,
+        quality: int,
+) -> DownscaledImage:
+    """
+    Re-encode image to JPEG fitting into square of `max_size` pixels.
+
+    Args:
+        content: image content or path of image file. Large images are
+            better passed by path, so they are not copied to the worker.
+
+    Raises:
+        PIL.UnidentifiedImageError: content is not an image.
+    """
+    if isinstance(content, bytes):
+        content = io.BytesIO(content)
+    with Image.open(content) as image:
+        # Let JPEG decoder skip pixels which are thrown away anyway.
+        image.draft("RGB", (max_size, max_size))
+        image = ImageOps.exif_transpose(image).convert("RGB")
+    image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+    return DownscaledImage(
+        content=encode_jpeg(image, max_size, quality),
+        width=image.width,
+        height=image.height,
+    )
@@ -1,17 +1,32 @@
 import functools
 import io
-from collections.abc import Iterable
-from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+import tempfile
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
-from typing import BinaryIO
+from typing import BinaryIO, TypeVar
 from uuid import uuid4
 
 import httpx
 from django.conf import settings
 from django.core.files.uploadedfile import InMemoryUploadedFile
 from minio import Minio
+from PIL import Image, UnidentifiedImageError
 
-from photo_upload.exceptions import PhotoNotUploadedError
+from photo_upload.exceptions import (
+    PhotoInvalidError,
+    PhotoNotProcessedError,
+    PhotoNotUploadedError,
+    PhotoTooLargeError,
+)
+from photo_upload.images import (
+    downscale_image,
+    normalize_image,
+    NormalizedImage,
+)
 
 
 def get_s3_client() -> Minio:
@@ -26,23 +41,77 @@ def get_s3_client() -> Minio:
 class UploadedFile:
     object_name: str
     url: str
+    size: int | None = None
 
 
-def upload_binary(
-    file_io: BinaryIO,
+@dataclass(frozen=True, slots=True, kw_only=True)
+class UploadedImage:
+    object_name: str
+    url: str
+    thumbnail_url: str
+    size: int | None = None
+
+
+# MinIO minimum multipart part size.
+STREAM_PART_SIZE = 5 * 1024 * 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class ResponseBodyReader:
+    """
+    Read-only file-like wrapper of streamed httpx response body.
+
+    Only `size` bytes requested by the reader are buffered, so the whole
+    body is never held in memory.
+    """
+
+    def __init__(
+            self,
+            response: httpx.Response,
+            chunk_size: int = STREAM_CHUNK_SIZE,
+    ):
+        self.__chunks = response.iter_bytes(chunk_size)
+        self.__rest = b""
+        self.read_bytes_count = 0
+
+    def read(self, size: int = -1) -> bytes:
+        parts = [self.__rest]
+        parts_size = len(self.__rest)
+        while size < 0 or parts_size < size:
+            chunk = next(self.__chunks, None)
+            if chunk is None:
+                break
+            parts.append(chunk)
+            parts_size += len(chunk)
+
+        self.__rest = b""
+        if 0 <= size < parts_size:
+            last_part = parts[-1]
+            last_part_size = len(last_part) - (parts_size - size)
+            parts[-1] = last_part[:last_part_size]
+            self.__rest = last_part[last_part_size:]
+        data = b"".join(parts)
+        self.read_bytes_count += len(data)
+        return data
+
+
+def put_object(
+    data: BinaryIO | ResponseBodyReader,
     length: int,
     content_type: str,
     object_name: str,
     client: Minio,
+    part_size: int = 0,
 ) -> UploadedFile:
-    file_io.seek(0)
     try:
         result = client.put_object(
             bucket_name=settings.S3_BUCKET_NAME,
             object_name=object_name,
-            data=file_io,
+            data=data,
             length=length,
             content_type=content_type,
+            part_size=part_size,
+            num_parallel_uploads=1,
         )
     except Exception as error:
         raise PhotoNotUploadedError from error
@@ -52,6 +121,28 @@ def upload_binary(
     )
 
 
+def upload_binary(
+    file_io: BinaryIO,
+    length: int,
+    content_type: str,
+    object_name: str,
+    client: Minio,
+) -> UploadedFile:
+    file_io.seek(0)
+    uploaded_file = put_object(
+        data=file_io,
+        length=length,
+        content_type=content_type,
+        object_name=object_name,
+        client=client,
+    )
+    return UploadedFile(
+        object_name=uploaded_file.object_name,
+        url=uploaded_file.url,
+        size=length,
+    )
+
+
 def upload_in_memory_file(
     file: BinaryIO | InMemoryUploadedFile,
     folder: str | None = None,
@@ -74,26 +165,53 @@ def build_object_name(name: str, folder: str | None = None) -> str:
     return object_name
 
 
+def get_response_body_length(response: httpx.Response) -> int:
+    """
+    Get decoded body length of response.
+
+    Returns:
+        Length or -1 if it is unknown before the body is read.
+    """
+    if "Content-Encoding" in response.headers:
+        return -1
+    try:
+        return int(response.headers["Content-Length"])
+    except (KeyError, ValueError):
+        return -1
+
+
 def upload_via_url(
     url: str,
     folder: str | None = None,
     client: Minio | None = None,
 ) -> UploadedFile:
+    """
+    Stream file from URL to S3.
+
+    The body is read in parts of `STREAM_PART_SIZE` bytes, which are
+    uploaded one by one, so memory usage does not depend on file size.
+    """
     if client is None:
         client = get_s3_client()
-    response = httpx.get(url)
-    response.raise_for_status()
     object_name = build_object_name(url, folder)
-    with io.BytesIO(response.content) as file_io:
-        return upload_binary(
-            file_io=file_io,
-            length=len(response.content),
+    with httpx.stream("GET", url) as response:
+        response.raise_for_status()
+        reader = ResponseBodyReader(response)
+        uploaded_file = put_object(
+            data=reader,
+            length=get_response_body_length(response),
             content_type=response.headers.get(
                 "Content-Type", "application/octet-stream"
             ),
             object_name=object_name,
             client=client,
+            part_size=STREAM_PART_SIZE,
         )
+    return UploadedFile(
+        object_name=uploaded_file.object_name,
+        url=uploaded_file.url,
+        size=reader.read_bytes_count,
+    )
 
 
 def upload_via_urls(
@@ -111,3 +229,265 @@ def upload_via_urls(
 
 def get_public_url(object_name: str) -> str:
     return f"https://{settings.S3_ENDPOINT}/{settings.S3_BUCKET_NAME}/" f"{object_name}"
+
+
+THUMBNAIL_SUFFIX = "_thumbnail"
+
+
+def get_thumbnail_object_name(object_name: str) -> str:
+    """Thumbnail is stored next to the original with suffix in name."""
+    stem, dot, ext = object_name.rpartition(".")
+    if not dot or "/" in ext:
+        return f"{object_name}{THUMBNAIL_SUFFIX}"
+    return f"{stem}{THUMBNAIL_SUFFIX}.{ext}"
+
+
+@functools.cache
+def get_image_processing_pool() -> ProcessPoolExecutor:
+    # Workers are spawned, not forked, to not inherit threads and
+    # database connections of the web worker.
+    return ProcessPoolExecutor(
+        max_workers=settings.PHOTO_PROCESSING_MAX_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+image_processing_pool_lock = threading.Lock()
+
+
+def drop_image_processing_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Drop broken pool, so the next call makes a new one.
+
+    The pool is dropped only if it is still the cached one, since
+    another thread may have already replaced it.
+    """
+    with image_processing_pool_lock:
+        is_cached = get_image_processing_pool.cache_info().currsize > 0
+        if is_cached and get_image_processing_pool() is pool:
+            get_image_processing_pool.cache_clear()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+T = TypeVar("T")
+
+
+def submit_image_processing(
+        pool: ProcessPoolExecutor,
+        function: Callable[..., T],
+        /,
+        *args,
+        **kwargs,
+) -> Future[T]:
+    """
+    Submit image processing function to the process pool.
+
+    Raises:
+        BrokenProcessPool: worker of the pool has died.
+        PhotoNotProcessedError: pool is shut down.
+    """
+    try:
+        return pool.submit(function, *args, **kwargs)
+    # Checked before RuntimeError, which BrokenProcessPool is a subclass of.
+    except BrokenProcessPool:
+        raise
+    except RuntimeError as error:
+        raise PhotoNotProcessedError from error
+
+
+def run_image_processing(function: Callable[..., T], /, *args, **kwargs) -> T:
+    """
+    Run image processing function in the process pool.
+
+    Once a worker dies (e.g. it is killed for running out of memory),
+    the pool is broken for good, so it is replaced with a new one.
+
+    Raises:
+        PhotoInvalidError: content is not an image or is too large.
+        PhotoNotProcessedError: processing timed out or its worker died.
+    """
+    pool = get_image_processing_pool()
+    try:
+        try:
+            future = submit_image_processing(pool, function, *args, **kwargs)
+        except PhotoNotProcessedError:
+            # Another thread has dropped the pool as broken since it was
+            # got, so the cached pool is a new one by now.
+            pool = get_image_processing_pool()
+            future = submit_image_processing(pool, function, *args, **kwargs)
+        return future.result(timeout=settings.PHOTO_PROCESSING_TIMEOUT)
+    except BrokenProcessPool as error:
+        drop_image_processing_pool(pool)
+        raise PhotoNotProcessedError from error
+    # Checked before OSError, which TimeoutError is a subclass of.
+    except TimeoutError as error:
+        future.cancel()
+        raise PhotoNotProcessedError from error
+    except (
+        UnidentifiedImageError,
+        Image.DecompressionBombError,
+        OSError,
+    ) as error:
+        raise PhotoInvalidError from error
+
+
+def process_image(content: bytes) -> NormalizedImage:
+    """
+    Normalize image in the process pool.
+
+    Raises:
+        PhotoInvalidError: content is not an image or is too large.
+        PhotoNotProcessedError: processing timed out or its worker died.
+    """
+    return run_image_processing(
+        normalize_image,
+        content,
+        max_size=settings.PHOTO_MAX_SIZE,
+        quality=settings.PHOTO_QUALITY,
+        thumbnail_max_size=settings.PHOTO_THUMBNAIL_MAX_SIZE,
+        thumbnail_quality=settings.PHOTO_THUMBNAIL_QUALITY,
+    )
+
+
+def make_thumbnail(content: bytes | str) -> bytes:
+    """
+    Make JPEG thumbnail of image in the process pool.
+
+    Args:
+        content: image content or path of image file.
+
+    Raises:
+        PhotoInvalidError: content is not an image or is too large.
+        PhotoNotProcessedError: processing timed out or its worker died.
+    """
+    return run_image_processing(
+        downscale_image,
+        content,
+        max_size=settings.PHOTO_THUMBNAIL_MAX_SIZE,
+        quality=settings.PHOTO_THUMBNAIL_QUALITY,
+    ).content
+
+
+def download_file(
+    url: str,
+    file_io: BinaryIO,
+    *,
+    max_size: int,
+    timeout: float,
+) -> str:
+    """
+    Stream file from URL to file-like object.
+
+    Returns:
+        Content type of the file.
+
+    Raises:
+        PhotoTooLargeError: file is larger than `max_size` bytes.
+    """
+    with httpx.stream("GET", url, timeout=timeout) as response:
+        response.raise_for_status()
+        if get_response_body_length(response) > max_size:
+            raise PhotoTooLargeError
+        size = 0
+        for chunk in response.iter_bytes(STREAM_CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_size:
+                raise PhotoTooLargeError
+            file_io.write(chunk)
+        return response.headers.get(
+            "Content-Type",
+            "application/octet-stream",
+        )
+
+
+def upload_image_via_url(
+    url: str,
+    folder: str | None = None,
+    client: Minio | None = None,
+) -> UploadedImage:
+    """
+    Upload image from URL as is, together with its thumbnail.
+
+    The body is streamed to a temporary file of at most
+    `PHOTO_DOWNLOAD_MAX_SIZE` bytes (Telegram serves files up to 20 MB
+    to bots), which the thumbnail is made of and which is uploaded
+    then, so the image is never held in memory.
+
+    Raises:
+        PhotoTooLargeError: image is larger than `PHOTO_DOWNLOAD_MAX_SIZE`.
+        PhotoInvalidError: content is not an image or is too large.
+        PhotoNotProcessedError: processing timed out or its worker died.
+    """
+    if client is None:
+        client = get_s3_client()
+    object_name = build_object_name(url, folder)
+    with tempfile.NamedTemporaryFile() as file_io:
+        content_type = download_file(
+            url,
+            file_io,
+            max_size=settings.PHOTO_DOWNLOAD_MAX_SIZE,
+            timeout=settings.PHOTO_DOWNLOAD_TIMEOUT,
+        )
+        file_io.flush()
+        length = file_io.tell()
+        thumbnail_content = make_thumbnail(file_io.name)
+        uploaded_file = upload_binary(
+            file_io=file_io,
+            length=length,
+            content_type=content_type,
+            object_name=object_name,
+            client=client,
+        )
+    with io.BytesIO(thumbnail_content) as thumbnail_io:
+        uploaded_thumbnail = upload_binary(
+            file_io=thumbnail_io,
+            length=len(thumbnail_content),
+            content_type="image/jpeg",
+            object_name=get_thumbnail_object_name(object_name),
+            client=client,
+        )
+    return UploadedImage(
+        object_name=uploaded_file.object_name,
+        url=uploaded_file.url,
+        thumbnail_url=uploaded_thumbnail.url,
+        size=uploaded_file.size,
+    )
+
+
+def upload_image(
+    file: BinaryIO | InMemoryUploadedFile,
+    folder: str | None = None,
+) -> UploadedImage:
+    """
+    Upload normalized image and its thumbnail.
+
+    The image is stored as JPEG without EXIF metadata, downscaled to
+    `PHOTO_MAX_SIZE`. Its thumbnail is stored next to it, see
+    `get_thumbnail_object_name`.
+    """
+    file.seek(0)
+    image = process_image(file.read())
+    object_name = build_object_name(f"{file.name}.jpg", folder)
+    client = get_s3_client()
+
+    uploaded_files = []
+    for name, content in (
+        (object_name, image.content),
+        (get_thumbnail_object_name(object_name), image.thumbnail_content),
+    ):
+        with io.BytesIO(content) as file_io:
+            uploaded_files.append(
+                upload_binary(
+                    file_io=file_io,
+                    length=len(content),
+                    content_type="image/jpeg",
+                    object_name=name,
+                    client=client,
+                )
+            )
+    uploaded_file, uploaded_thumbnail = uploaded_files
+    return UploadedImage(
+        object_name=uploaded_file.object_name,
+        url=uploaded_file.url,
+        thumbnail_url=uploaded_thumbnail.url,
+    )
@@ -0,0 +1,76 @@
+import io
+
+import pytest
+from PIL import Image, UnidentifiedImageError
+
+from photo_upload.images import normalize_image
+
+
+EXIF_ORIENTATION_TAG = 0x0112
+EXIF_MAKE_TAG = 0x010F
+
+
+def make_photo(width: int, height: int, orientation: int = 1) -> bytes:
+    image = Image.new("RGB", (width, height), color=(200, 10, 10))
+    exif = Image.Exif()
+    exif[EXIF_ORIENTATION_TAG] = orientation
+    exif[EXIF_MAKE_TAG] = "Camera"
+    with io.BytesIO() as file_io:
+        image.save(file_io, format="JPEG", exif=exif)
+        return file_io.getvalue()
+
+
+def open_image(content: bytes) -> Image.Image:
+    image = Image.open(io.BytesIO(content))
+    image.load()
+    return image
+
+
+def test_normalize_image():
+    result = normalize_image(
+        # Orientation 6 means the photo must be rotated by 90 degrees.
+        make_photo(4000, 3000, orientation=6),
+        max_size=2048,
+        quality=85,
+        thumbnail_max_size=320,
+        thumbnail_quality=70,
+    )
+
+    image = open_image(result.content)
+    assert image.format == "JPEG"
+    assert image.size == (1536, 2048)
+    assert not image.getexif()
+
+    thumbnail = open_image(result.thumbnail_content)
+    assert thumbnail.format == "JPEG"
+    assert thumbnail.size == (240, 320)
+    assert not thumbnail.getexif()
+
+
+def test_normalize_small_png_image():
+    image = Image.new("RGBA", (100, 50))
+    with io.BytesIO() as file_io:
+        image.save(file_io, format="PNG")
+        content = file_io.getvalue()
+
+    result = normalize_image(
+        content,
+        max_size=2048,
+        quality=85,
+        thumbnail_max_size=320,
+        thumbnail_quality=70,
+    )
+
+    assert open_image(result.content).size == (100, 50)
+    assert open_image(result.thumbnail_content).size == (100, 50)
+
+
+def test_normalize_not_image():
+    with pytest.raises(UnidentifiedImageError):
+        normalize_image(
+            b"not an image",
+            max_size=2048,
+            quality=85,
+            thumbnail_max_size=320,
+            thumbnail_quality=70,
+        )
@@ -0,0 +1,93 @@
+import io
+import os
+import struct
+import time
+import zlib
+
+import pytest
+from PIL import Image
+
+from photo_upload import services
+from photo_upload.exceptions import PhotoInvalidError, PhotoNotProcessedError
+from photo_upload.services import (
+    drop_image_processing_pool,
+    get_image_processing_pool,
+    process_image,
+    run_image_processing,
+)
+
+
+def kill_worker() -> None:
+    os._exit(1)
+
+
+def sleep(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+def make_png(width: int, height: int) -> bytes:
+    with io.BytesIO() as file_io:
+        Image.new("RGB", (width, height)).save(file_io, format="PNG")
+        return file_io.getvalue()
+
+
+def make_decompression_bomb() -> bytes:
+    """PNG which declares 20000x20000 pixels in its header."""
+    content = make_png(1, 1)
+    # Signature is followed by IHDR chunk: length, type, data and CRC.
+    ihdr_data_start = 8 + 4 + 4
+    ihdr_data = (
+        struct.pack(">II", 20_000, 20_000)
+        + content[ihdr_data_start + 8:ihdr_data_start + 13]
+    )
+    crc = struct.pack(">I", zlib.crc32(b"IHDR" + ihdr_data))
+    return (
+        content[:ihdr_data_start]
+        + ihdr_data
+        + crc
+        + content[ihdr_data_start + 13 + 4:]
+    )
+
+
+def test_broken_pool_is_replaced():
+    pool = get_image_processing_pool()
+
+    with pytest.raises(PhotoNotProcessedError):
+        run_image_processing(kill_worker)
+
+    assert get_image_processing_pool() is not pool
+    assert process_image(make_png(10, 10)).thumbnail_content
+
+
+def test_pool_dropped_by_other_thread_is_replaced(monkeypatch):
+    dropped_pool = get_image_processing_pool()
+    drop_image_processing_pool(dropped_pool)
+    pools = iter([dropped_pool, get_image_processing_pool()])
+    monkeypatch.setattr(
+        services,
+        "get_image_processing_pool",
+        lambda: next(pools),
+    )
+
+    assert run_image_processing(sleep, 0) is None
+
+
+def test_shut_down_pool_is_not_processed(monkeypatch):
+    pool = get_image_processing_pool()
+    drop_image_processing_pool(pool)
+    monkeypatch.setattr(services, "get_image_processing_pool", lambda: pool)
+
+    with pytest.raises(PhotoNotProcessedError):
+        run_image_processing(sleep, 0)
+
+
+def test_processing_timeout(settings):
+    settings.PHOTO_PROCESSING_TIMEOUT = 0.1
+
+    with pytest.raises(PhotoNotProcessedError):
+        run_image_processing(sleep, 1)
+
+
+def test_decompression_bomb_is_invalid_photo():
+    with pytest.raises(PhotoInvalidError):
+        process_image(make_decompression_bomb())
@@ -0,0 +1,207 @@
+import hashlib
+import io
+import threading
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PIL import Image
+
+from photo_upload.exceptions import PhotoInvalidError, PhotoTooLargeError
+from photo_upload.services import (
+    STREAM_PART_SIZE,
+    upload_image_via_url,
+    upload_via_url,
+)
+
+
+PAYLOAD_BLOCK = bytes(range(256)) * 256
+PAYLOAD_BLOCKS_COUNT = 1024
+
+
+def get_payload_hash() -> str:
+    payload_hash = hashlib.sha256()
+    for _ in range(PAYLOAD_BLOCKS_COUNT):
+        payload_hash.update(PAYLOAD_BLOCK)
+    return payload_hash.hexdigest()
+
+
+class LargePayloadHandler(BaseHTTPRequestHandler):
+    """Serve large payload without holding it in memory."""
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        if self.path != "/chunked.jpg":
+            self.send_header(
+                "Content-Length",
+                str(len(PAYLOAD_BLOCK) * PAYLOAD_BLOCKS_COUNT),
+            )
+        self.end_headers()
+        for _ in range(PAYLOAD_BLOCKS_COUNT):
+            self.wfile.write(PAYLOAD_BLOCK)
+
+
+class FakeS3Client:
+    """Consume uploaded data part by part like MinIO client does."""
+
+    def __init__(self):
+        self.sha256 = hashlib.sha256()
+        self.length: int | None = None
+        self.content_type: str | None = None
+        self.part_sizes: list[int] = []
+
+    def put_object(self, **kwargs):
+        self.length = kwargs["length"]
+        self.content_type = kwargs["content_type"]
+        part_size = kwargs["part_size"]
+        while part := kwargs["data"].read(part_size):
+            self.part_sizes.append(len(part))
+            self.sha256.update(part)
+
+        class Result:
+            object_name = kwargs["object_name"]
+
+        return Result
+
+
+class PhotoHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        if self.path == "/photo.png":
+            with io.BytesIO() as file_io:
+                Image.new("RGB", (1000, 500)).save(file_io, format="PNG")
+                content = file_io.getvalue()
+        else:
+            content = b"not an image"
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class FakeObjectsS3Client:
+
+    def __init__(self):
+        self.object_name_to_content: dict[str, bytes] = {}
+
+    def put_object(self, **kwargs):
+        self.object_name_to_content[kwargs["object_name"]] = (
+            kwargs["data"].read(kwargs["length"])
+        )
+
+        class Result:
+            object_name = kwargs["object_name"]
+
+        return Result
+
+
+def run_server(handler_class: type[BaseHTTPRequestHandler]):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    yield f"http://{host}:{port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def payload_server_url():
+    yield from run_server(LargePayloadHandler)
+
+
+@pytest.fixture
+def photo_server_url():
+    yield from run_server(PhotoHandler)
+
+
+@pytest.mark.parametrize(
+    "path, expected_length",
+    [
+        ("/photo.jpg", len(PAYLOAD_BLOCK) * PAYLOAD_BLOCKS_COUNT),
+        ("/chunked.jpg", -1),
+    ],
+)
+def test_upload_via_url_streams_body(
+        payload_server_url,
+        path,
+        expected_length,
+):
+    client = FakeS3Client()
+
+    tracemalloc.start()
+    try:
+        uploaded_file = upload_via_url(
+            f"{payload_server_url}{path}",
+            folder="photos",
+            client=client,
+        )
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert uploaded_file.object_name.startswith("photos/")
+    assert uploaded_file.size == len(PAYLOAD_BLOCK) * PAYLOAD_BLOCKS_COUNT
+    assert uploaded_file.object_name.endswith(".jpg")
+    assert client.sha256.hexdigest() == get_payload_hash()
+    assert client.length == expected_length
+    assert client.content_type == "image/jpeg"
+    assert max(client.part_sizes) == STREAM_PART_SIZE
+    # 64 MiB payload is uploaded with a few parts in memory at most.
+    assert peak_memory < 4 * STREAM_PART_SIZE
+
+
+def test_upload_image_via_url_uploads_thumbnail(photo_server_url, settings):
+    settings.S3_ENDPOINT = "s3.example.com"
+    settings.S3_BUCKET_NAME = "photos"
+    client = FakeObjectsS3Client()
+
+    uploaded_image = upload_image_via_url(
+        f"{photo_server_url}/photo.png",
+        folder="shift_finish_photos",
+        client=client,
+    )
+
+    thumbnail_object_name = uploaded_image.object_name.replace(
+        ".png",
+        "_thumbnail.png",
+    )
+    assert uploaded_image.thumbnail_url == (
+        f"https://s3.example.com/photos/{thumbnail_object_name}"
+    )
+    content = client.object_name_to_content[uploaded_image.object_name]
+    assert uploaded_image.size == len(content)
+    assert Image.open(io.BytesIO(content)).format == "PNG"
+    thumbnail = Image.open(
+        io.BytesIO(client.object_name_to_content[thumbnail_object_name]),
+    )
+    assert thumbnail.format == "JPEG"
+    assert thumbnail.size == (320, 160)
+
+
+def test_upload_image_via_url_not_image(photo_server_url):
+    client = FakeObjectsS3Client()
+
+    with pytest.raises(PhotoInvalidError):
+        upload_image_via_url(f"{photo_server_url}/file.txt", client=client)
+
+    assert not client.object_name_to_content
+
+
+@pytest.mark.parametrize("path", ["/photo.jpg", "/chunked.jpg"])
+def test_upload_image_via_url_too_large(payload_server_url, settings, path):
+    settings.PHOTO_DOWNLOAD_MAX_SIZE = len(PAYLOAD_BLOCK)
+    client = FakeObjectsS3Client()
+
+    with pytest.raises(PhotoTooLargeError):
+        upload_image_via_url(f"{payload_server_url}{path}", client=client)
+
+    assert not client.object_name_to_content
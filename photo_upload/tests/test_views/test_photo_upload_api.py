@@ -0,0 +1,84 @@
+import io
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from photo_upload import services
+
+
+class FakeS3Client:
+
+    def __init__(self):
+        self.object_name_to_content: dict[str, bytes] = {}
+
+    def put_object(self, **kwargs):
+        self.object_name_to_content[kwargs["object_name"]] = (
+            kwargs["data"].read(kwargs["length"])
+        )
+
+        class Result:
+            object_name = kwargs["object_name"]
+
+        return Result
+
+
+@pytest.fixture
+def s3_client(monkeypatch, settings):
+    settings.S3_ENDPOINT = "s3.example.com"
+    settings.S3_BUCKET_NAME = "photos"
+    client = FakeS3Client()
+    monkeypatch.setattr(services, "get_s3_client", lambda: client)
+    return client
+
+
+def make_photo_file(name: str = "photo.png") -> SimpleUploadedFile:
+    with io.BytesIO() as file_io:
+        Image.new("RGB", (3000, 1000)).save(file_io, format="PNG")
+        content = file_io.getvalue()
+    return SimpleUploadedFile(name, content, content_type="image/png")
+
+
+def test_upload_photo(s3_client):
+    response = APIClient().post(
+        reverse("photo_upload"),
+        data={"photo": make_photo_file(), "folder": "shifts"},
+        format="multipart",
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    response_data = response.json()
+    object_name = response_data["object_name"]
+    assert object_name.startswith("shifts/")
+    assert object_name.endswith(".jpg")
+    assert response_data["url"] == (
+        f"https://s3.example.com/photos/{object_name}"
+    )
+    thumbnail_object_name = object_name.replace(".jpg", "_thumbnail.jpg")
+    assert response_data["thumbnail_url"] == (
+        f"https://s3.example.com/photos/{thumbnail_object_name}"
+    )
+
+    image = Image.open(io.BytesIO(s3_client.object_name_to_content[object_name]))
+    assert image.format == "JPEG"
+    assert image.size == (2048, 683)
+    thumbnail = Image.open(
+        io.BytesIO(s3_client.object_name_to_content[thumbnail_object_name]),
+    )
+    assert thumbnail.size == (320, 107)
+
+
+def test_upload_not_image(s3_client):
+    response = APIClient().post(
+        reverse("photo_upload"),
+        data={
+            "photo": SimpleUploadedFile("photo.jpg", b"not an image"),
+        },
+        format="multipart",
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert not s3_client.object_name_to_content
@@ -7,7 +7,7 @@ from rest_framework.views import APIView
 from photo_upload.exceptions import (
     PhotoNotProvidedError,
 )
-from photo_upload.services import upload_in_memory_file
+from photo_upload.services import upload_image
 
 
 class PhotoUploadApi(APIView):
@@ -21,7 +21,11 @@ class PhotoUploadApi(APIView):
 
         folder = request.data.get("folder")
 
-        result = upload_in_memory_file(file, folder=folder)
+        result = upload_image(file, folder=folder)
 
-        response_data = {"object_name": result.object_name, "url": result.url}
+        response_data = {
+            "object_name": result.object_name,
+            "url": result.url,
+            "thumbnail_url": result.thumbnail_url,
+        }
         return Response(response_data, status.HTTP_201_CREATED)
@@ -1,21 +1,18 @@
-import io
-import zipfile
-from collections import defaultdict
-
-import httpx
-import openpyxl
 from django.contrib import admin
 from django.db.models import QuerySet
 from django.http.request import HttpRequest
-from django.http.response import HttpResponse
+from django.http.response import FileResponse, StreamingHttpResponse
+from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 from import_export import resources
 from import_export.admin import ImportExportModelAdmin
-from openpyxl.drawing.image import Image as OpenPyxlImage, PILImage
-from openpyxl.utils.cell import get_column_letter
 
 from shifts.mixins import ShiftModelStaffSelectRelatedMixin
 from shifts.models import Shift, ShiftFinishPhoto
+from shifts.services.finish_photos import (
+    ShiftFinishPhotosXlsxExportInteractor,
+    ShiftFinishPhotosZipStreamInteractor,
+)
 
 
 class ShiftFinishPhotoResource(resources.ModelResource):
@@ -52,89 +49,13 @@ def download_xlsx(
         "shift__staff",
         "shift__car_wash",
     )
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "MyModel Data"
-
-    headers = [
-        'ID',
-        'URL фотографии',
-        'Дата смены',
-        'ФИО сотрудника',
-        'Адрес мойки',
-        'Фотография',
-    ]
-    ws.append(headers)
-
-    row_num = 2
-
-    with httpx.Client() as http_client:
-        for obj in queryset:
-            obj: ShiftFinishPhoto
-
-            # Write ID and URL
-            ws.cell(row=row_num, column=1, value=obj.id)
-            ws.cell(row=row_num, column=2, value=obj.url)
-            ws.cell(row=row_num, column=3, value=obj.shift.date)
-            ws.cell(row=row_num, column=4, value=obj.shift.staff.full_name)
-            ws.cell(row=row_num, column=5, value=obj.shift.car_wash.name)
-
-            try:
-                img_response = http_client.get(obj.url)
-                img_response.raise_for_status()
-
-                # Validate and load image
-                img_pil = PILImage.open(io.BytesIO(img_response.content))
-                img_width_px, img_height_px = img_pil.size
-
-                # Save image as PNG in memory
-                img_io = io.BytesIO()
-                img_pil.save(img_io, format='JPEG')
-                img_io.seek(0)
-
-                # Insert image
-                excel_img = OpenPyxlImage(img_io)
-                ws.add_image(excel_img, f"F{row_num}")
-
-                # --- Resize row and column to fit image --- #
-
-                # Convert pixels to Excel units
-                # Excel row height unit = ~0.75 points per pixel
-                # Excel column width unit ≈ pixel_width / 7 (approx.)
-
-                row_height_points = img_height_px * 0.75
-                col_width = img_width_px / 7.0
-
-                ws.row_dimensions[row_num].height = row_height_points
-
-                col_letter = get_column_letter(6)
-                ws.column_dimensions[col_letter].width = col_width
-
-            except Exception:
-                ws.cell(row=row_num, column=6, value="Image Error")
-
-            row_num += 1
-
-    # Optional: widen ID and URL columns
-    ws.column_dimensions[get_column_letter(1)].width = 15
-    ws.column_dimensions[get_column_letter(2)].width = 40
-    ws.column_dimensions[get_column_letter(3)].width = 15
-    ws.column_dimensions[get_column_letter(4)].width = 25
-    ws.column_dimensions[get_column_letter(5)].width = 30
-
-    # Save to stream
-    stream = io.BytesIO()
-    wb.save(stream)
-    stream.seek(0)
-
-    return HttpResponse(
-        stream.read(),
+    file = ShiftFinishPhotosXlsxExportInteractor(photos=queryset).execute()
+    return FileResponse(
+        file,
+        as_attachment=True,
+        filename="shift_finish_photos.xlsx",
         content_type='application/vnd.openxmlformats-officedocument'
                      '.spreadsheetml.sheet',
-        headers={
-            'Content-Disposition': 'attachment; '
-                                   'filename="shift_finish_photos.xlsx"'
-        }
     )
 
 
@@ -144,34 +65,13 @@ def download_photos_zip(
         request,
         queryset: QuerySet[ShiftFinishPhoto],
 ):
-    buffer = io.BytesIO()
-    queryset = queryset.select_related("shift", "shift__staff")
-
-    last_photo_number = defaultdict(int)
-    with (
-        zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file,
-        httpx.Client() as http_client
-    ):
-        for photo in queryset:
-            if not photo.url:
-                continue
-            try:
-                response = http_client.get(photo.url, timeout=10)
-                response.raise_for_status()
-
-                filename = (
-                    f"{photo.shift.date.isoformat()}"
-                    f"_{photo.shift.staff.full_name.replace(' ', '_')}"
-                )
-                last_photo_number[filename] += 1
-                filename = f"{filename}_{last_photo_number[filename]}.jpg"
-                zip_file.writestr(filename, response.content)
-            except Exception as e:
-                print(e)
-                continue
-
-    buffer.seek(0)
-    response = HttpResponse(buffer.read(), content_type='application/zip')
+    queryset = queryset.select_related(
+        "shift",
+        "shift__staff",
+        "shift__car_wash",
+    )
+    chunks = ShiftFinishPhotosZipStreamInteractor(photos=queryset).execute()
+    response = StreamingHttpResponse(chunks, content_type='application/zip')
     response['Content-Disposition'] = 'attachment; filename="shift_photos.zip"'
     return response
 
@@ -182,8 +82,21 @@ class ShiftFinishPhotoAdmin(
     ImportExportModelAdmin,
 ):
     resource_class = ShiftFinishPhotoResource
-    list_display = ("shift", "url")
+    list_display = ("shift", "url", "thumbnail")
     list_select_related = ("shift", "shift__staff")
     list_filter = ("shift__car_wash", HasUrlFilter)
     actions = [download_xlsx, download_photos_zip]
     autocomplete_fields = ("shift",)
+
+    @admin.display(description=_("Thumbnail"))
+    def thumbnail(self, obj: ShiftFinishPhoto) -> str:
+        if not obj.url:
+            return "-"
+        # Photos uploaded before thumbnails were made have none.
+        if not obj.thumbnail_url:
+            return format_html('<a href="{}">{}</a>', obj.url, _("Open"))
+        return format_html(
+            '<a href="{}"><img src="{}" alt="" loading="lazy" height="64"></a>',
+            obj.url,
+            obj.thumbnail_url,
+        )
@@ -6,3 +6,10 @@ class ShiftsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "shifts"
     verbose_name = _("shift")
+
+    def ready(self):
+        from core.settings_registry import settings_registry
+        from shifts.models import ShiftCarsThreshold, WindshieldWasherHidden
+
+        settings_registry.register(ShiftCarsThreshold)
+        settings_registry.register(WindshieldWasherHidden)
@@ -1,9 +1,7 @@
-import time
-
 from django.core.management import BaseCommand
 
 from shifts.selectors import get_staff_ids_with_active_shift
-from telegram.services import get_telegram_bot, try_send_message
+from telegram.services import get_telegram_bot, TelegramBroadcaster
 
 
 class Command(BaseCommand):
@@ -14,22 +12,19 @@ class Command(BaseCommand):
         staff_ids = get_staff_ids_with_active_shift()
 
         text = "❗️ Не забудьте завершить смену"
-        for staff_id in staff_ids:
-            is_sent = try_send_message(
-                bot=bot,
-                chat_id=staff_id,
-                text=text,
-            )
-            if is_sent:
+        broadcaster = TelegramBroadcaster(bot)
+        results = broadcaster.broadcast(chat_ids=staff_ids, text=text)
+        for result in results:
+            if result.is_sent:
                 self.stdout.write(
                     self.style.SUCCESS(
-                        f"Message has been sent to staff {staff_id}",
+                        f"Message has been sent to staff {result.chat_id}",
                     )
                 )
             else:
                 self.stderr.write(
                     self.style.ERROR(
-                        f"Message has not been sent to staff {staff_id}",
+                        f"Message has not been sent to staff"
+                        f" {result.chat_id}: {result.error}",
                     )
                 )
-            time.sleep(0.1)
@@ -1,8 +1,10 @@
+import collections
+
 from django.core.management import BaseCommand
 
 from core.services import get_current_shift_date
-from shifts.models import Shift
-from shifts.services import ShiftSummaryInteractor
+from shifts.models import ShiftFinishPhoto
+from shifts.services import ShiftSummaryListInteractor
 from shifts.services.shifts.finish import (
     CarWashTransferredCarsSummary,
     ShiftSummary,
@@ -62,15 +64,22 @@ class Command(BaseCommand):
         self.stdout.write(f"Sending shift finish report to chat {chat_id}")
 
         date = get_current_shift_date()
-        shifts = Shift.objects.prefetch_related("finish_photos").filter(
+        shift_summaries = ShiftSummaryListInteractor(
             date=date,
-            finished_at__isnull=False,
-        )
-        for shift in shifts:
-            interactor = ShiftSummaryInteractor(shift_id=shift.id)
-            shift_summary = interactor.execute()
+            is_finished=True,
+        ).execute()
+
+        shift_id_to_photo_file_ids = collections.defaultdict(list)
+        finish_photos = ShiftFinishPhoto.objects.filter(
+            shift_id__in=[
+                shift_summary.shift_id for shift_summary in shift_summaries
+            ],
+        ).values_list("shift_id", "file_id")
+        for shift_id, file_id in finish_photos:
+            shift_id_to_photo_file_ids[shift_id].append(file_id)
 
-            photo_file_ids = [photo.file_id for photo in shift.finish_photos.all()]
+        for shift_summary in shift_summaries:
+            photo_file_ids = shift_id_to_photo_file_ids[shift_summary.shift_id]
 
             username = try_get_chat_username(
                 bot=bot,
@@ -88,13 +97,13 @@ class Command(BaseCommand):
                 self.stdout.write(
                     self.style.SUCCESS(
                         f"Shift finish report has been sent for staff "
-                        f"{shift.staff_id}"
+                        f"{shift_summary.staff_id}"
                     )
                 )
             else:
                 self.stdout.write(
                     self.style.ERROR(
                         f"Shift finish report has been sent for staff "
-                        f"{shift.staff_id}"
+                        f"{shift_summary.staff_id}"
                     )
                 )
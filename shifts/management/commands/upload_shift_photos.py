@@ -1,55 +1,72 @@
 from django.core.management.base import BaseCommand
 
-from photo_upload.services import upload_via_url
-from shifts.models import ShiftFinishPhoto
-from telegram.services import get_file_urls, get_telegram_bot
+from shifts.services.finish_photos import (
+    BackfillCheckpoint,
+    ShiftFinishPhotosBackfillBatchResult,
+    ShiftFinishPhotosBackfillInteractor,
+)
 
 
 class Command(BaseCommand):
     help = (
-        "Fetches Telegram file URLs"
-        " for ShiftFinishPhoto records without a URL"
+        "Uploads Telegram files of ShiftFinishPhoto records without a URL"
+        " to S3. Progress is saved to a checkpoint file, so an interrupted"
+        " run continues where it stopped"
     )
 
-    def handle(self, *args, **options):
-        bot = get_telegram_bot()
-        photo_file_ids = (
-            ShiftFinishPhoto.objects
-            .filter(url__isnull=True)
-            .values_list("file_id", flat=True)
-            .distinct()
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+        )
+        parser.add_argument(
+            "--max-workers",
+            type=int,
+            default=8,
+            help="Files uploaded at once",
+        )
+        parser.add_argument(
+            "--checkpoint-file",
+            default="upload_shift_photos.checkpoint.json",
         )
+        parser.add_argument(
+            "--reset-checkpoint",
+            action="store_true",
+            help="Start from the first photo",
+        )
+
+    def write_batch_result(
+            self,
+            result: ShiftFinishPhotosBackfillBatchResult,
+    ) -> None:
+        self.stdout.write(self.style.SUCCESS(
+            f"Photos up to ID {result.last_photo_id}:"
+            f" uploaded {result.uploaded_photos_count} file(s),"
+            f" updated {result.updated_rows_count} row(s)"
+        ))
+        for file_id, error in result.failed_file_id_to_error.items():
+            self.stdout.write(self.style.ERROR(
+                f"Error processing file_id {file_id}: {error}"
+            ))
 
-        total = len(photo_file_ids)
-        self.stdout.write(f"Found {total} photo(s) with missing URLs")
-
-        for i, file_id in enumerate(photo_file_ids, start=1):
-            self.stdout.write(f"[{i}/{total}] Processing file_id: {file_id}")
-
-            try:
-                telegram_file_urls = get_file_urls(bot=bot, file_ids=[file_id])
-                if not telegram_file_urls:
-                    self.stdout.write(self.style.WARNING(
-                        f"No Telegram URL returned for file_id: {file_id}")
-                    )
-                    continue
-
-                telegram_file_url = telegram_file_urls[0]
-
-                uploaded_file = upload_via_url(
-                    url=telegram_file_url,
-                    folder="shift_finish_photos",
-                )
-                updated = (
-                    ShiftFinishPhoto.objects
-                    .filter(file_id=file_id)
-                    .update(url=uploaded_file.url)
-                )
-                self.stdout.write(self.style.SUCCESS(
-                    f"Updated {updated} row(s) for file_id: {file_id}")
-                )
-
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(
-                    f"Error processing file_id {file_id}: {e}")
-                )
+    def handle(self, *args, **options):
+        checkpoint = BackfillCheckpoint(options["checkpoint_file"])
+        if options["reset_checkpoint"]:
+            checkpoint.reset()
+
+        result = ShiftFinishPhotosBackfillInteractor(
+            checkpoint=checkpoint,
+            batch_size=options["batch_size"],
+            max_workers=options["max_workers"],
+            on_batch_done=self.write_batch_result,
+        ).execute()
+
+        self.stdout.write(
+            f"Uploaded {result.uploaded_photos_count} file(s),"
+            f" failed {result.failed_photos_count},"
+            f" updated {result.updated_rows_count} row(s)"
+            f" in {result.elapsed_seconds:.1f}s:"
+            f" {result.photos_per_second:.2f} photos/sec,"
+            f" {result.bytes_per_second / 1024 / 1024:.2f} MiB/sec"
+        )
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.7 on 2026-10-18 14:26
+
+import django.db.models.deletion
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Indexes are built without locking writes to the tables. Foreign key
+    # indexes covered by the new composite ones are dropped afterwards.
+    atomic = False
+
+    dependencies = [
+        ('car_washes', '0010_alter_carwash_name_carwash_unique_car_wash_name'),
+        ('shifts', '0019_shiftfinishphoto_url'),
+        ('staff', '0004_staff_type_staffregisterrequest_staff_type'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='cartowash',
+            index=models.Index(fields=['shift', 'car_wash'], name='car_to_wash_shift_car_wash'),
+        ),
+        AddIndexConcurrently(
+            model_name='shift',
+            index=models.Index(fields=['date'], name='shift_date'),
+        ),
+        AddIndexConcurrently(
+            model_name='shift',
+            index=models.Index(condition=models.Q(('finished_at__isnull', True), ('started_at__isnull', False)), fields=['staff'], name='shift_active_staff'),
+        ),
+        migrations.AlterField(
+            model_name='cartowash',
+            name='shift',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='shifts.shift', verbose_name='shift'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 14:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shifts', '0020_shift_and_car_to_wash_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='shiftfinishphoto',
+            name='thumbnail_url',
+            field=models.URLField(blank=True, max_length=1024, null=True, verbose_name='thumbnail URL'),
+        ),
+    ]
@@ -42,6 +42,8 @@ class CarToWash(models.Model):
     shift = models.ForeignKey(
         Shift,
         on_delete=models.CASCADE,
+        # Covered by the (shift, car_wash) index.
+        db_index=False,
         verbose_name=_("shift"),
     )
     car_class = models.CharField(
@@ -87,6 +89,12 @@ class CarToWash(models.Model):
         verbose_name = _("car to wash")
         verbose_name_plural = _("cars to wash")
         unique_together = ("number", "shift")
+        indexes = (
+            models.Index(
+                fields=("shift", "car_wash"),
+                name="car_to_wash_shift_car_wash",
+            ),
+        )
 
     def __str__(self):
         return _("car number: %(number)s") % {"number": self.number}
@@ -23,6 +23,12 @@ class ShiftFinishPhoto(models.Model):
         null=True,
         blank=True,
     )
+    thumbnail_url = models.URLField(
+        max_length=1024,
+        verbose_name=_("thumbnail URL"),
+        null=True,
+        blank=True,
+    )
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name=_("created at"),
@@ -3,6 +3,8 @@ from typing import Final
 from django.db import models
 from django.utils.translation import gettext as _, gettext_lazy as __
 
+from core.settings_registry import settings_registry
+
 
 DEFAULT_SHIFT_CARS_THRESHOLD: Final[int] = 8
 
@@ -26,7 +28,7 @@ class ShiftCarsThreshold(models.Model):
 
     @classmethod
     def get(cls) -> int:
-        threshold = cls.objects.first()
+        threshold = settings_registry.get(cls)
         if threshold is not None:
             return threshold.value
         return DEFAULT_SHIFT_CARS_THRESHOLD
@@ -77,6 +77,18 @@ class Shift(models.Model):
         verbose_name = _("shift")
         verbose_name_plural = _("shifts")
         unique_together = ("staff", "date", "is_test")
+        # Lookups by (staff, date) are served by the unique index above.
+        indexes = (
+            models.Index(fields=("date",), name="shift_date"),
+            models.Index(
+                fields=("staff",),
+                condition=models.Q(
+                    started_at__isnull=False,
+                    finished_at__isnull=True,
+                ),
+                name="shift_active_staff",
+            ),
+        )
 
     def __str__(self):
         return f'{self.date} - {self.staff.full_name}'
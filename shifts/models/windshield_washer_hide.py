@@ -1,6 +1,8 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _, gettext
 
+from core.settings_registry import settings_registry
+
 
 class WindshieldWasherHidden(models.Model):
     """One-record model to hide the windshield washer."""
@@ -25,7 +27,7 @@ class WindshieldWasherHidden(models.Model):
         """
         Returns True if the windshield washer is hidden, False otherwise.
         """
-        instance = cls.objects.first()
+        instance = settings_registry.get(cls)
         if instance is not None:
             return instance.is_hidden
         return False
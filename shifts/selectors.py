@@ -1,14 +1,16 @@
 import datetime
-import math
 import operator
-from collections import defaultdict
 from collections.abc import Iterable
 from dataclasses import dataclass
 from functools import reduce
 from uuid import UUID
 
-from django.db.models import Q
+from django.db.models import (
+    Case, Count, ExpressionWrapper, F, IntegerField, Q, Sum, When,
+)
+from django.db.models.functions import Coalesce
 
+from core.pagination import paginate_by_keyset
 from shifts.exceptions import (
     CarToWashNotFoundError,
     ShiftNotFoundError,
@@ -23,17 +25,17 @@ __all__ = (
     "get_shift_by_id",
     "get_staff_current_shift",
     "has_any_finished_shift",
-    "CarToWashDTO",
-    "get_cars_to_wash_for_period",
-    "map_car_to_wash",
-    "CarToWashAdditionalServiceDTO",
+    "CarsToWashDailyTotals",
+    "get_cars_to_wash_daily_totals_for_period",
+    "AdditionalServiceDailyTotals",
+    "get_additional_services_daily_totals_for_period",
     "get_staff_id_by_car_id",
     "get_staff_ids_with_active_shift",
     "get_shifts_page",
-    "group_additional_services_by_car_to_wash_id",
     "map_shifts_page_items",
     "ShiftsPage",
     "ShiftsPageItem",
+    "SHIFTS_PAGE_ORDERING",
 )
 
 from staff.models import StaffType
@@ -105,159 +107,203 @@ def has_any_finished_shift(staff_id: int) -> bool:
     ).exists()
 
 
-@dataclass(frozen=True, slots=True)
-class CarToWashAdditionalServiceDTO:
-    id: UUID
-    name: str
-    count: int
-    total_price: int
-    car_to_wash_id: int
-
-
-@dataclass(frozen=True, slots=True)
-class CarToWashDTO:
-    id: int
-    car_class: str
+@dataclass(frozen=True, slots=True, kw_only=True)
+class CarsToWashDailyTotals:
+    car_wash_id: int
     shift_date: datetime.date
+    comfort_cars_count: int
+    business_cars_count: int
+    vans_count: int
+    windshield_washer_refilled_bottle_count: int
     washing_price: int
     windshield_washer_price: int
-    windshield_washer_refilled_bottle_count: int
-    additional_services: list[CarToWashAdditionalServiceDTO]
-
 
-def compute_windshield_washer_refilled_bottles_count(
-        windshield_washer_refilled_bottle_percentage: int,
-) -> int:
-    return math.ceil(windshield_washer_refilled_bottle_percentage / 100)
 
+@dataclass(frozen=True, slots=True, kw_only=True)
+class AdditionalServiceDailyTotals:
+    car_wash_id: int
+    shift_date: datetime.date
+    id: UUID
+    name: str
+    count: int
+    total_price: int
 
-def group_additional_services_by_car_to_wash_id(
-        additional_services: Iterable[CarToWashAdditionalServiceDTO],
-) -> dict[int, list[CarToWashAdditionalServiceDTO]]:
-    car_id_to_additional_services = defaultdict(list)
 
-    for additional_service in additional_services:
-        car_id = additional_service.car_to_wash_id
-        car_id_to_additional_services[car_id].append(additional_service)
+def validate_cars_to_wash_period(
+        *,
+        car_wash_ids: Iterable[int],
+        from_date: datetime.date,
+        to_date: datetime.date,
+) -> None:
+    if not car_wash_ids:
+        raise ValueError("car_wash_ids must not be empty")
 
-    return dict(car_id_to_additional_services)
+    if from_date > to_date:
+        raise ValueError("from_date must be less than or equal to to_date")
 
 
-def map_car_to_wash(
-        cars_to_wash: Iterable[CarToWash],
-        additional_services: Iterable[CarToWashAdditionalServiceDTO],
-) -> list[CarToWashDTO]:
-    car_id_to_additional_services = (
-        group_additional_services_by_car_to_wash_id(
-            additional_services=additional_services,
-        ))
+def get_cars_to_wash_daily_totals_for_period(
+        *,
+        car_wash_ids: Iterable[int],
+        from_date: datetime.date,
+        to_date: datetime.date,
+) -> list[CarsToWashDailyTotals]:
+    """
+    Count and sum prices of washed cars grouped by car wash and shift date
+    in database.
 
-    mapped_cars_to_wash: list[CarToWashDTO] = []
+    Args:
+        car_wash_ids: List of car wash IDs to filter
+        from_date: Start date of the period (inclusive)
+        to_date: End date of the period (inclusive)
 
-    for car_to_wash in cars_to_wash:
-        car_to_wash_additional_services = car_id_to_additional_services.get(
-            car_to_wash.id, []
-        )
+    Raises:
+        ValueError: If input dates are invalid or car_wash_ids is empty
+    """
+    validate_cars_to_wash_period(
+        car_wash_ids=car_wash_ids,
+        from_date=from_date,
+        to_date=to_date,
+    )
 
-        bottle_count = compute_windshield_washer_refilled_bottles_count(
-            car_to_wash.windshield_washer_refilled_bottle_percentage,
+    # Any started bottle is counted as a whole one.
+    refilled_bottle_count = ExpressionWrapper(
+        (F("windshield_washer_refilled_bottle_percentage") + 99) / 100,
+        output_field=IntegerField(),
+    )
+    washing_price = Case(
+        When(
+            car_class=CarToWash.CarType.COMFORT,
+            then=F("comfort_class_car_washing_price"),
+        ),
+        When(
+            car_class=CarToWash.CarType.BUSINESS,
+            then=F("business_class_car_washing_price"),
+        ),
+        When(
+            car_class=CarToWash.CarType.VAN,
+            then=F("van_washing_price"),
+        ),
+        output_field=IntegerField(),
+    )
+    cars_to_wash = (
+        CarToWash.objects
+        .filter(
+            shift__date__range=(from_date, to_date),
+            car_wash_id__in=car_wash_ids,
         )
-        mapped_cars_to_wash.append(
-            CarToWashDTO(
-                id=car_to_wash.id,
-                car_class=car_to_wash.car_class,
-                shift_date=car_to_wash.shift.date,
-                washing_price=car_to_wash.washing_price,
-                windshield_washer_price=car_to_wash.windshield_washer_price,
-                windshield_washer_refilled_bottle_count=bottle_count,
-                additional_services=car_to_wash_additional_services,
+        .values("car_wash_id", "shift__date")
+        .annotate(
+            comfort_cars_count=Count(
+                "id",
+                filter=Q(car_class=CarToWash.CarType.COMFORT),
+            ),
+            business_cars_count=Count(
+                "id",
+                filter=Q(car_class=CarToWash.CarType.BUSINESS),
+            ),
+            vans_count=Count(
+                "id",
+                filter=Q(car_class=CarToWash.CarType.VAN),
+            ),
+            windshield_washer_refilled_bottle_count=Coalesce(
+                Sum(refilled_bottle_count),
+                0,
+            ),
+            washing_price=Coalesce(Sum(washing_price), 0),
+            windshield_washer_price=Coalesce(
+                Sum(
+                    F("windshield_washer_price_per_bottle")
+                    * refilled_bottle_count,
+                ),
+                0,
             ),
         )
-
-    return mapped_cars_to_wash
-
-
-def map_additional_services(
-        additional_services: Iterable[dict],
-) -> list[CarToWashAdditionalServiceDTO]:
-    result = []
-    for additional_service in additional_services:
-        staff_type = additional_service['car__shift__staff__type']
-        if staff_type == StaffType.CAR_TRANSPORTER:
-            price = additional_service['price']
-        else:
-            price = additional_service[
-                'price_for_car_transporters_and_washers']
-
-        result.append(
-            CarToWashAdditionalServiceDTO(
-                id=additional_service["service_id"],
-                name=additional_service["service__name"],
-                count=additional_service["count"],
-                total_price=additional_service['count'] * price,
-                car_to_wash_id=additional_service["car_id"],
-            )
+        .order_by("car_wash_id", "shift__date")
+    )
+    return [
+        CarsToWashDailyTotals(
+            car_wash_id=car_to_wash["car_wash_id"],
+            shift_date=car_to_wash["shift__date"],
+            comfort_cars_count=car_to_wash["comfort_cars_count"],
+            business_cars_count=car_to_wash["business_cars_count"],
+            vans_count=car_to_wash["vans_count"],
+            windshield_washer_refilled_bottle_count=car_to_wash[
+                "windshield_washer_refilled_bottle_count"
+            ],
+            washing_price=car_to_wash["washing_price"],
+            windshield_washer_price=car_to_wash["windshield_washer_price"],
         )
-    return result
+        for car_to_wash in cars_to_wash
+    ]
 
 
-def get_cars_to_wash_for_period(
+def get_additional_services_daily_totals_for_period(
         *,
         car_wash_ids: Iterable[int],
         from_date: datetime.date,
         to_date: datetime.date,
-) -> list[CarToWashDTO]:
+) -> list[AdditionalServiceDailyTotals]:
     """
-    Iterate through car wash records for specified car washes and date range.
+    Count and sum prices of cars additional services grouped by car wash,
+    shift date and service in database.
 
     Args:
         car_wash_ids: List of car wash IDs to filter
         from_date: Start date of the period (inclusive)
         to_date: End date of the period (inclusive)
 
-    Yields:
-        Tuples of CarToWashDTO objects
-
     Raises:
         ValueError: If input dates are invalid or car_wash_ids is empty
     """
-    if not car_wash_ids:
-        raise ValueError("car_wash_ids must not be empty")
-
-    if from_date > to_date:
-        raise ValueError("from_date must be less than or equal to to_date")
-
-    cars_to_wash = (
-        CarToWash.objects.select_related("shift")
-        .filter(
-            shift__date__range=(from_date, to_date),
-            car_wash_id__in=car_wash_ids,
-        )
+    validate_cars_to_wash_period(
+        car_wash_ids=car_wash_ids,
+        from_date=from_date,
+        to_date=to_date,
     )
 
+    price = Case(
+        When(
+            car__shift__staff__type=StaffType.CAR_TRANSPORTER,
+            then=F("price"),
+        ),
+        default=F("price_for_car_transporters_and_washers"),
+        output_field=IntegerField(),
+    )
     additional_services = (
-        CarToWashAdditionalService.objects.select_related("service")
-        .select_related("car__shift__staff")
+        CarToWashAdditionalService.objects
         .filter(
             car__shift__date__range=(from_date, to_date),
             car__car_wash_id__in=car_wash_ids,
         )
         .values(
+            "car__car_wash_id",
+            "car__shift__date",
             "service_id",
             "service__name",
-            "count",
-            "price",
-            "price_for_car_transporters_and_washers",
-            "car__shift__staff__type",
-            "car_id",
+        )
+        .annotate(
+            total_count=Sum("count"),
+            total_price=Sum(F("count") * price),
+        )
+        .order_by(
+            "car__car_wash_id",
+            "car__shift__date",
+            "service__name",
+            "service_id",
         )
     )
-    additional_services = map_additional_services(additional_services)
-
-    return map_car_to_wash(
-        cars_to_wash=cars_to_wash,
-        additional_services=additional_services,
-    )
+    return [
+        AdditionalServiceDailyTotals(
+            car_wash_id=additional_service["car__car_wash_id"],
+            shift_date=additional_service["car__shift__date"],
+            id=additional_service["service_id"],
+            name=additional_service["service__name"],
+            count=additional_service["total_count"],
+            total_price=additional_service["total_price"],
+        )
+        for additional_service in additional_services
+    ]
 
 
 def get_staff_id_by_car_id(car_id: int) -> int:
@@ -303,6 +349,10 @@ class ShiftsPageItem:
 class ShiftsPage:
     shifts: list[ShiftsPageItem]
     is_end_of_list_reached: bool
+    next_cursor: str | None = None
+
+
+SHIFTS_PAGE_ORDERING = ("-created_at", "-id")
 
 
 def map_shifts_page_items(shifts: Iterable[Shift]) -> list[ShiftsPageItem]:
@@ -345,6 +395,7 @@ def get_shifts_page(
         limit: int,
         offset: int,
         shift_types: Iterable[str],
+        cursor: str | None = None,
 ) -> ShiftsPage:
     if not shift_types:
         filters = Q(is_test=False, is_extra=False)
@@ -366,13 +417,16 @@ def get_shifts_page(
     if staff_ids is not None:
         shifts = shifts.filter(staff_id__in=staff_ids)
 
-    shifts = shifts[offset: offset + limit + 1]
-
-    is_end_of_list_reached = len(shifts) <= limit
-
-    shifts = shifts[:limit]
+    page = paginate_by_keyset(
+        shifts,
+        ordering=SHIFTS_PAGE_ORDERING,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+    )
 
     return ShiftsPage(
-        shifts=map_shifts_page_items(shifts),
-        is_end_of_list_reached=is_end_of_list_reached,
+        shifts=map_shifts_page_items(page.items),
+        is_end_of_list_reached=page.is_end_of_list_reached,
+        next_cursor=page.next_cursor,
     )
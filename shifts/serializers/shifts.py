@@ -91,6 +91,7 @@ class ShiftListInputSerializer(serializers.Serializer):
     )
     limit = serializers.IntegerField(default=10, min_value=1, max_value=1000)
     offset = serializers.IntegerField(default=0, min_value=0)
+    cursor = serializers.CharField(default=None, allow_null=True)
 
 
 class ShiftListOutputSerializer(serializers.ModelSerializer):
@@ -205,6 +206,7 @@ class ShiftListV2InputSerializer(serializers.Serializer):
     to_date = serializers.DateField(default=None, allow_null=True)
     limit = serializers.IntegerField(default=50, min_value=1, max_value=1000)
     offset = serializers.IntegerField(default=0, min_value=0)
+    cursor = serializers.CharField(default=None, allow_null=True)
     types = serializers.MultipleChoiceField(choices=Shift.Type.choices)
 
     def validate(self, attrs):
@@ -234,6 +236,7 @@ class ShiftListV2ItemSerializer(serializers.Serializer):
 class ShiftListV2OutputSerializer(serializers.Serializer):
     shifts = serializers.ListSerializer(child=ShiftListV2ItemSerializer())
     is_end_of_list_reached = serializers.BooleanField()
+    next_cursor = serializers.CharField(allow_null=True)
 
 
 class ShiftRejectInputSerializer(serializers.Serializer):
@@ -6,6 +6,7 @@ from .shifts import (
     ShiftTestCreateInteractor,
     ShiftFinishInteractor,
     ShiftSummaryInteractor,
+    ShiftSummaryListInteractor,
     mark_shift_as_rejected_now,
     get_current_shift_date,
     get_staff_ids_with_not_started_shifts_for_today,
@@ -36,6 +37,7 @@ __all__ = (
     "ShiftTestCreateInteractor",
     "ShiftFinishInteractor",
     "ShiftSummaryInteractor",
+    "ShiftSummaryListInteractor",
     "mark_shift_as_rejected_now",
     "get_current_shift_date",
     "get_staff_ids_with_not_started_shifts_for_today",
@@ -1,13 +1,19 @@
 from collections.abc import Iterable
 from dataclasses import dataclass
-from functools import lru_cache
 from uuid import UUID
 
-from django.db import transaction
-from django.db.models import Q, QuerySet
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from django.db.models.expressions import RawSQL
 from typing_extensions import TypedDict
 
 from car_washes.models import CarWash, CarWashServicePrice
+from economics.services.report_period_snapshots import (
+    mark_shifts_report_period_snapshots_stale,
+)
+from economics.services.shift_statistics_rollups import (
+    schedule_shift_statistics_rollups_refresh,
+)
 from shifts.models import CarToWash, CarToWashAdditionalService, Shift
 from shifts.services.transferred_cars.create import \
     calculate_car_transfer_price
@@ -93,6 +99,65 @@ def get_cars(items: Iterable[Item]) -> list[CarDto]:
 
 
 type ShiftIdAndCarNumber = tuple[int, str]
+type CarIdAndServiceId = tuple[int, UUID]
+
+CAR_FIELDS_TO_UPDATE = (
+    'car_wash_id',
+    'car_class',
+    'wash_type',
+    'windshield_washer_type',
+    'windshield_washer_refilled_bottle_percentage',
+)
+
+
+def filter_cars_by_shift_id_and_number(
+        keys: Iterable[ShiftIdAndCarNumber],
+) -> QuerySet[CarToWash]:
+    """
+    Filter cars by (shift id, car number) pairs.
+
+    Pairs are passed as two arrays which are unnested and joined to the
+    cars table on the composite key, so the query has the same shape and
+    plan for any number of pairs.
+    """
+    keys = tuple(keys)
+    if not keys:
+        return CarToWash.objects.none()
+    table_name = connection.ops.quote_name(CarToWash._meta.db_table)
+    return CarToWash.objects.filter(
+        id__in=RawSQL(
+            f'SELECT car.id FROM {table_name} AS car'
+            ' JOIN unnest(%s::bigint[], %s::varchar[])'
+            ' AS key(shift_id, number)'
+            ' ON car.shift_id = key.shift_id AND car.number = key.number',
+            (
+                [shift_id for shift_id, _ in keys],
+                [number for _, number in keys],
+            ),
+        ),
+    )
+
+
+def build_additional_services(
+        car: CarToWash,
+        item: Item,
+        service_id_to_price: dict[UUID, int],
+) -> list[CarToWashAdditionalService]:
+    additional_services: list[CarToWashAdditionalService] = []
+    for service in item['additional_services']:
+        if service['id'] not in service_id_to_price:
+            continue
+        if service['count'] < 1:
+            continue
+        additional_services.append(
+            CarToWashAdditionalService(
+                car_id=car.id,
+                service_id=service['id'],
+                count=service['count'],
+                price=service_id_to_price[service['id']],
+            )
+        )
+    return additional_services
 
 
 class BatchEditService:
@@ -146,110 +211,162 @@ class BatchEditService:
     def get_cars_to_update(self) -> set[ShiftIdAndCarNumber]:
         return self.__new_cars.intersection(self.__existing_cars)
 
+    def get_item(self, car: CarToWash) -> Item:
+        return self.__shift_id_and_number_to_item[(car.shift_id, car.number)]
+
     def delete_cars(self):
-        filter_q = Q()
-        for shift_id, car_number in self.get_cars_to_delete():
-            filter_q |= Q(shift_id=shift_id, number=car_number)
-        if filter_q:
-            CarToWash.objects.filter(filter_q).delete()
+        cars_to_delete = self.get_cars_to_delete()
+        if cars_to_delete:
+            filter_cars_by_shift_id_and_number(cars_to_delete).delete()
+
+    def update_car_fields(self, cars: list[CarToWash]) -> list[CarToWash]:
+        """
+        Apply fields of items to cars and save cars which have changed.
+
+        Returns:
+            Changed cars.
+        """
+        changed_cars: list[CarToWash] = []
+        for car in cars:
+            item = self.get_item(car)
+            field_values = {
+                'car_wash_id': item['car_wash_id'],
+                'car_class': item['class_type'],
+                'wash_type': item['wash_type'],
+                'windshield_washer_type': item['windshield_washer_type'],
+                'windshield_washer_refilled_bottle_percentage': (
+                    item['windshield_washer_refilled_bottle_percentage']
+                ),
+            }
+            if all(
+                    getattr(car, field_name) == value
+                    for field_name, value in field_values.items()
+            ):
+                continue
+            for field_name, value in field_values.items():
+                setattr(car, field_name, value)
+            changed_cars.append(car)
+
+        if changed_cars:
+            CarToWash.objects.bulk_update(
+                changed_cars,
+                fields=CAR_FIELDS_TO_UPDATE,
+            )
+        return changed_cars
+
+    def sync_additional_services(
+            self,
+            cars: list[CarToWash],
+            service_id_to_price: dict[UUID, int],
+    ) -> set[int]:
+        """
+        Make additional services of cars match items.
+
+        Removed services are deleted, new and changed ones are upserted,
+        and services which have not changed are not touched at all.
+
+        Returns:
+            IDs of cars whose additional services have changed.
+        """
+        existing_services: dict[
+            CarIdAndServiceId, CarToWashAdditionalService] = {
+            (service.car_id, service.service_id): service
+            for service in CarToWashAdditionalService.objects.filter(
+                car__in=cars,
+            )
+        }
+        new_services: dict[CarIdAndServiceId, CarToWashAdditionalService] = {
+            (service.car_id, service.service_id): service
+            for car in cars
+            for service in build_additional_services(
+                car,
+                self.get_item(car),
+                service_id_to_price,
+            )
+        }
+
+        services_to_delete = [
+            service
+            for key, service in existing_services.items()
+            if key not in new_services
+        ]
+        services_to_upsert = [
+            service
+            for key, service in new_services.items()
+            if key not in existing_services
+            or (existing_services[key].count, existing_services[key].price)
+            != (service.count, service.price)
+        ]
+
+        if services_to_delete:
+            CarToWashAdditionalService.objects.filter(
+                id__in=[service.id for service in services_to_delete],
+            ).delete()
+        if services_to_upsert:
+            CarToWashAdditionalService.objects.bulk_create(
+                services_to_upsert,
+                update_conflicts=True,
+                unique_fields=('car', 'service'),
+                update_fields=('count', 'price'),
+            )
+        return {
+            service.car_id
+            for service in services_to_delete + services_to_upsert
+        }
 
     @transaction.atomic
     def update_cars(self):
-        transferred_cars_query = Q()
-        for shift_id, car_number in self.get_cars_to_update():
-            transferred_cars_query |= Q(
-                shift_id=shift_id,
-                number=car_number,
-            )
-        if not transferred_cars_query:
+        cars_to_update = self.get_cars_to_update()
+        if not cars_to_update:
             return
 
         service_id_to_price = self.get_service_id_to_price()
 
-        transferred_cars = CarToWash.objects.filter(transferred_cars_query)
-
-        for transferred_car in transferred_cars:
-            item = self.__shift_id_and_number_to_item[
-                (transferred_car.shift_id, transferred_car.number)
-            ]
-            transferred_car.car_wash_id = item['car_wash_id']
-            transferred_car.car_class = item['class_type']
-            transferred_car.wash_type = item['wash_type']
-            transferred_car.windshield_washer_type = item[
-                'windshield_washer_type']
-            transferred_car.windshield_washer_refilled_bottle_percentage = (
-                item['windshield_washer_refilled_bottle_percentage']
-            )
-
-        CarToWash.objects.bulk_update(
+        transferred_cars = list(
+            filter_cars_by_shift_id_and_number(cars_to_update)
+        )
+        changed_cars = self.update_car_fields(transferred_cars)
+        changed_car_ids = {car.id for car in changed_cars}
+        changed_car_ids |= self.sync_additional_services(
             transferred_cars,
-            fields=(
-                'car_wash_id',
-                'car_class',
-                'wash_type',
-                'windshield_washer_type',
-                'windshield_washer_refilled_bottle_percentage',
-            ),
+            service_id_to_price,
         )
 
-        delete_q = Q()
-        for transferred_car in transferred_cars:
-            delete_q |= Q(
-                car_id=transferred_car.id,
-            )
-        if delete_q:
-            CarToWashAdditionalService.objects.filter(delete_q).delete()
-            
-
-        additional_services = []
-        for transferred_car in transferred_cars:
-            item = self.__shift_id_and_number_to_item[
-                (transferred_car.shift_id, transferred_car.number)
-            ]
-            for service in item['additional_services']:
-                if service['id'] not in service_id_to_price:
-                    continue
-                price = service_id_to_price[service['id']]
-                if service['count'] < 1:
-                    continue
-                additional_services.append(
-                    CarToWashAdditionalService(
-                        car_id=transferred_car.id,
-                        service_id=service['id'],
-                        count=service['count'],
-                        price=price,
-                    )
-                )
-        if additional_services:
-            CarToWashAdditionalService.objects.bulk_create(
-                additional_services
-            )
-
-    @lru_cache(maxsize=100)
-    def get_car_wash_by_id(self, car_wash_id: int) -> CarWash | None:
-        return CarWash.objects.filter(id=car_wash_id).first()
+        shift_ids = {
+            transferred_car.shift_id
+            for transferred_car in transferred_cars
+            if transferred_car.id in changed_car_ids
+        }
+        schedule_shift_statistics_rollups_refresh(shift_ids)
+        mark_shifts_report_period_snapshots_stale(shift_ids)
 
     @transaction.atomic
     def create_cars(self):
         cars_to_create = self.get_cars_to_create()
-        shift_ids = {
-            self.__shift_id_and_number_to_item[car]['shift_id']
+        if not cars_to_create:
+            return
+
+        items = [
+            self.__shift_id_and_number_to_item[car]
             for car in cars_to_create
-        }
+        ]
         shift_id_to_staff_type = {
             shift.id: shift.staff.type
-            for shift in
-            Shift.objects.filter(id__in=shift_ids).select_related('staff')
+            for shift in Shift.objects.filter(
+                id__in={item['shift_id'] for item in items},
+            ).select_related('staff')
         }
+        car_wash_id_to_car_wash = CarWash.objects.in_bulk(
+            {item['car_wash_id'] for item in items},
+        )
 
         service_id_to_price = self.get_service_id_to_price()
 
         transferred_cars = []
 
-        for car in cars_to_create:
-            item = self.__shift_id_and_number_to_item[car]
+        for item in items:
             shift_id = item['shift_id']
-            car_wash = self.get_car_wash_by_id(item['car_wash_id'])
+            car_wash = car_wash_id_to_car_wash.get(item['car_wash_id'])
             if car_wash is None:
                 continue
             transfer_price = calculate_car_transfer_price(
@@ -281,26 +398,21 @@ class BatchEditService:
 
         CarToWash.objects.bulk_create(transferred_cars)
 
-        additional_services = []
-        for transferred_car in transferred_cars:
-            item = self.__shift_id_and_number_to_item[
-                (transferred_car.shift_id, transferred_car.number)
-            ]
-            for service in item['additional_services']:
-                if service['id'] not in service_id_to_price:
-                    continue
-                if service['count'] < 1:
-                    continue
-                price = service_id_to_price[service['id']]
-                additional_services.append(
-                    CarToWashAdditionalService(
-                        car_id=transferred_car.id,
-                        service_id=service['id'],
-                        count=service['count'],
-                        price=price,
-                    )
-                )
+        additional_services = [
+            additional_service
+            for transferred_car in transferred_cars
+            for additional_service in build_additional_services(
+                transferred_car,
+                self.get_item(transferred_car),
+                service_id_to_price,
+            )
+        ]
         if additional_services:
             CarToWashAdditionalService.objects.bulk_create(
                 additional_services
             )
+        shift_ids = {
+            transferred_car.shift_id for transferred_car in transferred_cars
+        }
+        schedule_shift_statistics_rollups_refresh(shift_ids)
+        mark_shifts_report_period_snapshots_stale(shift_ids)
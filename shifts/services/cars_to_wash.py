@@ -3,13 +3,13 @@ from typing import Final
 from uuid import UUID
 from collections.abc import Iterable
 
-from django.db.models import Count, Sum
+from django.db.models import Count
 
 from shifts.exceptions import (
     CarAlreadyWashedOnShiftError,
     CarWashSameAsCurrentError,
 )
-from shifts.models import CarToWash, CarToWashAdditionalService, Shift
+from shifts.models import CarToWash, Shift
 from car_washes.models import CarWashServicePrice
 from shifts.exceptions import AdditionalServiceCouldNotBeProvidedError
 
@@ -154,29 +154,3 @@ def update_shift_car_wash(
 
 
 TRUNK_VACUUM_SERVICE_ID: Final[UUID] = UUID("8d263cb9-f11c-456e-b055-ee89655682f1")
-
-
-def compute_trunk_vacuum_count(
-    *,
-    car_wash_id: int,
-    shift_id: int,
-) -> int:
-    result = CarToWashAdditionalService.objects.filter(
-        car__car_wash_id=car_wash_id,
-        car__shift_id=shift_id,
-        service_id=TRUNK_VACUUM_SERVICE_ID,
-    ).aggregate(count=Sum("count"))
-    return result["count"] or 0
-
-
-def compute_dry_cleaning_items_count(
-    *,
-    car_wash_id: int,
-    shift_id: int,
-) -> int:
-    result = CarToWashAdditionalService.objects.filter(
-        car__car_wash_id=car_wash_id,
-        car__shift_id=shift_id,
-        service__is_dry_cleaning=True,
-    ).aggregate(count=Sum("count"))
-    return result["count"] or 0
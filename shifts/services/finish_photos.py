@@ -0,0 +1,617 @@
+import csv
+import datetime
+import io
+import json
+import logging
+import os
+import tempfile
+import time
+import zipfile
+from collections import defaultdict, deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+import httpx
+import openpyxl
+from django.db import models
+from django.db.models import Case, Value, When
+from minio import Minio
+from openpyxl.drawing.image import Image as OpenPyxlImage
+from openpyxl.utils.cell import get_column_letter
+from telebot import TeleBot
+
+from photo_upload.images import downscale_image
+from photo_upload.services import (
+    get_s3_client,
+    upload_image_via_url,
+    UploadedImage,
+)
+from shifts.models import ShiftFinishPhoto
+from telegram.services import get_telegram_bot
+
+
+__all__ = (
+    "ShiftFinishPhotosXlsxExportInteractor",
+    "ShiftFinishPhotosZipStreamInteractor",
+    "BackfillCheckpoint",
+    "ShiftFinishPhotosBackfillBatchResult",
+    "ShiftFinishPhotosBackfillResult",
+    "ShiftFinishPhotosBackfillInteractor",
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ExportedImage:
+    path: Path
+    width: int
+    height: int
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ShiftFinishPhotoRow:
+    id: int
+    url: str | None
+    thumbnail_url: str | None
+    shift_date: datetime.date
+    staff_full_name: str
+    car_wash_name: str | None
+
+
+def get_shift_finish_photo_rows(
+        photos: Iterable[ShiftFinishPhoto],
+) -> list[ShiftFinishPhotoRow]:
+    return [
+        ShiftFinishPhotoRow(
+            id=photo.id,
+            url=photo.url,
+            thumbnail_url=photo.thumbnail_url,
+            shift_date=photo.shift.date,
+            staff_full_name=photo.shift.staff.full_name,
+            car_wash_name=(
+                photo.shift.car_wash.name
+                if photo.shift.car_wash is not None
+                else None
+            ),
+        )
+        for photo in photos
+    ]
+
+
+def fetch_image(http_client: httpx.Client, row: ShiftFinishPhotoRow) -> bytes:
+    # Photos uploaded before thumbnails were made have none.
+    response = http_client.get(row.thumbnail_url or row.url)
+    response.raise_for_status()
+    return response.content
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ShiftFinishPhotosXlsxExportInteractor:
+    """
+    Export shift finish photos to XLSX file with embedded images.
+
+    Images are fetched and downscaled concurrently and saved to a
+    temporary directory, so only `max_workers` images are held in
+    memory. The workbook is written in write-only mode to a temporary
+    file which is removed once it is closed.
+    """
+
+    photos: Iterable[ShiftFinishPhoto]
+    max_workers: int = 8
+    image_max_size: int = 320
+    image_quality: int = 75
+    timeout: float = 10
+
+    def try_export_image(
+            self,
+            *,
+            http_client: httpx.Client,
+            directory: Path,
+            row: ShiftFinishPhotoRow,
+    ) -> ExportedImage | None:
+        if not row.url:
+            return None
+        try:
+            image = downscale_image(
+                fetch_image(http_client, row),
+                max_size=self.image_max_size,
+                quality=self.image_quality,
+            )
+        except Exception:
+            logger.exception(
+                "Could not export image of shift finish photo %s",
+                row.id,
+            )
+            return None
+        path = directory / f"{row.id}.jpg"
+        path.write_bytes(image.content)
+        return ExportedImage(path=path, width=image.width, height=image.height)
+
+    def execute(self) -> BinaryIO:
+        """
+        Returns:
+            Temporary file with workbook, positioned at its start.
+        """
+        rows = get_shift_finish_photo_rows(self.photos)
+
+        workbook = openpyxl.Workbook(write_only=True)
+        worksheet = workbook.create_sheet("MyModel Data")
+        # Write-only worksheet requires columns to be set up before rows.
+        column_widths = (15, 40, 15, 25, 30, self.image_max_size / 7.0)
+        for column_number, width in enumerate(column_widths, start=1):
+            column_letter = get_column_letter(column_number)
+            worksheet.column_dimensions[column_letter].width = width
+
+        worksheet.append([
+            'ID',
+            'URL фотографии',
+            'Дата смены',
+            'ФИО сотрудника',
+            'Адрес мойки',
+            'Фотография',
+        ])
+
+        with (
+            tempfile.TemporaryDirectory() as directory,
+            httpx.Client(timeout=self.timeout) as http_client,
+            ThreadPoolExecutor(max_workers=self.max_workers) as executor,
+        ):
+            images = executor.map(
+                lambda row: self.try_export_image(
+                    http_client=http_client,
+                    directory=Path(directory),
+                    row=row,
+                ),
+                rows,
+            )
+            for row_number, (row, image) in enumerate(
+                    zip(rows, images, strict=True),
+                    start=2,
+            ):
+                if image is None:
+                    photo_cell = "Image Error"
+                else:
+                    photo_cell = None
+                    # Excel row height unit is ~0.75 points per pixel.
+                    worksheet.row_dimensions[row_number].height = (
+                        image.height * 0.75
+                    )
+                    # Image is read from the file only on workbook save.
+                    worksheet.add_image(
+                        OpenPyxlImage(str(image.path)),
+                        f"F{row_number}",
+                    )
+                worksheet.append([
+                    row.id,
+                    row.url,
+                    row.shift_date,
+                    row.staff_full_name,
+                    row.car_wash_name,
+                    photo_cell,
+                ])
+
+            file = tempfile.TemporaryFile()
+            workbook.save(file)
+
+        file.seek(0)
+        return file
+
+
+class ZipStreamBuffer:
+    """
+    Write-only unseekable file collecting bytes written by `ZipFile`.
+
+    `ZipFile` writes entries with data descriptors into unseekable
+    files, so written bytes never have to be rewritten and can be sent
+    to the client right away.
+    """
+
+    def __init__(self):
+        self.__chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self.__chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def pop(self) -> bytes:
+        data = b"".join(self.__chunks)
+        self.__chunks.clear()
+        return data
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class FetchedPhoto:
+    row: ShiftFinishPhotoRow
+    filename: str
+    content: bytes | None
+    error: str | None
+
+
+def get_photo_filenames(rows: Iterable[ShiftFinishPhotoRow]) -> list[str]:
+    last_photo_number = defaultdict(int)
+    filenames: list[str] = []
+    for row in rows:
+        filename = (
+            f"{row.shift_date.isoformat()}"
+            f"_{row.staff_full_name.replace(' ', '_')}"
+        )
+        last_photo_number[filename] += 1
+        filenames.append(f"{filename}_{last_photo_number[filename]}.jpg")
+    return filenames
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ShiftFinishPhotosZipStreamInteractor:
+    """
+    Stream ZIP archive of shift finish photos.
+
+    Photos are downloaded concurrently, but not more than `window_size`
+    photos are downloaded ahead of the one being written, which bounds
+    memory. The archive is written entry by entry in order of photos.
+    Photos which were not downloaded are listed in `manifest.csv` inside
+    the archive.
+    """
+
+    photos: Iterable[ShiftFinishPhoto]
+    max_workers: int = 8
+    window_size: int = 16
+    timeout: float = 10
+
+    def fetch_photo(
+            self,
+            *,
+            http_client: httpx.Client,
+            row: ShiftFinishPhotoRow,
+            filename: str,
+    ) -> FetchedPhoto:
+        try:
+            response = http_client.get(row.url)
+            response.raise_for_status()
+        except Exception as error:
+            return FetchedPhoto(
+                row=row,
+                filename=filename,
+                content=None,
+                error=str(error) or error.__class__.__name__,
+            )
+        return FetchedPhoto(
+            row=row,
+            filename=filename,
+            content=response.content,
+            error=None,
+        )
+
+    def iter_fetched_photos(
+            self,
+            rows: list[ShiftFinishPhotoRow],
+    ) -> Iterator[FetchedPhoto]:
+        filenames = get_photo_filenames(rows)
+        with (
+            httpx.Client(timeout=self.timeout) as http_client,
+            ThreadPoolExecutor(max_workers=self.max_workers) as executor,
+        ):
+            futures: deque[Future[FetchedPhoto]] = deque()
+            for row, filename in zip(rows, filenames, strict=True):
+                futures.append(
+                    executor.submit(
+                        self.fetch_photo,
+                        http_client=http_client,
+                        row=row,
+                        filename=filename,
+                    )
+                )
+                if len(futures) >= self.window_size:
+                    yield futures.popleft().result()
+            while futures:
+                yield futures.popleft().result()
+
+    def execute(self) -> Iterator[bytes]:
+        # Rows are read before streaming starts.
+        rows = [
+            row
+            for row in get_shift_finish_photo_rows(self.photos)
+            if row.url
+        ]
+        return self.iter_archive_chunks(rows)
+
+    def iter_archive_chunks(
+            self,
+            rows: list[ShiftFinishPhotoRow],
+    ) -> Iterator[bytes]:
+        buffer = ZipStreamBuffer()
+        failed_photos: list[FetchedPhoto] = []
+
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            for photo in self.iter_fetched_photos(rows):
+                if photo.content is None:
+                    failed_photos.append(photo)
+                    continue
+                zip_file.writestr(photo.filename, photo.content)
+                yield buffer.pop()
+
+            with io.StringIO() as manifest:
+                writer = csv.writer(manifest)
+                writer.writerow(("photo_id", "url", "filename", "error"))
+                for photo in failed_photos:
+                    writer.writerow((
+                        photo.row.id,
+                        photo.row.url,
+                        photo.filename,
+                        photo.error,
+                    ))
+                zip_file.writestr("manifest.csv", manifest.getvalue())
+
+        yield buffer.pop()
+
+
+class BackfillCheckpoint:
+    """ID of the last processed photo stored in a JSON file."""
+
+    def __init__(self, path: str | Path):
+        self.__path = Path(path)
+
+    def load(self) -> int:
+        try:
+            return json.loads(self.__path.read_text())["last_photo_id"]
+        except FileNotFoundError:
+            return 0
+
+    def save(self, last_photo_id: int) -> None:
+        # Replace file atomically to not leave it broken on interruption.
+        temporary_path = self.__path.with_name(f"{self.__path.name}.tmp")
+        temporary_path.write_text(json.dumps({"last_photo_id": last_photo_id}))
+        os.replace(temporary_path, self.__path)
+
+    def reset(self) -> None:
+        self.__path.unlink(missing_ok=True)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class PhotoBackfillRow:
+    id: int
+    file_id: str
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ShiftFinishPhotosBackfillBatchResult:
+    last_photo_id: int
+    uploaded_photos_count: int
+    failed_file_id_to_error: dict[str, str]
+    updated_rows_count: int
+    bytes_count: int
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ShiftFinishPhotosBackfillResult:
+    uploaded_photos_count: int
+    failed_photos_count: int
+    updated_rows_count: int
+    bytes_count: int
+    elapsed_seconds: float
+
+    @property
+    def photos_per_second(self) -> float:
+        if not self.elapsed_seconds:
+            return 0
+        return self.uploaded_photos_count / self.elapsed_seconds
+
+    @property
+    def bytes_per_second(self) -> float:
+        if not self.elapsed_seconds:
+            return 0
+        return self.bytes_count / self.elapsed_seconds
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class TelegramFileUploadResult:
+    uploaded_image: UploadedImage | None = None
+    error: str | None = None
+
+
+def try_upload_telegram_file(
+        *,
+        bot: TeleBot,
+        client: Minio,
+        file_id: str,
+        folder: str,
+) -> TelegramFileUploadResult:
+    try:
+        uploaded_image = upload_image_via_url(
+            bot.get_file_url(file_id),
+            folder=folder,
+            client=client,
+        )
+    except Exception as error:
+        logger.exception("Could not upload Telegram file %s", file_id)
+        return TelegramFileUploadResult(
+            error=str(error) or error.__class__.__name__,
+        )
+    return TelegramFileUploadResult(uploaded_image=uploaded_image)
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ShiftFinishPhotosBackfillInteractor:
+    """
+    Upload shift finish photos without URL from Telegram to S3.
+
+    Photos are read by ID in batches. Files of a batch are uploaded
+    together with their thumbnails concurrently while the next batch is
+    already being uploaded, then URLs of the batch are saved in a single
+    query and the checkpoint is moved up to the first photo still
+    without URL. An interrupted backfill continues after the checkpoint,
+    and files which were not uploaded are retried on the next run.
+    """
+
+    checkpoint: BackfillCheckpoint
+    batch_size: int = 100
+    max_workers: int = 8
+    folder: str = "shift_finish_photos"
+    on_batch_done: Callable[
+        [ShiftFinishPhotosBackfillBatchResult], None
+    ] | None = None
+
+    def iter_batches(
+            self,
+            after_photo_id: int,
+    ) -> Iterator[list[PhotoBackfillRow]]:
+        while True:
+            rows = [
+                PhotoBackfillRow(id=photo_id, file_id=file_id)
+                for photo_id, file_id in (
+                    ShiftFinishPhoto.objects
+                    .filter(url__isnull=True, id__gt=after_photo_id)
+                    .order_by("id")
+                    .values_list("id", "file_id")[:self.batch_size]
+                )
+            ]
+            if not rows:
+                return
+            yield rows
+            after_photo_id = rows[-1].id
+
+    def get_checkpoint_photo_id(self, rows: list[PhotoBackfillRow]) -> int:
+        first_pending_photo_id = (
+            ShiftFinishPhoto.objects
+            .filter(
+                url__isnull=True,
+                id__gt=self.checkpoint.load(),
+                id__lte=rows[-1].id,
+            )
+            .order_by("id")
+            .values_list("id", flat=True)
+            .first()
+        )
+        if first_pending_photo_id is None:
+            return rows[-1].id
+        return first_pending_photo_id - 1
+
+    def save_batch(
+            self,
+            rows: list[PhotoBackfillRow],
+            file_id_to_future: dict[str, Future[TelegramFileUploadResult]],
+    ) -> ShiftFinishPhotosBackfillBatchResult:
+        file_id_to_upload_result = {
+            file_id: future.result()
+            for file_id, future in file_id_to_future.items()
+        }
+        file_id_to_uploaded_image = {
+            file_id: upload_result.uploaded_image
+            for file_id, upload_result in file_id_to_upload_result.items()
+            if upload_result.uploaded_image is not None
+        }
+
+        updated_rows_count = 0
+        if file_id_to_uploaded_image:
+            updated_rows_count = ShiftFinishPhoto.objects.filter(
+                file_id__in=file_id_to_uploaded_image,
+                url__isnull=True,
+            ).update(
+                url=Case(
+                    *(
+                        When(file_id=file_id, then=Value(uploaded_image.url))
+                        for file_id, uploaded_image
+                        in file_id_to_uploaded_image.items()
+                    ),
+                    output_field=models.URLField(),
+                ),
+                thumbnail_url=Case(
+                    *(
+                        When(
+                            file_id=file_id,
+                            then=Value(uploaded_image.thumbnail_url),
+                        )
+                        for file_id, uploaded_image
+                        in file_id_to_uploaded_image.items()
+                    ),
+                    output_field=models.URLField(),
+                ),
+            )
+        # Saved only after URLs are committed.
+        self.checkpoint.save(self.get_checkpoint_photo_id(rows))
+
+        result = ShiftFinishPhotosBackfillBatchResult(
+            last_photo_id=rows[-1].id,
+            uploaded_photos_count=len(file_id_to_uploaded_image),
+            failed_file_id_to_error={
+                file_id: upload_result.error
+                for file_id, upload_result in file_id_to_upload_result.items()
+                if upload_result.error is not None
+            },
+            updated_rows_count=updated_rows_count,
+            bytes_count=sum(
+                uploaded_image.size or 0
+                for uploaded_image in file_id_to_uploaded_image.values()
+            ),
+        )
+        if self.on_batch_done is not None:
+            self.on_batch_done(result)
+        return result
+
+    def execute(self) -> ShiftFinishPhotosBackfillResult:
+        started_at = time.monotonic()
+        bot = get_telegram_bot()
+        client = get_s3_client()
+        batch_results: list[ShiftFinishPhotosBackfillBatchResult] = []
+        in_flight_batches: deque[
+            tuple[list[PhotoBackfillRow], dict[str, Future]]
+        ] = deque()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for rows in self.iter_batches(self.checkpoint.load()):
+                # Rows with file of a batch being uploaded are updated
+                # together with that batch.
+                in_flight_file_ids = {
+                    file_id
+                    for _, file_id_to_future in in_flight_batches
+                    for file_id in file_id_to_future
+                }
+                file_ids = dict.fromkeys(
+                    row.file_id
+                    for row in rows
+                    if row.file_id not in in_flight_file_ids
+                )
+                in_flight_batches.append((
+                    rows,
+                    {
+                        file_id: executor.submit(
+                            try_upload_telegram_file,
+                            bot=bot,
+                            client=client,
+                            file_id=file_id,
+                            folder=self.folder,
+                        )
+                        for file_id in file_ids
+                    },
+                ))
+                # Keep the next batch uploading while this one is saved.
+                if len(in_flight_batches) > 1:
+                    batch_results.append(
+                        self.save_batch(*in_flight_batches.popleft()),
+                    )
+            while in_flight_batches:
+                batch_results.append(
+                    self.save_batch(*in_flight_batches.popleft()),
+                )
+
+        return ShiftFinishPhotosBackfillResult(
+            uploaded_photos_count=sum(
+                result.uploaded_photos_count for result in batch_results
+            ),
+            failed_photos_count=sum(
+                len(result.failed_file_id_to_error)
+                for result in batch_results
+            ),
+            updated_rows_count=sum(
+                result.updated_rows_count for result in batch_results
+            ),
+            bytes_count=sum(result.bytes_count for result in batch_results),
+            elapsed_seconds=time.monotonic() - started_at,
+        )
@@ -6,7 +6,11 @@ from .create import (
 )
 from .dead_souls import DeadSoulsReadInteractor
 from .delete import ShiftDeleteByIdInteractor, ShiftsDeleteOnStaffBanInteractor
-from .finish import ShiftFinishInteractor, ShiftSummaryInteractor
+from .finish import (
+    ShiftFinishInteractor,
+    ShiftSummaryInteractor,
+    ShiftSummaryListInteractor,
+)
 from .months import StaffShiftsMonthListInteractor
 from .read import (
     get_current_shift_date,
@@ -26,6 +30,7 @@ __all__ = (
     "ShiftTestCreateInteractor",
     "ShiftFinishInteractor",
     "ShiftSummaryInteractor",
+    "ShiftSummaryListInteractor",
     "mark_shift_as_rejected_now",
     "get_shifts_by_staff_id",
     "get_current_shift_date",
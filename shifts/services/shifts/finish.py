@@ -1,21 +1,19 @@
 import collections
+import datetime
 from collections.abc import Iterable
 from dataclasses import dataclass
 from functools import lru_cache
 
 from django.db import transaction
-from django.db.models import QuerySet
+from django.db.models import Count, Min, Q, QuerySet, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from bonuses.services import BonusAmountComputeInteractor
-from car_washes.models import CarWash
 from economics.use_cases import CarTransporterSurchargeCreateUseCase
 from shifts.models import CarToWash, Shift, ShiftFinishPhoto
 from shifts.selectors import has_any_finished_shift
-from shifts.services.cars_to_wash import (
-    compute_dry_cleaning_items_count,
-    compute_trunk_vacuum_count,
-)
+from shifts.services.cars_to_wash import TRUNK_VACUUM_SERVICE_ID
 
 
 @dataclass(frozen=True, slots=True, kw_only=True)
@@ -117,6 +115,114 @@ class ShiftFinishInteractor:
         )
 
 
+def get_shifts_car_washes_summaries(
+        shift_ids: Iterable[int],
+) -> dict[int, list[CarWashTransferredCarsSummary]]:
+    """
+    Summarize transferred cars of shifts by car washes in a single query.
+
+    Additional services are joined to cars, so cars are counted distinctly
+    and services counts are summed with conditions.
+
+    Args:
+        shift_ids: IDs of shifts.
+
+    Returns:
+        Car washes summaries by shift ID in order of the first car
+        transferred to car wash. Shifts without cars are missing.
+    """
+    is_not_refilled = Q(
+        windshield_washer_type=CarToWash.WindshieldWasherType.ANTIFREEZE,
+        windshield_washer_refilled_bottle_percentage=0,
+    )
+    car_washes = (
+        CarToWash.objects
+        .filter(shift_id__in=shift_ids)
+        .values("shift_id", "car_wash_id", "car_wash__name")
+        .annotate(
+            first_car_id=Min("id"),
+            total_cars_count=Count("id", distinct=True),
+            comfort_cars_count=Count(
+                "id",
+                filter=Q(car_class=CarToWash.CarType.COMFORT),
+                distinct=True,
+            ),
+            business_cars_count=Count(
+                "id",
+                filter=Q(car_class=CarToWash.CarType.BUSINESS),
+                distinct=True,
+            ),
+            vans_count=Count(
+                "id",
+                filter=Q(car_class=CarToWash.CarType.VAN),
+                distinct=True,
+            ),
+            planned_cars_count=Count(
+                "id",
+                filter=Q(wash_type=CarToWash.WashType.PLANNED),
+                distinct=True,
+            ),
+            urgent_cars_count=Count(
+                "id",
+                filter=Q(wash_type=CarToWash.WashType.URGENT),
+                distinct=True,
+            ),
+            not_refilled_cars_count=Count(
+                "id",
+                filter=is_not_refilled,
+                distinct=True,
+            ),
+            dry_cleaning_count=Coalesce(
+                Sum(
+                    "additional_services__count",
+                    filter=Q(
+                        additional_services__service__is_dry_cleaning=True,
+                    ),
+                ),
+                0,
+            ),
+            trunk_vacuum_count=Coalesce(
+                Sum(
+                    "additional_services__count",
+                    filter=Q(
+                        additional_services__service_id=(
+                            TRUNK_VACUUM_SERVICE_ID
+                        ),
+                    ),
+                ),
+                0,
+            ),
+        )
+        .order_by("shift_id", "first_car_id")
+    )
+
+    shift_id_to_car_washes_summaries: dict[
+        int, list[CarWashTransferredCarsSummary]
+    ] = collections.defaultdict(list)
+    for car_wash in car_washes:
+        total_cars_count = car_wash["total_cars_count"]
+        not_refilled_cars_count = car_wash["not_refilled_cars_count"]
+        shift_id_to_car_washes_summaries[car_wash["shift_id"]].append(
+            CarWashTransferredCarsSummary(
+                car_wash_id=car_wash["car_wash_id"],
+                car_wash_name=car_wash["car_wash__name"] or "не выбрано",
+                comfort_cars_count=car_wash["comfort_cars_count"],
+                business_cars_count=car_wash["business_cars_count"],
+                vans_count=car_wash["vans_count"],
+                planned_cars_count=car_wash["planned_cars_count"],
+                urgent_cars_count=car_wash["urgent_cars_count"],
+                dry_cleaning_count=car_wash["dry_cleaning_count"],
+                total_cars_count=total_cars_count,
+                refilled_cars_count=(
+                    total_cars_count - not_refilled_cars_count
+                ),
+                not_refilled_cars_count=not_refilled_cars_count,
+                trunk_vacuum_count=car_wash["trunk_vacuum_count"],
+            )
+        )
+    return dict(shift_id_to_car_washes_summaries)
+
+
 class ShiftSummaryInteractor:
 
     def __init__(self, shift_id: int):
@@ -124,77 +230,59 @@ class ShiftSummaryInteractor:
 
     @lru_cache
     def get_shift(self) -> Shift:
-        return Shift.objects.select_related("staff", "car_wash").get(
+        return Shift.objects.select_related("staff").get(
             id=self.__shift_id
         )
 
-    def get_cars_to_wash(self) -> QuerySet[CarToWash]:
-        return CarToWash.objects.select_related("car_wash").filter(
-            shift=self.get_shift()
-        )
-
     def execute(self) -> ShiftSummary:
         shift = self.get_shift()
-        cars_to_wash = self.get_cars_to_wash()
-
-        car_wash_id_to_name: dict[int, str] = {
-            car_wash["id"]: car_wash["name"]
-            for car_wash in CarWash.objects.values("id", "name")
-        }
-
-        car_wash_id_to_cars = collections.defaultdict(list)
-        for car in cars_to_wash:
-            car_wash_id_to_cars[car.car_wash_id].append(car)
-
-        car_washes_summaries: list[CarWashTransferredCarsSummary] = []
-
-        for car_wash_id, cars in car_wash_id_to_cars.items():
-            wash_type_to_count = collections.defaultdict(int)
-            car_class_to_count = collections.defaultdict(int)
-            not_refilled_cars_count = 0
-
-            for car in cars:
-                wash_type_to_count[car.wash_type] += 1
-                car_class_to_count[car.car_class] += 1
-                not_refilled_cars_count += (
-                    car.is_windshield_washer_not_refilled)
-
-            car_wash_name = car_wash_id_to_name.get(car_wash_id, "не выбрано")
-            total_cars_count = len(cars)
-            refilled_cars_count = total_cars_count - not_refilled_cars_count
-
-            dry_cleaning_items_count = compute_dry_cleaning_items_count(
-                car_wash_id=car_wash_id,
-                shift_id=shift.id,
-            )
-            trunk_vacuum_count = compute_trunk_vacuum_count(
-                car_wash_id=car_wash_id,
-                shift_id=shift.id,
-            )
-
-            car_wash_transferred_cars_summary = CarWashTransferredCarsSummary(
-                car_wash_id=car_wash_id,
-                car_wash_name=car_wash_name,
-                comfort_cars_count=car_class_to_count[
-                    CarToWash.CarType.COMFORT],
-                business_cars_count=car_class_to_count[
-                    CarToWash.CarType.BUSINESS],
-                vans_count=car_class_to_count[CarToWash.CarType.VAN],
-                planned_cars_count=wash_type_to_count[
-                    CarToWash.WashType.PLANNED],
-                urgent_cars_count=wash_type_to_count[
-                    CarToWash.WashType.URGENT],
-                dry_cleaning_count=dry_cleaning_items_count,
-                total_cars_count=total_cars_count,
-                refilled_cars_count=refilled_cars_count,
-                not_refilled_cars_count=not_refilled_cars_count,
-                trunk_vacuum_count=trunk_vacuum_count,
-            )
-            car_washes_summaries.append(car_wash_transferred_cars_summary)
-
+        shift_id_to_car_washes_summaries = get_shifts_car_washes_summaries(
+            [shift.id],
+        )
         return ShiftSummary(
             staff_id=shift.staff.id,
             staff_full_name=shift.staff.full_name,
             shift_id=shift.id,
-            car_washes=car_washes_summaries,
+            car_washes=shift_id_to_car_washes_summaries.get(shift.id, []),
+        )
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class ShiftSummaryListInteractor:
+    """
+    Summaries of many shifts from a constant number of queries.
+
+    Shifts are filtered by date and/or IDs, at least one of them is required.
+    """
+
+    date: datetime.date | None = None
+    shift_ids: Iterable[int] | None = None
+    is_finished: bool | None = None
+
+    def get_shifts(self) -> QuerySet[Shift]:
+        if self.date is None and self.shift_ids is None:
+            raise ValueError("date or shift_ids must be provided")
+
+        shifts = Shift.objects.select_related("staff").order_by("id")
+        if self.date is not None:
+            shifts = shifts.filter(date=self.date)
+        if self.shift_ids is not None:
+            shifts = shifts.filter(id__in=self.shift_ids)
+        if self.is_finished is not None:
+            shifts = shifts.filter(finished_at__isnull=not self.is_finished)
+        return shifts
+
+    def execute(self) -> list[ShiftSummary]:
+        shifts = list(self.get_shifts())
+        shift_id_to_car_washes_summaries = get_shifts_car_washes_summaries(
+            [shift.id for shift in shifts],
         )
+        return [
+            ShiftSummary(
+                staff_id=shift.staff.id,
+                staff_full_name=shift.staff.full_name,
+                shift_id=shift.id,
+                car_washes=shift_id_to_car_washes_summaries.get(shift.id, []),
+            )
+            for shift in shifts
+        ]
@@ -0,0 +1,86 @@
+import io
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PIL import Image
+
+from car_washes.tests.factories import CarWashFactory
+from shifts.models import ShiftFinishPhoto
+from shifts.tests.factories import ShiftFactory
+
+
+def make_jpeg(width: int, height: int) -> bytes:
+    with io.BytesIO() as file_io:
+        Image.new("RGB", (width, height), (10, 120, 200)).save(
+            file_io,
+            format="JPEG",
+        )
+        return file_io.getvalue()
+
+
+class PhotosHandler(BaseHTTPRequestHandler):
+    """Serve photos registered in `server.path_to_content`."""
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        content = self.server.path_to_content.get(self.path)
+        if content is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+@pytest.fixture
+def photos_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PhotosHandler)
+    server.path_to_content = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    server.base_url = f"http://{host}:{port}"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def finish_photos(photos_server) -> list[ShiftFinishPhoto]:
+    """
+    Photo with thumbnail, photo without thumbnail, missing photo and
+    photo without URL.
+    """
+    photos_server.path_to_content |= {
+        "/1_thumbnail.jpg": make_jpeg(320, 240),
+        "/1.jpg": make_jpeg(4000, 3000),
+        "/2.jpg": make_jpeg(1000, 2000),
+    }
+    shift = ShiftFactory(car_wash=CarWashFactory())
+    return [
+        ShiftFinishPhoto.objects.create(
+            shift=shift,
+            file_id=str(number),
+            url=url,
+            thumbnail_url=thumbnail_url,
+        )
+        for number, (url, thumbnail_url) in enumerate(
+            (
+                (
+                    f"{photos_server.base_url}/1.jpg",
+                    f"{photos_server.base_url}/1_thumbnail.jpg",
+                ),
+                (f"{photos_server.base_url}/2.jpg", None),
+                (f"{photos_server.base_url}/3.jpg", None),
+                (None, None),
+            ),
+            start=1,
+        )
+    ]
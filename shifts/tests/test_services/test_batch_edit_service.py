@@ -0,0 +1,145 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from car_washes.tests.factories import (
+    CarWashFactory,
+    CarWashServicePriceFactory,
+)
+from shifts.models import CarToWash, CarToWashAdditionalService
+from shifts.services.batch_edit import (
+    BatchEditService,
+    filter_cars_by_shift_id_and_number,
+)
+from shifts.tests.factories import (
+    ShiftFactory,
+    TransferredCarAdditionalServiceFactory,
+    TransferredCarFactory,
+)
+
+
+def build_item(car: CarToWash, **overrides) -> dict:
+    return {
+        "shift_id": car.shift_id,
+        "car_wash_id": car.car_wash_id,
+        "car_number": car.number,
+        "class_type": car.car_class,
+        "wash_type": car.wash_type,
+        "windshield_washer_type": car.windshield_washer_type,
+        "windshield_washer_refilled_bottle_percentage": (
+            car.windshield_washer_refilled_bottle_percentage
+        ),
+        "additional_services": [
+            {"id": service.service_id, "count": service.count}
+            for service in car.additional_services.all()
+        ],
+    } | overrides
+
+
+@pytest.mark.django_db
+def test_filter_cars_by_shift_id_and_number():
+    shift = ShiftFactory()
+    car_1 = TransferredCarFactory(shift=shift, number="A111AA777")
+    car_2 = TransferredCarFactory(shift=shift, number="B222BB777")
+    other_car = TransferredCarFactory(number="A111AA777")
+
+    cars = filter_cars_by_shift_id_and_number(
+        [(shift.id, car_1.number), (shift.id, car_2.number)],
+    )
+
+    assert set(cars) == {car_1, car_2}
+    assert other_car not in cars
+    assert not filter_cars_by_shift_id_and_number([]).exists()
+
+
+@pytest.mark.django_db
+def test_update_cars_touches_only_changed_rows():
+    service_price = CarWashServicePriceFactory()
+    changed_car = TransferredCarFactory(car_class=CarToWash.CarType.COMFORT)
+    unchanged_car = TransferredCarFactory(shift=changed_car.shift)
+    kept_service = TransferredCarAdditionalServiceFactory(
+        car=changed_car,
+        service=service_price.service,
+        price=service_price.price,
+        count=1,
+    )
+    removed_service = TransferredCarAdditionalServiceFactory(car=changed_car)
+    unchanged_service_price = CarWashServicePriceFactory()
+    unchanged_service = TransferredCarAdditionalServiceFactory(
+        car=unchanged_car,
+        service=unchanged_service_price.service,
+        price=unchanged_service_price.price,
+    )
+    new_service_price = CarWashServicePriceFactory()
+
+    service = BatchEditService(
+        items=[
+            build_item(
+                changed_car,
+                class_type=CarToWash.CarType.VAN,
+                additional_services=[
+                    {"id": service_price.service_id, "count": 3},
+                    {"id": new_service_price.service_id, "count": 1},
+                ],
+            ),
+            build_item(unchanged_car),
+        ],
+    )
+    with CaptureQueriesContext(connection) as context:
+        service.update_cars()
+
+    changed_car.refresh_from_db()
+    assert changed_car.car_class == CarToWash.CarType.VAN
+    assert not CarToWashAdditionalService.objects.filter(
+        id=removed_service.id,
+    ).exists()
+    # Changed service is updated in place instead of being recreated.
+    kept_service.refresh_from_db()
+    assert kept_service.count == 3
+    assert set(
+        changed_car.additional_services.values_list("service_id", flat=True)
+    ) == {service_price.service_id, new_service_price.service_id}
+    assert CarToWashAdditionalService.objects.filter(
+        id=unchanged_service.id,
+    ).exists()
+    updates = [
+        query["sql"]
+        for query in context.captured_queries
+        if query["sql"].startswith('UPDATE "shifts_cartowash"')
+    ]
+    assert len(updates) == 1
+    assert f"= {unchanged_car.id}" not in updates[0]
+
+
+@pytest.mark.django_db
+def test_create_cars_loads_car_washes_in_one_query(service_prices):
+    shift = ShiftFactory()
+    car_washes = CarWashFactory.create_batch(3)
+    items = [
+        {
+            "shift_id": shift.id,
+            "car_wash_id": car_wash.id,
+            "car_number": f"A{index}00AA777",
+            "class_type": CarToWash.CarType.COMFORT,
+            "wash_type": CarToWash.WashType.PLANNED,
+            "windshield_washer_type": (
+                CarToWash.WindshieldWasherType.ANTIFREEZE
+            ),
+            "windshield_washer_refilled_bottle_percentage": 0,
+            "additional_services": [],
+        }
+        for index, car_wash in enumerate(car_washes)
+    ]
+
+    service = BatchEditService(items=items)
+    with CaptureQueriesContext(connection) as context:
+        service.create_cars()
+
+    assert CarToWash.objects.filter(shift=shift).count() == 3
+    car_wash_queries = [
+        query["sql"]
+        for query in context.captured_queries
+        if query["sql"].startswith("SELECT")
+        and 'FROM "car_washes_carwash"' in query["sql"]
+    ]
+    assert len(car_wash_queries) == 1
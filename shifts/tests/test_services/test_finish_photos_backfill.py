@@ -0,0 +1,176 @@
+import io
+import logging
+
+import pytest
+from django.core.management import call_command
+
+from photo_upload.services import UploadedImage
+from shifts.models import ShiftFinishPhoto
+from shifts.services import finish_photos
+from shifts.services.finish_photos import (
+    BackfillCheckpoint,
+    ShiftFinishPhotosBackfillInteractor,
+    TelegramFileUploadResult,
+    try_upload_telegram_file,
+)
+from shifts.tests.factories import ShiftFactory
+
+
+BROKEN_FILE_ID = "broken"
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture
+def uploaded_file_ids(monkeypatch) -> list[str]:
+    file_ids: list[str] = []
+
+    def try_upload_telegram_file(*, bot, client, file_id, folder):
+        file_ids.append(file_id)
+        if file_id == BROKEN_FILE_ID:
+            return TelegramFileUploadResult(error="file is too big")
+        return TelegramFileUploadResult(
+            uploaded_image=UploadedImage(
+                object_name=f"{folder}/{file_id}.jpg",
+                url=f"https://s3.example.com/{folder}/{file_id}.jpg",
+                thumbnail_url=(
+                    f"https://s3.example.com/{folder}/{file_id}_thumbnail.jpg"
+                ),
+                size=100,
+            ),
+        )
+
+    monkeypatch.setattr(
+        finish_photos,
+        "try_upload_telegram_file",
+        try_upload_telegram_file,
+    )
+    return file_ids
+
+
+@pytest.fixture
+def checkpoint(tmp_path) -> BackfillCheckpoint:
+    return BackfillCheckpoint(tmp_path / "checkpoint.json")
+
+
+@pytest.fixture
+def photos() -> list[ShiftFinishPhoto]:
+    shift = ShiftFactory()
+    return [
+        ShiftFinishPhoto.objects.create(shift=shift, file_id=file_id)
+        for file_id in ("a", "b", "a", BROKEN_FILE_ID, "c")
+    ]
+
+
+@pytest.mark.django_db
+def test_backfill_uploads_photos(uploaded_file_ids, checkpoint, photos):
+    uploaded_url = ShiftFinishPhoto.objects.create(
+        shift=photos[0].shift,
+        file_id="d",
+        url="https://s3.example.com/d.jpg",
+    )
+
+    result = ShiftFinishPhotosBackfillInteractor(
+        checkpoint=checkpoint,
+        batch_size=2,
+        max_workers=2,
+    ).execute()
+
+    assert result.uploaded_photos_count == 3
+    assert result.failed_photos_count == 1
+    assert result.updated_rows_count == 4
+    assert result.bytes_count == 300
+    assert result.photos_per_second > 0
+    assert sorted(uploaded_file_ids) == ["a", "b", BROKEN_FILE_ID, "c"]
+    assert list(
+        ShiftFinishPhoto.objects
+        .filter(id__in=[photo.id for photo in photos])
+        .order_by("id")
+        .values_list("url", flat=True)
+    ) == [
+        "https://s3.example.com/shift_finish_photos/a.jpg",
+        "https://s3.example.com/shift_finish_photos/b.jpg",
+        "https://s3.example.com/shift_finish_photos/a.jpg",
+        None,
+        "https://s3.example.com/shift_finish_photos/c.jpg",
+    ]
+    assert ShiftFinishPhoto.objects.get(id=photos[1].id).thumbnail_url == (
+        "https://s3.example.com/shift_finish_photos/b_thumbnail.jpg"
+    )
+    uploaded_url.refresh_from_db()
+    assert uploaded_url.url == "https://s3.example.com/d.jpg"
+    # Checkpoint is not moved past the photo which was not uploaded.
+    assert checkpoint.load() == photos[3].id - 1
+
+
+@pytest.mark.django_db
+def test_backfill_resumes_from_checkpoint(
+        uploaded_file_ids,
+        checkpoint,
+        photos,
+):
+    def interrupt(batch_result):
+        raise Interrupted
+
+    with pytest.raises(Interrupted):
+        ShiftFinishPhotosBackfillInteractor(
+            checkpoint=checkpoint,
+            batch_size=2,
+            on_batch_done=interrupt,
+        ).execute()
+
+    assert checkpoint.load() == photos[1].id
+    uploaded_file_ids.clear()
+
+    result = ShiftFinishPhotosBackfillInteractor(
+        checkpoint=checkpoint,
+        batch_size=2,
+    ).execute()
+
+    # The first batch is not uploaded again, and "a" is already saved.
+    assert sorted(uploaded_file_ids) == [BROKEN_FILE_ID, "c"]
+    assert result.updated_rows_count == 1
+    assert not ShiftFinishPhoto.objects.filter(
+        url__isnull=True,
+    ).exclude(file_id=BROKEN_FILE_ID).exists()
+
+    # Failed files are retried on the next run.
+    uploaded_file_ids.clear()
+    ShiftFinishPhotosBackfillInteractor(checkpoint=checkpoint).execute()
+    assert uploaded_file_ids == [BROKEN_FILE_ID]
+
+
+@pytest.mark.django_db
+def test_command_prints_upload_errors(uploaded_file_ids, tmp_path, photos):
+    stdout = io.StringIO()
+
+    call_command(
+        "upload_shift_photos",
+        "--checkpoint-file",
+        str(tmp_path / "checkpoint.json"),
+        stdout=stdout,
+    )
+
+    assert (
+        f"Error processing file_id {BROKEN_FILE_ID}: file is too big"
+        in stdout.getvalue()
+    )
+
+
+def test_upload_error_is_logged(caplog):
+    class BrokenBot:
+        def get_file_url(self, file_id):
+            raise ValueError("file not found")
+
+    with caplog.at_level(logging.ERROR):
+        result = try_upload_telegram_file(
+            bot=BrokenBot(),
+            client=None,
+            file_id="a",
+            folder="shift_finish_photos",
+        )
+
+    assert result == TelegramFileUploadResult(error="file not found")
+    assert caplog.messages == ["Could not upload Telegram file a"]
@@ -0,0 +1,63 @@
+import logging
+
+import openpyxl
+import pytest
+
+from shifts.models import ShiftFinishPhoto
+from shifts.services.finish_photos import (
+    ShiftFinishPhotosXlsxExportInteractor,
+)
+
+
+@pytest.mark.django_db
+def test_export_finish_photos_xlsx(photos_server, finish_photos, caplog):
+    photos = ShiftFinishPhoto.objects.select_related(
+        "shift__staff",
+        "shift__car_wash",
+    ).order_by("id")
+
+    with (
+        caplog.at_level(logging.ERROR),
+        ShiftFinishPhotosXlsxExportInteractor(
+            photos=photos,
+            max_workers=2,
+            image_max_size=100,
+        ).execute() as file,
+    ):
+        workbook = openpyxl.load_workbook(file)
+
+    worksheet = workbook.active
+    rows = list(worksheet.iter_rows(min_row=2, values_only=True))
+    shift = finish_photos[0].shift
+    # Excel has no dates without time.
+    assert [(*row[:2], row[2].date(), *row[3:5]) for row in rows] == [
+        (
+            photo.id,
+            photo.url,
+            shift.date,
+            shift.staff.full_name,
+            shift.car_wash.name,
+        )
+        for photo in finish_photos
+    ]
+    assert [row[5] for row in rows] == [
+        None,
+        None,
+        "Image Error",
+        "Image Error",
+    ]
+    # Missing photo is logged, photo without URL is not fetched.
+    assert caplog.messages == [
+        f"Could not export image of shift finish photo {finish_photos[2].id}",
+    ]
+
+    images = sorted(
+        worksheet._images,
+        key=lambda image: image.anchor._from.row,
+    )
+    assert [image.anchor._from.row for image in images] == [1, 2]
+    assert [(image.width, image.height) for image in images] == [
+        (100, 75),
+        (50, 100),
+    ]
+    assert worksheet.row_dimensions[2].height == 75 * 0.75
@@ -0,0 +1,50 @@
+import csv
+import io
+import zipfile
+
+import pytest
+
+from shifts.models import ShiftFinishPhoto
+from shifts.services.finish_photos import ShiftFinishPhotosZipStreamInteractor
+
+
+@pytest.mark.django_db
+def test_stream_finish_photos_zip(photos_server, finish_photos):
+    photos = ShiftFinishPhoto.objects.select_related(
+        "shift__staff",
+        "shift__car_wash",
+    ).order_by("id")
+
+    chunks = list(
+        ShiftFinishPhotosZipStreamInteractor(
+            photos=photos,
+            max_workers=2,
+            window_size=2,
+        ).execute()
+    )
+
+    # One chunk per downloaded photo and the last one with manifest.
+    assert len(chunks) == 3
+    shift = finish_photos[0].shift
+    filename_prefix = (
+        f"{shift.date.isoformat()}_{shift.staff.full_name.replace(' ', '_')}"
+    )
+    with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as zip_file:
+        assert zip_file.namelist() == [
+            f"{filename_prefix}_1.jpg",
+            f"{filename_prefix}_2.jpg",
+            "manifest.csv",
+        ]
+        assert zip_file.read(f"{filename_prefix}_1.jpg") == (
+            photos_server.path_to_content["/1.jpg"]
+        )
+        manifest = list(
+            csv.reader(io.StringIO(zip_file.read("manifest.csv").decode()))
+        )
+
+    failed_photo = finish_photos[2]
+    assert manifest[0] == ["photo_id", "url", "filename", "error"]
+    assert [row[:3] for row in manifest[1:]] == [
+        [str(failed_photo.id), failed_photo.url, f"{filename_prefix}_3.jpg"],
+    ]
+    assert "404" in manifest[1][3]
@@ -0,0 +1,136 @@
+import datetime
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from car_washes.tests.factories import CarWashFactory
+from economics.models import CarTransporterPenalty, CarTransporterSurcharge
+from shifts.models import CarToWash, Shift
+from staff.tests.factories import StaffFactory
+
+
+START_DATE = datetime.date(2025, 1, 1)
+DAYS_COUNT = 120
+STAFF_COUNT = 20
+CARS_PER_SHIFT = 3
+
+
+@pytest.fixture
+def seeded_dataset():
+    """
+    Seed a few months of history and refresh planner statistics.
+
+    Only the last day has active (started and not finished) shifts.
+    """
+    staff_list = StaffFactory.create_batch(STAFF_COUNT)
+    car_washes = CarWashFactory.create_batch(10)
+    now = timezone.now()
+
+    shifts = Shift.objects.bulk_create(
+        Shift(
+            staff=staff,
+            date=START_DATE + datetime.timedelta(days=day),
+            started_at=now,
+            finished_at=None if day == DAYS_COUNT - 1 else now,
+        )
+        for day in range(DAYS_COUNT)
+        for staff in staff_list
+    )
+    CarToWash.objects.bulk_create(
+        CarToWash(
+            shift=shift,
+            car_wash=car_washes[(shift.id + index) % len(car_washes)],
+            number=f"A{index}{shift.id}",
+            car_class=CarToWash.CarType.COMFORT,
+            wash_type=CarToWash.WashType.PLANNED,
+            windshield_washer_refilled_bottle_percentage=0,
+            transfer_price=100,
+            comfort_class_car_washing_price=100,
+            business_class_car_washing_price=100,
+            van_washing_price=100,
+            windshield_washer_price_per_bottle=10,
+        )
+        for shift in shifts
+        for index in range(CARS_PER_SHIFT)
+    )
+    for model in (CarTransporterPenalty, CarTransporterSurcharge):
+        model.objects.bulk_create(
+            model(
+                staff=staff,
+                date=START_DATE + datetime.timedelta(days=day),
+                reason="reason",
+                amount=100,
+            )
+            for day in range(DAYS_COUNT)
+            for staff in staff_list
+        )
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "ANALYZE shifts_shift, shifts_cartowash,"
+            " economics_cartransporterpenalty,"
+            " economics_cartransportersurcharge"
+        )
+    return staff_list, car_washes
+
+
+@pytest.mark.django_db
+def test_shifts_by_date_use_index(seeded_dataset):
+    plan = Shift.objects.filter(date=START_DATE).explain()
+
+    assert "shift_date" in plan
+
+
+@pytest.mark.django_db
+def test_active_shifts_use_partial_index(seeded_dataset):
+    staff_list, _ = seeded_dataset
+
+    staff_current_shift_plan = Shift.objects.filter(
+        staff_id=staff_list[0].id,
+        started_at__isnull=False,
+        finished_at__isnull=True,
+    ).explain()
+    staff_ids_with_active_shift_plan = Shift.objects.filter(
+        started_at__isnull=False,
+        finished_at__isnull=True,
+    ).values_list("staff_id", flat=True).explain()
+
+    assert "shift_active_staff" in staff_current_shift_plan
+    assert "shift_active_staff" in staff_ids_with_active_shift_plan
+
+
+@pytest.mark.django_db
+def test_cars_by_shift_date_and_car_wash_use_index(seeded_dataset):
+    _, car_washes = seeded_dataset
+
+    plan = CarToWash.objects.filter(
+        shift__date=START_DATE,
+        car_wash_id__in=[car_washes[0].id],
+    ).explain()
+
+    assert "shift_date" in plan
+    assert "car_to_wash_shift_car_wash" in plan
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "model, index_name",
+    [
+        (CarTransporterPenalty, "penalty_staff_date"),
+        (CarTransporterSurcharge, "surcharge_staff_date"),
+    ],
+)
+def test_penalties_and_surcharges_by_staff_and_date_use_index(
+        seeded_dataset,
+        model,
+        index_name,
+):
+    staff_list, _ = seeded_dataset
+
+    plan = model.objects.filter(
+        staff_id=staff_list[0].id,
+        date__range=(START_DATE, START_DATE + datetime.timedelta(days=6)),
+    ).explain()
+
+    assert index_name in plan
@@ -0,0 +1,183 @@
+import datetime
+
+import pytest
+
+from car_washes.tests.factories import CarWashFactory, CarWashServiceFactory
+from shifts.models import CarToWash
+from shifts.services import (
+    ShiftSummaryInteractor,
+    ShiftSummaryListInteractor,
+)
+from shifts.services.cars_to_wash import TRUNK_VACUUM_SERVICE_ID
+from shifts.services.shifts.finish import CarWashTransferredCarsSummary
+from shifts.tests.factories import (
+    ShiftFactory,
+    TransferredCarAdditionalServiceFactory,
+    TransferredCarFactory,
+)
+
+
+@pytest.mark.django_db
+def test_shift_summary(django_assert_num_queries):
+    shift = ShiftFactory()
+    car_wash = CarWashFactory()
+    other_car_wash = CarWashFactory()
+    dry_cleaning_service = CarWashServiceFactory(is_dry_cleaning=True)
+    trunk_vacuum_service = CarWashServiceFactory(
+        id=TRUNK_VACUUM_SERVICE_ID,
+        is_dry_cleaning=False,
+    )
+
+    comfort_car = TransferredCarFactory(
+        shift=shift,
+        car_wash=car_wash,
+        car_class=CarToWash.CarType.COMFORT,
+        wash_type=CarToWash.WashType.PLANNED,
+        windshield_washer_type=CarToWash.WindshieldWasherType.ANTIFREEZE,
+        windshield_washer_refilled_bottle_percentage=0,
+    )
+    TransferredCarAdditionalServiceFactory(
+        car=comfort_car,
+        service=dry_cleaning_service,
+        count=2,
+    )
+    TransferredCarAdditionalServiceFactory(
+        car=comfort_car,
+        service=trunk_vacuum_service,
+        count=1,
+    )
+    van = TransferredCarFactory(
+        shift=shift,
+        car_wash=car_wash,
+        car_class=CarToWash.CarType.VAN,
+        wash_type=CarToWash.WashType.URGENT,
+        windshield_washer_type=CarToWash.WindshieldWasherType.ANTIFREEZE,
+        windshield_washer_refilled_bottle_percentage=50,
+    )
+    TransferredCarAdditionalServiceFactory(
+        car=van,
+        service=dry_cleaning_service,
+        count=3,
+    )
+    TransferredCarFactory(
+        shift=shift,
+        car_wash=other_car_wash,
+        car_class=CarToWash.CarType.BUSINESS,
+        wash_type=CarToWash.WashType.PLANNED,
+        windshield_washer_type=CarToWash.WindshieldWasherType.WATER,
+        windshield_washer_refilled_bottle_percentage=0,
+    )
+    # Car of another shift.
+    TransferredCarFactory(car_wash=car_wash)
+
+    with django_assert_num_queries(2):
+        shift_summary = ShiftSummaryInteractor(shift_id=shift.id).execute()
+
+    assert shift_summary.shift_id == shift.id
+    assert shift_summary.staff_id == shift.staff_id
+    assert shift_summary.staff_full_name == shift.staff.full_name
+    assert shift_summary.car_washes == [
+        CarWashTransferredCarsSummary(
+            car_wash_id=car_wash.id,
+            car_wash_name=car_wash.name,
+            comfort_cars_count=1,
+            business_cars_count=0,
+            vans_count=1,
+            planned_cars_count=1,
+            urgent_cars_count=1,
+            dry_cleaning_count=5,
+            total_cars_count=2,
+            refilled_cars_count=1,
+            not_refilled_cars_count=1,
+            trunk_vacuum_count=1,
+        ),
+        CarWashTransferredCarsSummary(
+            car_wash_id=other_car_wash.id,
+            car_wash_name=other_car_wash.name,
+            comfort_cars_count=0,
+            business_cars_count=1,
+            vans_count=0,
+            planned_cars_count=1,
+            urgent_cars_count=0,
+            dry_cleaning_count=0,
+            total_cars_count=1,
+            refilled_cars_count=1,
+            not_refilled_cars_count=0,
+            trunk_vacuum_count=0,
+        ),
+    ]
+
+
+@pytest.mark.django_db
+def test_shift_summary_without_cars():
+    shift = ShiftFactory()
+
+    shift_summary = ShiftSummaryInteractor(shift_id=shift.id).execute()
+
+    assert shift_summary.car_washes == []
+
+
+@pytest.mark.django_db
+def test_shift_summary_car_without_car_wash():
+    car = TransferredCarFactory(car_wash=None)
+
+    shift_summary = ShiftSummaryInteractor(shift_id=car.shift_id).execute()
+
+    assert len(shift_summary.car_washes) == 1
+    assert shift_summary.car_washes[0].car_wash_id is None
+    assert shift_summary.car_washes[0].car_wash_name == "не выбрано"
+
+
+@pytest.fixture
+def shifts_with_cars():
+    date = datetime.date(2025, 3, 1)
+    shifts = [
+        ShiftFactory(date=date, finished_at="2025-03-02T07:00:00Z"),
+        ShiftFactory(date=date, finished_at="2025-03-02T07:00:00Z"),
+        ShiftFactory(date=date, finished_at=None),
+        # Shift of another date.
+        ShiftFactory(
+            date=datetime.date(2025, 3, 2),
+            finished_at="2025-03-03T07:00:00Z",
+        ),
+    ]
+    car_washes = CarWashFactory.create_batch(2)
+    for shift_index, shift in enumerate(shifts):
+        for car_wash in car_washes[:shift_index + 1]:
+            TransferredCarAdditionalServiceFactory(
+                car=TransferredCarFactory(shift=shift, car_wash=car_wash),
+            )
+    return shifts
+
+
+@pytest.mark.django_db
+def test_shift_summary_list_by_date(
+        shifts_with_cars,
+        django_assert_num_queries,
+):
+    with django_assert_num_queries(2):
+        shift_summaries = ShiftSummaryListInteractor(
+            date=datetime.date(2025, 3, 1),
+        ).execute()
+
+    assert shift_summaries == [
+        ShiftSummaryInteractor(shift_id=shift.id).execute()
+        for shift in shifts_with_cars[:3]
+    ]
+
+
+@pytest.mark.django_db
+def test_shift_summary_list_by_shift_ids_and_finished(shifts_with_cars):
+    shift_summaries = ShiftSummaryListInteractor(
+        shift_ids=[shift.id for shift in shifts_with_cars[1:]],
+        is_finished=True,
+    ).execute()
+
+    assert [
+        shift_summary.shift_id for shift_summary in shift_summaries
+    ] == [shifts_with_cars[1].id, shifts_with_cars[3].id]
+
+
+def test_shift_summary_list_without_filters():
+    with pytest.raises(ValueError):
+        ShiftSummaryListInteractor().execute()
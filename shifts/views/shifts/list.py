@@ -4,8 +4,9 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from core.pagination import paginate_by_keyset
 from shifts.models import Shift
-from shifts.selectors import get_shifts_page
+from shifts.selectors import SHIFTS_PAGE_ORDERING, get_shifts_page
 from shifts.serializers import (
     ShiftListInputSerializer,
     ShiftListOutputSerializer,
@@ -26,6 +27,7 @@ class ShiftListApiV2(APIView):
         to_date: datetime.date | None = serializer.validated_data["to_date"]
         limit: int = serializer.validated_data["limit"]
         offset: int = serializer.validated_data["offset"]
+        cursor: str | None = serializer.validated_data["cursor"]
         shift_types: set[str] = serializer.validated_data["types"]
 
         shifts_page = get_shifts_page(
@@ -35,6 +37,7 @@ class ShiftListApiV2(APIView):
             limit=limit,
             offset=offset,
             shift_types=shift_types,
+            cursor=cursor,
         )
 
         serializer = ShiftListV2OutputSerializer(shifts_page)
@@ -52,10 +55,9 @@ class ShiftListApi(APIView):
         staff_ids: list[int] | None = serialized_data["staff_ids"]
         limit: int = serialized_data["limit"]
         offset: int = serialized_data["offset"]
+        cursor: str | None = serialized_data["cursor"]
 
-        shifts = Shift.objects.select_related("staff", "car_wash").order_by(
-            "-created_at"
-        )
+        shifts = Shift.objects.select_related("staff", "car_wash")
 
         if date_from is not None:
             shifts = shifts.filter(date__gte=date_from)
@@ -64,14 +66,19 @@ class ShiftListApi(APIView):
         if staff_ids is not None:
             shifts = shifts.filter(staff_id__in=staff_ids)
 
-        shifts = shifts[offset : offset + limit + 1]
-        is_end_of_list_reached = len(shifts) <= limit
-        shifts = shifts[:limit]
+        page = paginate_by_keyset(
+            shifts,
+            ordering=SHIFTS_PAGE_ORDERING,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+        )
 
-        serializer = ShiftListOutputSerializer(shifts, many=True)
+        serializer = ShiftListOutputSerializer(page.items, many=True)
         return Response(
             {
                 "shifts": serializer.data,
-                "is_end_of_list_reached": is_end_of_list_reached,
+                "is_end_of_list_reached": page.is_end_of_list_reached,
+                "next_cursor": page.next_cursor,
             }
         )
@@ -2,6 +2,7 @@ import datetime
 from collections.abc import Iterable
 from dataclasses import dataclass
 
+from core.pagination import paginate_by_keyset
 from staff.exceptions import StaffAlreadyExistsError, StaffNotFoundError
 from staff.models import AdminStaff, StaffRegisterRequest, Staff
 
@@ -66,7 +67,8 @@ class StaffListItem:
 class StaffListPagePagination:
     limit: int
     offset: int
-    total_count: int
+    total_count: int | None
+    next_cursor: str | None
 
 
 @dataclass(frozen=True, slots=True)
@@ -96,8 +98,15 @@ def get_all_staff(
     include_banned: bool,
     limit: int,
     offset: int,
+    cursor: str | None = None,
 ) -> StaffListPage:
-    staff_list = Staff.objects.order_by(order_by).values(
+    """
+    Get page of staff by cursor, or by offset if cursor is not given.
+
+    Total count is computed for offset pages only, since clients paging
+    by cursor do not need it and it is a full scan on every page.
+    """
+    staff_list = Staff.objects.values(
         "id",
         "full_name",
         "car_sharing_phone_number",
@@ -109,15 +118,26 @@ def get_all_staff(
     if not include_banned:
         staff_list = staff_list.filter(banned_at__isnull=True)
 
-    staff_count = staff_list.count()
-    staff_list = staff_list[offset : offset + limit]
+    staff_count = None
+    if cursor is None:
+        staff_count = staff_list.count()
+
+    tiebreaker = "-id" if order_by.startswith("-") else "id"
+    page = paginate_by_keyset(
+        staff_list,
+        ordering=(order_by, tiebreaker),
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+    )
 
     return StaffListPage(
-        staff=map_staff_list(staff_list),
+        staff=map_staff_list(page.items),
         pagination=StaffListPagePagination(
             limit=limit,
             offset=offset,
             total_count=staff_count,
+            next_cursor=page.next_cursor,
         ),
     )
 
@@ -26,6 +26,7 @@ class StaffListInputSerializer(serializers.Serializer):
     include_banned = serializers.BooleanField(default=False)
     limit = serializers.IntegerField(min_value=1, max_value=1000, default=100)
     offset = serializers.IntegerField(min_value=0, default=0)
+    cursor = serializers.CharField(default=None, allow_null=True)
 
 
 class StaffItemSerializer(serializers.Serializer):
@@ -41,7 +42,8 @@ class StaffItemSerializer(serializers.Serializer):
 class PaginationSerializer(serializers.Serializer):
     limit = serializers.IntegerField()
     offset = serializers.IntegerField()
-    total_count = serializers.IntegerField()
+    total_count = serializers.IntegerField(allow_null=True)
+    next_cursor = serializers.CharField(allow_null=True)
 
 
 class StaffListOutputSerializer(serializers.Serializer):
@@ -22,12 +22,14 @@ class StaffListApi(APIView):
         include_banned: bool = serialized_data["include_banned"]
         limit: int = serialized_data["limit"]
         offset: int = serialized_data["offset"]
+        cursor: str | None = serialized_data["cursor"]
 
         staff_list_page = get_all_staff(
             order_by=order_by,
             include_banned=include_banned,
             limit=limit,
             offset=offset,
+            cursor=cursor,
         )
         serializer = StaffListOutputSerializer(staff_list_page)
         return Response(serializer.data, status=status.HTTP_200_OK)
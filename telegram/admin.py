@@ -0,0 +1,21 @@
+from django.contrib import admin
+
+from telegram.models import NotificationOutbox
+
+
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "bot",
+        "kind",
+        "chat_id",
+        "status",
+        "attempts_count",
+        "next_attempt_at",
+        "created_at",
+        "sent_at",
+    )
+    list_filter = ("status", "bot", "kind")
+    search_fields = ("chat_id",)
+    readonly_fields = ("created_at", "sent_at")
@@ -0,0 +1,50 @@
+import time
+
+from django.core.management import BaseCommand
+
+from telegram.services import NotificationOutboxWorker
+
+
+class Command(BaseCommand):
+    help = "Send pending Telegram notifications from the outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=5,
+        )
+        parser.add_argument(
+            "--forever",
+            action="store_true",
+            help="Keep polling the outbox instead of exiting when it is empty",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1,
+            help="Seconds to wait when there are no pending notifications",
+        )
+
+    def handle(self, *args, **options):
+        worker = NotificationOutboxWorker(
+            batch_size=options["batch_size"],
+            max_attempts=options["max_attempts"],
+        )
+        while True:
+            result = worker.drain_batch()
+            if result.processed_count:
+                self.stdout.write(
+                    f"Notifications sent: {result.sent_count},"
+                    f" retried: {result.retried_count},"
+                    f" failed: {result.failed_count}"
+                )
+            elif not options["forever"]:
+                break
+            else:
+                time.sleep(options["poll_interval"])
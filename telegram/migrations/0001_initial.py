@@ -0,0 +1,36 @@
+# Generated by Django 5.1.7 on 2026-10-18 14:08
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bot', models.PositiveSmallIntegerField(choices=[(1, 'Main'), (2, 'Dry cleaning')], verbose_name='Bot')),
+                ('chat_id', models.BigIntegerField(verbose_name='Chat ID')),
+                ('kind', models.PositiveSmallIntegerField(choices=[(1, 'Message'), (2, 'Photos media group')], verbose_name='Kind')),
+                ('payload', models.JSONField(verbose_name='Payload')),
+                ('status', models.PositiveSmallIntegerField(choices=[(1, 'Pending'), (2, 'Sent'), (3, 'Failed')], default=1, verbose_name='Status')),
+                ('attempts_count', models.PositiveSmallIntegerField(default=0, verbose_name='Attempts count')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Next attempt at')),
+                ('last_error', models.TextField(blank=True, null=True, verbose_name='Last error')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Sent at')),
+            ],
+            options={
+                'verbose_name': 'Notification outbox',
+                'verbose_name_plural': 'Notifications outbox',
+                'indexes': [models.Index(condition=models.Q(('status', 1)), fields=['next_attempt_at', 'id'], name='notification_outbox_pending')],
+            },
+        ),
+    ]
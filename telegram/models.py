@@ -0,0 +1,74 @@
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class NotificationOutbox(models.Model):
+    """Telegram notification to be sent by the outbox worker.
+
+    Notifications are written in the same transaction as the change they
+    notify about, so they are sent only if that change is committed.
+    """
+
+    class Bot(models.IntegerChoices):
+        MAIN = 1, _("Main")
+        DRY_CLEANING = 2, _("Dry cleaning")
+
+    class Kind(models.IntegerChoices):
+        MESSAGE = 1, _("Message")
+        PHOTOS_MEDIA_GROUP = 2, _("Photos media group")
+
+    class Status(models.IntegerChoices):
+        PENDING = 1, _("Pending")
+        SENT = 2, _("Sent")
+        FAILED = 3, _("Failed")
+
+    bot = models.PositiveSmallIntegerField(
+        choices=Bot.choices,
+        verbose_name=_("Bot"),
+    )
+    chat_id = models.BigIntegerField(verbose_name=_("Chat ID"))
+    kind = models.PositiveSmallIntegerField(
+        choices=Kind.choices,
+        verbose_name=_("Kind"),
+    )
+    payload = models.JSONField(verbose_name=_("Payload"))
+    status = models.PositiveSmallIntegerField(
+        choices=Status.choices,
+        default=Status.PENDING,
+        verbose_name=_("Status"),
+    )
+    attempts_count = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name=_("Attempts count"),
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name=_("Next attempt at"),
+    )
+    last_error = models.TextField(
+        blank=True,
+        null=True,
+        verbose_name=_("Last error"),
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name=_("Sent at"),
+    )
+
+    class Meta:
+        verbose_name = _("Notification outbox")
+        verbose_name_plural = _("Notifications outbox")
+        indexes = (
+            models.Index(
+                fields=("next_attempt_at", "id"),
+                # Pending notifications polled by the outbox worker.
+                condition=models.Q(status=1),
+                name="notification_outbox_pending",
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.get_kind_display()} to {self.chat_id}"
@@ -1,10 +1,20 @@
-from collections.abc import Iterable
+import datetime
+import threading
+import time
+from collections.abc import Callable, Iterable
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 
 from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 from telebot import TeleBot
+from telebot.apihelper import ApiTelegramException
 from telebot.types import InlineKeyboardMarkup, InputMediaPhoto
 
+from telegram.models import NotificationOutbox
+
 
 __all__ = (
     "get_telegram_bot",
@@ -13,6 +23,13 @@ __all__ = (
     "try_get_chat_username",
     "get_dry_cleaning_telegram_bot",
     "get_file_urls",
+    "TokenBucket",
+    "BroadcastResult",
+    "TelegramBroadcaster",
+    "enqueue_message",
+    "enqueue_photos_media_group",
+    "NotificationOutboxDrainResult",
+    "NotificationOutboxWorker",
 )
 
 
@@ -47,18 +64,16 @@ def try_send_message(
         return False
 
 
-def try_send_photos_media_group(
-    bot: TeleBot,
-    chat_id: int,
+def build_photos_media_group(
     file_ids: Iterable[str],
     caption: str | None,
     parse_mode: str | None = "html",
-) -> bool:
+) -> list[InputMediaPhoto]:
     media = []
     file_ids = tuple(file_ids)
 
     if not file_ids:
-        return False
+        return media
 
     if caption is not None:
         file_id, *file_ids = file_ids
@@ -70,6 +85,24 @@ def try_send_photos_media_group(
             ),
         )
     media += [InputMediaPhoto(media=file_id) for file_id in file_ids]
+    return media
+
+
+def try_send_photos_media_group(
+    bot: TeleBot,
+    chat_id: int,
+    file_ids: Iterable[str],
+    caption: str | None,
+    parse_mode: str | None = "html",
+) -> bool:
+    media = build_photos_media_group(
+        file_ids=file_ids,
+        caption=caption,
+        parse_mode=parse_mode,
+    )
+
+    if not media:
+        return False
 
     for _ in range(5):
         try:
@@ -102,3 +135,428 @@ def try_get_chat_username(
 def get_file_urls(bot: TeleBot, file_ids: Iterable[str]) -> list[str]:
     with ThreadPoolExecutor() as executor:
         return list(executor.map(bot.get_file_url, file_ids))
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens are refilled continuously with `rate` tokens per second up to
+    `capacity`. Acquiring a token blocks until one is available.
+    """
+
+    def __init__(
+            self,
+            *,
+            rate: float,
+            capacity: float,
+            clock: Callable[[], float] = time.monotonic,
+            sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.__rate = rate
+        self.__capacity = capacity
+        self.__tokens = capacity
+        self.__clock = clock
+        self.__sleep = sleep
+        self.__updated_at = clock()
+        self.__paused_until = 0.0
+        self.__lock = threading.Lock()
+
+    def __refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.__updated_at)
+        self.__tokens = min(
+            self.__capacity,
+            self.__tokens + elapsed * self.__rate,
+        )
+        self.__updated_at = now
+
+    def __try_acquire(self) -> float:
+        """Take a token or return seconds to wait for it."""
+        with self.__lock:
+            now = self.__clock()
+            if now < self.__paused_until:
+                return self.__paused_until - now
+            self.__refill(now)
+            # Tolerate rounding errors of refill.
+            if self.__tokens >= 1 - 1e-9:
+                self.__tokens = max(0.0, self.__tokens - 1)
+                return 0
+            return (1 - self.__tokens) / self.__rate
+
+    def acquire(self) -> None:
+        while (wait_seconds := self.__try_acquire()) > 0:
+            self.__sleep(wait_seconds)
+
+    def pause(self, seconds: float) -> None:
+        """Do not give tokens for the given time, e.g. on flood wait."""
+        with self.__lock:
+            self.__paused_until = max(
+                self.__paused_until,
+                self.__clock() + seconds,
+            )
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class BroadcastResult:
+    chat_id: int
+    is_sent: bool
+    attempts_count: int
+    error: str | None = None
+
+
+class TelegramBroadcaster:
+    """
+    Send messages to many chats concurrently within Telegram rate limits.
+
+    Messages are sent by a pool of threads. Every message takes a token
+    from the global bucket and from the bucket of its chat. On
+    "Too Many Requests" errors the whole broadcast waits `retry_after`
+    seconds returned by Telegram and the message is retried, up to
+    `max_flood_waits` times apart from other attempts. Chats which
+    blocked the bot or do not exist are not retried, other errors are
+    retried up to `max_attempts` times.
+    """
+
+    def __init__(
+            self,
+            bot: TeleBot,
+            *,
+            max_workers: int = 8,
+            messages_per_second: float = 25,
+            chat_messages_per_second: float = 1,
+            max_attempts: int = 3,
+            max_flood_waits: int = 10,
+            retry_delay: float = 0.5,
+            sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.__bot = bot
+        self.__max_workers = max_workers
+        self.__chat_messages_per_second = chat_messages_per_second
+        self.__max_attempts = max_attempts
+        self.__max_flood_waits = max_flood_waits
+        self.__retry_delay = retry_delay
+        self.__sleep = sleep
+        self.__bucket = TokenBucket(
+            rate=messages_per_second,
+            capacity=messages_per_second,
+            sleep=sleep,
+        )
+        self.__chat_id_to_bucket: dict[int, TokenBucket] = {}
+        self.__chat_buckets_lock = threading.Lock()
+
+    def get_chat_bucket(self, chat_id: int) -> TokenBucket:
+        with self.__chat_buckets_lock:
+            bucket = self.__chat_id_to_bucket.get(chat_id)
+            if bucket is None:
+                bucket = TokenBucket(
+                    rate=self.__chat_messages_per_second,
+                    capacity=1,
+                    sleep=self.__sleep,
+                )
+                self.__chat_id_to_bucket[chat_id] = bucket
+            return bucket
+
+    def send_message(
+            self,
+            chat_id: int,
+            text: str,
+            parse_mode: str | None = "html",
+            reply_markup: InlineKeyboardMarkup | None = None,
+    ) -> BroadcastResult:
+        chat_bucket = self.get_chat_bucket(chat_id)
+        error: str | None = None
+        attempts_count = 0
+        failed_attempts_count = 0
+        flood_waits_count = 0
+
+        while failed_attempts_count < self.__max_attempts:
+            chat_bucket.acquire()
+            self.__bucket.acquire()
+            attempts_count += 1
+            try:
+                self.__bot.send_message(
+                    chat_id,
+                    text,
+                    parse_mode=parse_mode,
+                    reply_markup=reply_markup,
+                )
+            except ApiTelegramException as exception:
+                error = exception.description
+                if (
+                        exception.error_code == 429
+                        and flood_waits_count < self.__max_flood_waits
+                ):
+                    # Flood wait is not a failure of the message, so it
+                    # does not use up its attempts.
+                    flood_waits_count += 1
+                    parameters = exception.result_json.get("parameters", {})
+                    retry_after = parameters.get("retry_after", 1)
+                    self.__bucket.pause(retry_after)
+                    continue
+                if exception.error_code in (400, 403):
+                    return BroadcastResult(
+                        chat_id=chat_id,
+                        is_sent=False,
+                        attempts_count=attempts_count,
+                        error=error,
+                    )
+            except Exception as exception:
+                error = str(exception)
+            else:
+                return BroadcastResult(
+                    chat_id=chat_id,
+                    is_sent=True,
+                    attempts_count=attempts_count,
+                )
+            failed_attempts_count += 1
+            if failed_attempts_count < self.__max_attempts:
+                self.__sleep(self.__retry_delay * failed_attempts_count)
+
+        return BroadcastResult(
+            chat_id=chat_id,
+            is_sent=False,
+            attempts_count=attempts_count,
+            error=error,
+        )
+
+    def broadcast(
+            self,
+            chat_ids: Iterable[int],
+            text: str,
+            parse_mode: str | None = "html",
+            reply_markup: InlineKeyboardMarkup | None = None,
+    ) -> list[BroadcastResult]:
+        """
+        Send the same message to all chats.
+
+        Returns:
+            Results in order of chat IDs.
+        """
+        with ThreadPoolExecutor(max_workers=self.__max_workers) as executor:
+            return list(
+                executor.map(
+                    lambda chat_id: self.send_message(
+                        chat_id=chat_id,
+                        text=text,
+                        parse_mode=parse_mode,
+                        reply_markup=reply_markup,
+                    ),
+                    chat_ids,
+                )
+            )
+
+
+def enqueue_message(
+    *,
+    bot: NotificationOutbox.Bot,
+    chat_id: int,
+    text: str,
+    parse_mode: str | None = "html",
+    reply_markup: InlineKeyboardMarkup | None = None,
+) -> NotificationOutbox:
+    """Save message to the outbox in the current transaction."""
+    if reply_markup is not None:
+        reply_markup = reply_markup.to_dict()
+    return NotificationOutbox.objects.create(
+        bot=bot,
+        chat_id=chat_id,
+        kind=NotificationOutbox.Kind.MESSAGE,
+        payload={
+            "text": text,
+            "parse_mode": parse_mode,
+            "reply_markup": reply_markup,
+        },
+    )
+
+
+def enqueue_photos_media_group(
+    *,
+    bot: NotificationOutbox.Bot,
+    chat_id: int,
+    file_ids: Iterable[str],
+    caption: str | None,
+    parse_mode: str | None = "html",
+) -> NotificationOutbox | None:
+    """
+    Save photos media group to the outbox in the current transaction.
+
+    Returns:
+        Outbox notification or None if there are no photos to send.
+    """
+    file_ids = list(file_ids)
+    if not file_ids:
+        return None
+    return NotificationOutbox.objects.create(
+        bot=bot,
+        chat_id=chat_id,
+        kind=NotificationOutbox.Kind.PHOTOS_MEDIA_GROUP,
+        payload={
+            "file_ids": file_ids,
+            "caption": caption,
+            "parse_mode": parse_mode,
+        },
+    )
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class NotificationOutboxDrainResult:
+    sent_count: int
+    retried_count: int
+    failed_count: int
+
+    @property
+    def processed_count(self) -> int:
+        return self.sent_count + self.retried_count + self.failed_count
+
+
+class NotificationOutboxWorker:
+    """
+    Send pending outbox notifications in batches.
+
+    A batch is claimed in a short transaction: its notifications are
+    locked with `SKIP LOCKED` and leased for `lease_seconds`, so several
+    workers may run at once and a notification of a crashed worker is
+    picked up again after the lease expires. Telegram is called outside
+    of the transaction. Failed notifications are retried with
+    exponential backoff, while chats which blocked the bot or do not
+    exist are not retried.
+    """
+
+    def __init__(
+            self,
+            *,
+            batch_size: int = 100,
+            max_attempts: int = 5,
+            retry_delay: float = 30,
+            lease_seconds: float = 300,
+    ):
+        self.__batch_size = batch_size
+        self.__max_attempts = max_attempts
+        self.__retry_delay = retry_delay
+        self.__lease_seconds = lease_seconds
+        self.__bot_to_telegram_bot: dict[int, TeleBot] = {}
+
+    def get_telegram_bot(self, bot: int) -> TeleBot:
+        telegram_bot = self.__bot_to_telegram_bot.get(bot)
+        if telegram_bot is None:
+            if bot == NotificationOutbox.Bot.DRY_CLEANING:
+                telegram_bot = get_dry_cleaning_telegram_bot()
+            else:
+                telegram_bot = get_telegram_bot()
+            self.__bot_to_telegram_bot[bot] = telegram_bot
+        return telegram_bot
+
+    def claim_batch(self) -> list[NotificationOutbox]:
+        now = timezone.now()
+        with transaction.atomic():
+            notifications = list(
+                NotificationOutbox.objects
+                .select_for_update(skip_locked=True)
+                .filter(
+                    status=NotificationOutbox.Status.PENDING,
+                    next_attempt_at__lte=now,
+                )
+                .order_by("next_attempt_at", "id")[:self.__batch_size]
+            )
+            NotificationOutbox.objects.filter(
+                id__in=[notification.id for notification in notifications],
+            ).update(
+                attempts_count=F("attempts_count") + 1,
+                next_attempt_at=now + datetime.timedelta(
+                    seconds=self.__lease_seconds,
+                ),
+            )
+        for notification in notifications:
+            notification.attempts_count += 1
+        return notifications
+
+    def send(self, notification: NotificationOutbox) -> None:
+        bot = self.get_telegram_bot(notification.bot)
+        payload = notification.payload
+
+        if notification.kind == NotificationOutbox.Kind.PHOTOS_MEDIA_GROUP:
+            bot.send_media_group(
+                chat_id=notification.chat_id,
+                media=build_photos_media_group(
+                    file_ids=payload["file_ids"],
+                    caption=payload["caption"],
+                    parse_mode=payload["parse_mode"],
+                ),
+            )
+            return
+
+        reply_markup = payload["reply_markup"]
+        if reply_markup is not None:
+            reply_markup = InlineKeyboardMarkup.de_json(reply_markup)
+        bot.send_message(
+            notification.chat_id,
+            payload["text"],
+            parse_mode=payload["parse_mode"],
+            reply_markup=reply_markup,
+        )
+
+    def get_retry_delay(
+            self,
+            notification: NotificationOutbox,
+            exception: Exception,
+    ) -> float | None:
+        """
+        Get seconds to wait before the next attempt.
+
+        Returns:
+            Delay or None if the notification must not be retried.
+        """
+        if notification.attempts_count >= self.__max_attempts:
+            return None
+        if isinstance(exception, ApiTelegramException):
+            if exception.error_code in (400, 403):
+                return None
+            if exception.error_code == 429:
+                parameters = exception.result_json.get("parameters", {})
+                return parameters.get("retry_after", self.__retry_delay)
+        return self.__retry_delay * 2 ** (notification.attempts_count - 1)
+
+    def process(self, notification: NotificationOutbox) -> int:
+        """
+        Send notification and save its new status.
+
+        Returns:
+            New status of notification.
+        """
+        outbox = NotificationOutbox.objects.filter(id=notification.id)
+        try:
+            self.send(notification)
+        except Exception as exception:
+            error = getattr(exception, "description", None) or str(exception)
+            retry_delay = self.get_retry_delay(notification, exception)
+            if retry_delay is None:
+                outbox.update(
+                    status=NotificationOutbox.Status.FAILED,
+                    last_error=error,
+                )
+                return NotificationOutbox.Status.FAILED
+            outbox.update(
+                next_attempt_at=timezone.now() + datetime.timedelta(
+                    seconds=retry_delay,
+                ),
+                last_error=error,
+            )
+            return NotificationOutbox.Status.PENDING
+
+        outbox.update(
+            status=NotificationOutbox.Status.SENT,
+            sent_at=timezone.now(),
+            last_error=None,
+        )
+        return NotificationOutbox.Status.SENT
+
+    def drain_batch(self) -> NotificationOutboxDrainResult:
+        statuses = [
+            self.process(notification)
+            for notification in self.claim_batch()
+        ]
+        return NotificationOutboxDrainResult(
+            sent_count=statuses.count(NotificationOutbox.Status.SENT),
+            retried_count=statuses.count(NotificationOutbox.Status.PENDING),
+            failed_count=statuses.count(NotificationOutbox.Status.FAILED),
+        )
@@ -0,0 +1,101 @@
+import json
+import threading
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from telebot import apihelper
+
+
+BLOCKED_CHAT_ID = 403
+FLOOD_CHAT_ID = 429
+FAILING_CHAT_ID = 500
+
+
+class FakeBotApiHandler(BaseHTTPRequestHandler):
+    """Minimal Bot API `sendMessage` and `sendMediaGroup` methods.
+
+    Some chat IDs respond with canned errors.
+    """
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def send_json(self, status: int, data: dict) -> None:
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        content_length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(content_length).decode()
+        # Bot API parameters are sent either in query string or body.
+        payload = parse_qs(urlsplit(self.path).query) | parse_qs(body)
+        chat_id = int(payload["chat_id"][0])
+
+        server: FakeBotApiServer = self.server
+        with server.lock:
+            server.chat_id_to_requests_count[chat_id] += 1
+            requests_count = server.chat_id_to_requests_count[chat_id]
+
+        if chat_id == BLOCKED_CHAT_ID:
+            self.send_json(403, {
+                "ok": False,
+                "error_code": 403,
+                "description": "Forbidden: bot was blocked by the user",
+            })
+        elif chat_id == FLOOD_CHAT_ID and requests_count == 1:
+            self.send_json(429, {
+                "ok": False,
+                "error_code": 429,
+                "description": "Too Many Requests: retry after 1",
+                "parameters": {"retry_after": 1},
+            })
+        elif chat_id == FAILING_CHAT_ID:
+            self.send_json(500, {
+                "ok": False,
+                "error_code": 500,
+                "description": "Internal Server Error",
+            })
+        else:
+            message = {
+                "message_id": requests_count,
+                "date": 0,
+                "chat": {"id": chat_id, "type": "private"},
+            }
+            if urlsplit(self.path).path.endswith("/sendMediaGroup"):
+                result = [message]
+            else:
+                result = message | {"text": payload["text"][0]}
+            self.send_json(200, {"ok": True, "result": result})
+
+    # Methods without files are requested with GET.
+    do_GET = do_POST
+
+
+class FakeBotApiServer(ThreadingHTTPServer):
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeBotApiHandler)
+        self.lock = threading.Lock()
+        self.chat_id_to_requests_count: dict[int, int] = defaultdict(int)
+
+
+@pytest.fixture
+def fake_bot_api_server(monkeypatch):
+    server = FakeBotApiServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    monkeypatch.setattr(
+        apihelper,
+        "API_URL",
+        f"http://{host}:{port}/bot{{0}}/{{1}}",
+    )
+    yield server
+    server.shutdown()
+    server.server_close()
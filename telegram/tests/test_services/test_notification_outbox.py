@@ -0,0 +1,119 @@
+import datetime
+
+import pytest
+from django.utils import timezone
+from telebot.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from telegram.models import NotificationOutbox
+from telegram.services import (
+    enqueue_message,
+    enqueue_photos_media_group,
+    NotificationOutboxDrainResult,
+    NotificationOutboxWorker,
+)
+from telegram.tests.conftest import BLOCKED_CHAT_ID, FAILING_CHAT_ID
+
+
+@pytest.mark.django_db
+def test_drain_sends_pending_notifications(fake_bot_api_server):
+    reply_markup = InlineKeyboardMarkup(
+        keyboard=[[InlineKeyboardButton(text="Check", callback_data="1")]],
+    )
+    message = enqueue_message(
+        bot=NotificationOutbox.Bot.DRY_CLEANING,
+        chat_id=1,
+        text="Hello",
+        reply_markup=reply_markup,
+    )
+    media_group = enqueue_photos_media_group(
+        bot=NotificationOutbox.Bot.MAIN,
+        chat_id=2,
+        file_ids=["https://example.com/1.jpg", "https://example.com/2.jpg"],
+        caption="Photos",
+    )
+
+    result = NotificationOutboxWorker().drain_batch()
+
+    assert result == NotificationOutboxDrainResult(
+        sent_count=2,
+        retried_count=0,
+        failed_count=0,
+    )
+    for notification in (message, media_group):
+        notification.refresh_from_db()
+        assert notification.status == NotificationOutbox.Status.SENT
+        assert notification.attempts_count == 1
+        assert notification.sent_at is not None
+    assert fake_bot_api_server.chat_id_to_requests_count == {1: 1, 2: 1}
+
+
+@pytest.mark.django_db
+def test_drain_retries_failed_notifications(fake_bot_api_server):
+    notification = enqueue_message(
+        bot=NotificationOutbox.Bot.MAIN,
+        chat_id=FAILING_CHAT_ID,
+        text="Hello",
+    )
+    worker = NotificationOutboxWorker(max_attempts=2, retry_delay=60)
+
+    result = worker.drain_batch()
+
+    assert result.retried_count == 1
+    notification.refresh_from_db()
+    assert notification.status == NotificationOutbox.Status.PENDING
+    assert notification.last_error == "Internal Server Error"
+    assert notification.next_attempt_at > timezone.now()
+
+    # Not due yet.
+    assert worker.drain_batch().processed_count == 0
+
+    NotificationOutbox.objects.update(next_attempt_at=timezone.now())
+    result = worker.drain_batch()
+
+    assert result.failed_count == 1
+    notification.refresh_from_db()
+    assert notification.status == NotificationOutbox.Status.FAILED
+    assert notification.attempts_count == 2
+
+
+@pytest.mark.django_db
+def test_drain_does_not_retry_blocked_chat(fake_bot_api_server):
+    notification = enqueue_message(
+        bot=NotificationOutbox.Bot.MAIN,
+        chat_id=BLOCKED_CHAT_ID,
+        text="Hello",
+    )
+
+    result = NotificationOutboxWorker().drain_batch()
+
+    assert result.failed_count == 1
+    notification.refresh_from_db()
+    assert notification.status == NotificationOutbox.Status.FAILED
+    assert notification.attempts_count == 1
+
+
+@pytest.mark.django_db
+def test_claimed_notifications_are_leased():
+    enqueue_message(bot=NotificationOutbox.Bot.MAIN, chat_id=1, text="Hello")
+    enqueue_message(bot=NotificationOutbox.Bot.MAIN, chat_id=2, text="Hello")
+    enqueue_message(bot=NotificationOutbox.Bot.MAIN, chat_id=3, text="Hello")
+    worker = NotificationOutboxWorker(batch_size=2, lease_seconds=60)
+
+    first_batch = worker.claim_batch()
+    second_batch = worker.claim_batch()
+
+    assert [notification.chat_id for notification in first_batch] == [1, 2]
+    assert [notification.chat_id for notification in second_batch] == [3]
+    assert worker.claim_batch() == []
+    assert NotificationOutbox.objects.filter(
+        next_attempt_at__gt=timezone.now() + datetime.timedelta(seconds=30),
+    ).count() == 3
+
+
+def test_enqueue_empty_photos_media_group():
+    assert enqueue_photos_media_group(
+        bot=NotificationOutbox.Bot.MAIN,
+        chat_id=1,
+        file_ids=[],
+        caption="Photos",
+    ) is None
@@ -0,0 +1,107 @@
+import pytest
+from telebot import TeleBot
+
+from telegram.services import BroadcastResult, TelegramBroadcaster, TokenBucket
+from telegram.tests.conftest import (
+    BLOCKED_CHAT_ID,
+    FAILING_CHAT_ID,
+    FLOOD_CHAT_ID,
+)
+
+
+def test_broadcast(fake_bot_api_server):
+    bot = TeleBot(token="123:test")
+    broadcaster = TelegramBroadcaster(
+        bot,
+        max_workers=4,
+        retry_delay=0,
+    )
+    chat_ids = [1, 2, BLOCKED_CHAT_ID, FLOOD_CHAT_ID, FAILING_CHAT_ID, 3]
+
+    results = broadcaster.broadcast(chat_ids=chat_ids, text="Hello")
+
+    assert [result.chat_id for result in results] == chat_ids
+    assert [result.is_sent for result in results] == [
+        True, True, False, True, False, True,
+    ]
+    assert results[2] == BroadcastResult(
+        chat_id=BLOCKED_CHAT_ID,
+        is_sent=False,
+        attempts_count=1,
+        error="Forbidden: bot was blocked by the user",
+    )
+    assert results[3].attempts_count == 2
+    assert results[4].attempts_count == 3
+    assert fake_bot_api_server.chat_id_to_requests_count == {
+        1: 1,
+        2: 1,
+        3: 1,
+        BLOCKED_CHAT_ID: 1,
+        FLOOD_CHAT_ID: 2,
+        FAILING_CHAT_ID: 3,
+    }
+
+
+def test_flood_wait_does_not_use_up_attempts(fake_bot_api_server):
+    bot = TeleBot(token="123:test")
+    broadcaster = TelegramBroadcaster(bot, max_attempts=1, retry_delay=0)
+
+    result = broadcaster.send_message(FLOOD_CHAT_ID, "Hello")
+
+    assert result == BroadcastResult(
+        chat_id=FLOOD_CHAT_ID,
+        is_sent=True,
+        attempts_count=2,
+    )
+
+
+def test_flood_waits_limited(fake_bot_api_server):
+    bot = TeleBot(token="123:test")
+    broadcaster = TelegramBroadcaster(
+        bot,
+        max_attempts=1,
+        max_flood_waits=0,
+        retry_delay=0,
+    )
+
+    result = broadcaster.send_message(FLOOD_CHAT_ID, "Hello")
+
+    assert result == BroadcastResult(
+        chat_id=FLOOD_CHAT_ID,
+        is_sent=False,
+        attempts_count=1,
+        error="Too Many Requests: retry after 1",
+    )
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def test_token_bucket_limits_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=2, clock=clock, sleep=clock.sleep)
+
+    for _ in range(12):
+        bucket.acquire()
+
+    # Burst of 2 tokens, then 10 tokens per second.
+    assert clock.now == pytest.approx(1)
+
+
+def test_token_bucket_pause():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=10, clock=clock, sleep=clock.sleep)
+
+    bucket.pause(3)
+    bucket.acquire()
+
+    assert clock.now == pytest.approx(3)